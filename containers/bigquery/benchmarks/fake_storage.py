@@ -0,0 +1,84 @@
+"""Local fake of BigQuery Storage Read API."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class FakeStreamReader:
+    """``StreamReader`` serving an in-memory Arrow table split into streams.
+
+    ``row_restriction`` is not interpreted by the fake and must be empty.
+    """
+
+    def __init__(self, table: pa.Table, batch_size: int = 1024) -> None:
+        """Initialize ``FakeStreamReader``."""
+        self.table = table
+        self.batch_size = batch_size
+        self.selected: pa.Table | None = None
+        self.streams: dict[str, pa.Table] = {}
+
+    def create_session(
+        self,
+        table: str,
+        selected_fields: list[str],
+        row_restriction: str,
+        max_streams: int,
+    ) -> tuple[bytes, list[str]]:
+        """Split the table into at most ``max_streams`` streams."""
+        if row_restriction:
+            msg = "FakeStreamReader does not support row_restriction."
+            raise NotImplementedError(msg)
+        selected = self.table.select(selected_fields) if selected_fields else self.table
+        num_streams = min(max_streams, selected.num_rows)
+        stream_ids = pc.modulo(pa.array(range(selected.num_rows)), num_streams) if num_streams else None
+        self.streams = {
+            f"{table}/streams/{i}": selected.filter(pc.equal(stream_ids, i)) for i in range(num_streams)
+        }
+        return selected.schema.serialize().to_pybytes(), list(self.streams)
+
+    def read_stream(self, stream: str) -> Iterator[bytes]:
+        """Yield serialized record batches of the stream."""
+        for batch in self.streams[stream].to_batches(max_chunksize=self.batch_size):
+            yield batch.serialize().to_pybytes()
+
+
+class FakeStreamWriter:
+    """``StreamWriter`` collecting record batches in memory.
+
+    Rows of pending streams become visible in ``tables`` only when the streams are committed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize ``FakeStreamWriter``."""
+        self.lock = threading.Lock()
+        self.pending: dict[str, list[pa.RecordBatch]] = {}
+        self.tables: dict[str, list[pa.RecordBatch]] = {}
+
+    def create_stream(self, table: str) -> str:
+        """Create a pending stream."""
+        with self.lock:
+            stream = f"{table}/streams/{len(self.pending)}"
+            self.pending[stream] = []
+        return stream
+
+    def append(self, stream: str, schema: pa.Schema, batches: Iterator[pa.RecordBatch]) -> None:
+        """Append record batches after a round-trip through serialization."""
+        for batch in batches:
+            self.pending[stream].append(pa.ipc.read_record_batch(batch.serialize(), schema))
+
+    def finalize(self, stream: str) -> int:
+        """Return the number of rows in the stream."""
+        return sum(batch.num_rows for batch in self.pending[stream])
+
+    def commit(self, table: str, streams: list[str]) -> None:
+        """Make rows of streams visible."""
+        with self.lock:
+            self.tables.setdefault(table, []).extend(batch for stream in streams for batch in self.pending.pop(stream))
@@ -0,0 +1,66 @@
+"""Check retries of transient BigQuery errors against a local stub server with injected faults.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.faults
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from google.auth.credentials import AnonymousCredentials
+from tasks.jobs import JobClient, insert_bigquery_job
+from tasks.retry import RETRIES
+
+from benchmarks.stub_server import StubBigQueryServer
+
+# name, request faults, job faults, whether the job succeeds, expected retries of requests and jobs
+SCENARIOS = [
+    ("no fault", [], [], True, 0, 0),
+    ("insert 503", [("POST", 503, "backendError")], [], True, 1, 0),
+    # The first fault fails `jobs.getQueryResults`, which is not retried, and the second fails `jobs.get`.
+    ("poll 429", [("GET", 429, "rateLimitExceeded")] * 2, [], True, 1, 0),
+    ("job backendError", [], ["backendError"], True, 0, 1),
+    ("job twice", [], ["jobInternalError", "backendError"], True, 0, 2),
+    ("job rate limit", [], ["jobRateLimitExceeded"], True, 0, 1),
+    ("job invalidQuery", [], ["invalidQuery"], False, 0, 0),
+    ("insert 400", [("POST", 400, "invalid")], [], False, 0, 0),
+]
+
+
+def main() -> None:
+    """Run the scenarios and exit with non-zero status if any of them does not behave as expected."""
+    project = "stub-project"
+    payload = {"configuration": {"query": {"query": "SELECT 1"}}, "jobReference": {"projectId": project, "location": "US"}}
+    failures = 0
+
+    print(f"{'scenario':<18} {'result':<10} {'wall [s]':>9} {'request retries':>16} {'job retries':>12}")  # noqa: T201
+    with StubBigQueryServer(job_duration=0.2) as server:
+        # A short deadline fails a job error retried as a request error instead of hanging.
+        client = JobClient(credentials=AnonymousCredentials(), endpoint=server.endpoint, retry_deadline=5.0)
+        for name, request_faults, job_faults, succeeds, request_retries, job_retries in SCENARIOS:
+            server.request_faults = list(request_faults)
+            server.job_faults = list(job_faults)
+            RETRIES.counts = dict.fromkeys(RETRIES.counts, 0)
+
+            start = time.perf_counter()
+            try:
+                insert_bigquery_job(payload=payload, project=project, client=client)
+                result = "ok"
+            except Exception as e:  # noqa: BLE001
+                result = type(e).__name__
+            wall = time.perf_counter() - start
+
+            counts = RETRIES.counts
+            print(f"{name:<18} {result:<10} {wall:>9.2f} {counts['request']:>16} {counts['job']:>12}")  # noqa: T201
+            if (result == "ok") != succeeds or counts != {"request": request_retries, "job": job_retries}:
+                print(f"  expected {'ok' if succeeds else 'error'}, {request_retries} and {job_retries} retries")  # noqa: T201
+                failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
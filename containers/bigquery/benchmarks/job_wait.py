@@ -0,0 +1,65 @@
+"""Benchmark latency of waiting for BigQuery jobs against a local stub server.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.job_wait
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import requests
+from google.auth.credentials import AnonymousCredentials
+from tasks.jobs import JobClient
+
+from benchmarks.stub_server import StubBigQueryServer
+
+
+def wait_fixed_interval(endpoint: str, payload: dict, project: str) -> dict:
+    """Wait for a job in the way of kfpc 0.4.0: a new connection per request and 3 s sleeps."""
+    headers = {"Content-type": "application/json"}
+    job = requests.post(url=f"{endpoint}/projects/{project}/jobs", data=json.dumps(payload), headers=headers, timeout=90).json()
+    while job["status"]["state"] != "DONE":
+        job = requests.get(url=job["selfLink"], headers=headers, timeout=90).json()
+        time.sleep(3)
+    return job
+
+
+def wait_adaptive(client: JobClient, payload: dict, project: str) -> dict:
+    """Wait for a job with ``JobClient``."""
+    return client.wait_job(client.insert_job(project=project, payload=payload))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--durations", type=float, nargs="+", default=[0.2, 1.0, 5.0, 20.0])
+    args = parser.parse_args()
+
+    project = "stub-project"
+    payload = {"configuration": {"query": {"query": "SELECT 1"}}, "jobReference": {"projectId": project, "location": "US"}}
+
+    print(f"{'waiter':<10} {'job [s]':>8} {'wall [s]':>9} {'overhead [s]':>13} {'requests':>9} {'connections':>12}")  # noqa: T201
+    for duration in args.durations:
+        with StubBigQueryServer(job_duration=duration) as server:
+            client = JobClient(credentials=AnonymousCredentials(), endpoint=server.endpoint)
+            waiters = {
+                "fixed": lambda: wait_fixed_interval(server.endpoint, payload, project),
+                "adaptive": lambda: wait_adaptive(client, payload, project),  # noqa: B023
+            }
+            for name, waiter in waiters.items():
+                server.reset_counters()
+                start = time.perf_counter()
+                waiter()
+                wall = time.perf_counter() - start
+                print(  # noqa: T201
+                    f"{name:<10} {duration:>8.1f} {wall:>9.2f} {wall - duration:>13.2f} "
+                    f"{server.num_requests:>9} {server.num_connections:>12}",
+                )
+
+
+if __name__ == "__main__":
+    main()
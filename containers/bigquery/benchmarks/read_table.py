@@ -0,0 +1,55 @@
+"""Benchmark writing Storage Read API streams into files with a local fake.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.read_table
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+from tasks.storage_read import read_table
+
+from benchmarks.fake_storage import FakeStreamReader
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-rows", type=int, default=2_000_000)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    table = pa.table(
+        {
+            "id": pa.array(range(args.num_rows), pa.int64()),
+            "name": pa.array([f"name-{i % 1000}" for i in range(args.num_rows)]),
+            "value": pa.array([i / 7 for i in range(args.num_rows)]),
+        },
+    )
+    reader = FakeStreamReader(table)
+
+    print(f"{'format':<8} {'streams':>7} {'rows':>10} {'time [s]':>9} {'rows/s':>12}")  # noqa: T201
+    for file_format in ["ARROW", "PARQUET"]:
+        for max_streams in args.streams:
+            with tempfile.TemporaryDirectory() as d:
+                start = time.perf_counter()
+                manifest = read_table(
+                    reader=reader,
+                    table="projects/p/datasets/d/tables/t",
+                    directory=Path(d),
+                    file_format=file_format,
+                    max_streams=max_streams,
+                )
+                elapsed = time.perf_counter() - start
+            rows = manifest["totalRows"]
+            print(f"{file_format:<8} {max_streams:>7} {rows:>10} {elapsed:>9.2f} {rows / elapsed:>12,.0f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
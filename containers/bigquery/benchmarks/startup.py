@@ -0,0 +1,91 @@
+"""Benchmark startup time of each ``inv`` command and enforce its budget.
+
+Each command is measured in a fresh interpreter that imports the task collection and the modules which the
+command imports lazily, that is, the time spent before the first request to Google Cloud.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.startup --max-seconds 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+import invoke
+
+import tasks
+
+# Modules imported inside each command. Commands not listed here fail the benchmark.
+COMMAND_IMPORTS = {
+    "query": [],
+    "query-batch": [],
+    "query-script": [],
+    "copy": [],
+    "extract": ["google.cloud.bigquery", "google.cloud.storage"],
+    "load": ["google.cloud.bigquery"],
+    "read-table": ["tasks.storage_read", "google.cloud.bigquery_storage_v1"],
+    "write-table": ["google.cloud.bigquery", "tasks.storage_write", "google.cloud.bigquery_storage_v1"],
+    "wait-for-table": [],
+}
+
+# Modules which must not be imported by commands calling only BigQuery REST API.
+HEAVY_MODULES = ["google.cloud.bigquery", "google_cloud_pipeline_components", "kfp", "pyarrow", "grpc"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import importlib, tasks
+for name in {imports!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(imports: list[str]) -> tuple[float, float, list[str]]:
+    """Return wall time of the process, time of imports and heavy modules loaded in a fresh interpreter."""
+    start = time.perf_counter()
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", SCRIPT.format(imports=imports, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    output = json.loads(result.stdout)
+    return wall, output["seconds"], output["heavy"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=0.0, help="Budget of process time. Disabled if 0.")
+    args = parser.parse_args()
+
+    commands = sorted(invoke.Collection.from_module(tasks).task_names)
+    failures = [f"{c}: not listed in COMMAND_IMPORTS" for c in commands if c not in COMMAND_IMPORTS]
+
+    print(f"{'command':<14} {'process [s]':>11} {'imports [s]':>11}  heavy modules")  # noqa: T201
+    for command in commands:
+        imports = COMMAND_IMPORTS.get(command, [])
+        results = [measure(imports) for _ in range(args.repeat)]
+        wall, seconds, heavy = min(results)
+        print(f"{command:<14} {wall:>11.3f} {seconds:>11.3f}  {', '.join(heavy) or '-'}")  # noqa: T201
+
+        if not imports and heavy:
+            failures.append(f"{command}: imports {', '.join(heavy)}")
+        if args.max_seconds and wall > args.max_seconds:
+            failures.append(f"{command}: {wall:.3f} s exceeded the budget of {args.max_seconds:.3f} s")
+
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
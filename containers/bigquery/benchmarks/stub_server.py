@@ -0,0 +1,355 @@
+"""Local stub of BigQuery jobs and tables REST API."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Self
+from urllib.parse import parse_qs, urlparse
+
+# HTTP status codes of responses with job errors. Other reasons are responded with 400.
+ERROR_STATUS_CODES = {
+    "backendError": 500,
+    "internalError": 500,
+    "jobBackendError": 500,
+    "jobInternalError": 500,
+    "rateLimitExceeded": 403,
+    "jobRateLimitExceeded": 403,
+}
+
+
+class StubBigQueryServer(ThreadingHTTPServer):
+    """BigQuery stub server where every job runs for ``job_duration`` seconds.
+
+    The server counts requests and TCP connections so that clients can be compared by round-trips.
+    Destination tables of query jobs are modified when the jobs finish.
+    A finished script job has one child job with ``dml_stats``. A query without the destination table writes
+    into an anonymous table, and the same query is a cache hit if ``useQueryCache`` is set.
+    Every query processes ``bytes_processed`` bytes, which is returned by a dry run immediately,
+    and a query job fails if it exceeds ``maximumBytesBilled``. A cancelled job finishes immediately as stopped.
+    Transient errors are injected with ``request_faults`` and ``job_faults``.
+    ``tables.get`` supports field masks and ``If-None-Match`` with the ETag, which changes when the table is modified.
+    A partition is a table whose ID has the partition decorator.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, job_duration: float = 1.0, port: int = 0) -> None:
+        """Initialize ``StubBigQueryServer`` listening on localhost."""
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.job_duration = job_duration
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self.tables: dict[str, dict[str, Any]] = {}
+        self.cached_results: dict[str, dict] = {}
+        self.bytes_processed = 0
+        self.dml_stats = {"insertedRowCount": "0", "updatedRowCount": "0", "deletedRowCount": "0"}
+        self.num_requests = 0
+        self.num_connections = 0
+        # Each `(method, status, reason)` fails the next request of the method.
+        self.request_faults: list[tuple[str, int, str]] = []
+        # Each reason fails the next created job when it finishes.
+        self.job_faults: list[str] = []
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def endpoint(self) -> str:
+        """Return base URL corresponding to ``https://bigquery.googleapis.com/bigquery/v2``."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/bigquery/v2"
+
+    def __enter__(self) -> Self:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Stop serving."""
+        self.shutdown()
+        self.server_close()
+
+    def reset_counters(self) -> None:
+        """Reset request and connection counters."""
+        with self.lock:
+            self.num_requests = 0
+            self.num_connections = 0
+
+    def set_table(
+        self,
+        table_id: str,
+        last_modified_ms: int | None = None,
+        labels: dict | None = None,
+        num_rows: int | None = None,
+    ) -> dict:
+        """Create or modify the table ``<PROJECT_ID>.<DATASET_ID>.<TABLE_ID>`` and return its resource."""
+        project, dataset, table = table_id.split(".")
+        with self.lock:
+            resource = self.tables.setdefault(
+                table_id,
+                {
+                    "tableReference": {"projectId": project, "datasetId": dataset, "tableId": table},
+                    "labels": {},
+                    "numRows": "0",
+                },
+            )
+            resource["lastModifiedTime"] = str(last_modified_ms or int(time.time() * 1000))
+            resource["labels"] |= labels or {}
+            if num_rows is not None:
+                resource["numRows"] = str(num_rows)
+            resource["etag"] = uuid.uuid4().hex
+        return resource
+
+    def create_job(self, project: str, payload: dict) -> dict:
+        """Register a new job and return its resource."""
+        job_id = payload.get("jobReference", {}).get("jobId") or f"stub_{uuid.uuid4().hex}"
+        creation_time_ms = int(time.time() * 1000)
+        configuration = payload.get("configuration", {})
+        if configuration.get("dryRun"):
+            return {
+                "jobReference": {"projectId": project, "location": payload.get("jobReference", {}).get("location", "US")},
+                "configuration": configuration,
+                "statistics": {
+                    "creationTime": str(creation_time_ms),
+                    "totalBytesProcessed": str(self.bytes_processed),
+                    "query": {"totalBytesProcessed": str(self.bytes_processed)},
+                },
+                "status": {"state": "DONE"},
+            }
+        cache_hit = False
+        query = configuration.get("query", {})
+        # A query with a single statement, unlike a script, writes into an anonymous table without the destination.
+        if query and "destinationTable" not in query and ";" not in query["query"].strip().rstrip(";"):
+            with self.lock:
+                cache_hit = query.get("useQueryCache", True) and query["query"] in self.cached_results
+                anonymous = {"projectId": project, "datasetId": "_stub_anonymous", "tableId": f"anon{uuid.uuid4().hex}"}
+                if not cache_hit:
+                    self.cached_results[query["query"]] = anonymous
+                query["destinationTable"] = self.cached_results[query["query"]]
+        with self.lock:
+            self.jobs[job_id] = {
+                "project": project,
+                "location": payload.get("jobReference", {}).get("location", "US"),
+                "configuration": configuration,
+                "created": time.monotonic(),
+                "creation_time_ms": creation_time_ms,
+                "cache_hit": cache_hit,
+                "cancelled": False,
+                "fault": self.job_faults.pop(0) if self.job_faults else None,
+            }
+        if destination := payload.get("configuration", {}).get("query", {}).get("destinationTable"):
+            table = destination["tableId"].split("$", maxsplit=1)[0]
+            table_id = f"{destination['projectId']}.{destination['datasetId']}.{table}"
+            self.set_table(table_id, last_modified_ms=creation_time_ms + int(self.job_duration * 1000))
+        return self.job_resource(job_id)
+
+    def job_resource(self, job_id: str) -> dict:
+        """Return the current job resource."""
+        job = self.jobs[job_id]
+        done = job["cancelled"] or time.monotonic() - job["created"] >= self.job_duration
+        # int64 values are strings in BigQuery REST API.
+        statistics = {"creationTime": str(job["creation_time_ms"]), "startTime": str(job["creation_time_ms"])}
+        status = {"state": "DONE" if done else "RUNNING"}
+        if job["cancelled"]:
+            status["errorResult"] = {"reason": "stopped", "message": "Job execution was cancelled."}
+        elif done and job["fault"]:
+            status["errorResult"] = {"reason": job["fault"], "message": "Injected transient error."}
+        elif done:
+            statistics["endTime"] = str(job["creation_time_ms"] + int(self.job_duration * 1000))
+            if query := job["configuration"].get("query"):
+                bytes_processed = 0 if job["cache_hit"] else self.bytes_processed
+                statistics["query"] = {
+                    "totalSlotMs": "0",
+                    "totalBytesProcessed": str(bytes_processed),
+                    "cacheHit": job["cache_hit"],
+                }
+                if bytes_processed > int(query.get("maximumBytesBilled", bytes_processed)):
+                    status["errorResult"] = {
+                        "reason": "bytesBilledLimitExceeded",
+                        "message": f"Query exceeded limit for bytes billed: {query['maximumBytesBilled']}.",
+                    }
+        return {
+            "kind": "bigquery#job",
+            "id": f"{job['project']}:{job['location']}.{job_id}",
+            "selfLink": f"{self.endpoint}/projects/{job['project']}/jobs/{job_id}?location={job['location']}",
+            "jobReference": {"projectId": job["project"], "jobId": job_id, "location": job["location"]},
+            "configuration": job["configuration"],
+            "statistics": statistics,
+            "status": status,
+        }
+
+    def cancel_job(self, job_id: str) -> dict:
+        """Cancel the job if it is running and return ``JobCancelResponse``."""
+        with self.lock:
+            job = self.jobs[job_id]
+            job["cancelled"] = job["cancelled"] or self.remaining(job_id) > 0
+        return {"kind": "bigquery#jobCancelResponse", "job": self.job_resource(job_id)}
+
+    def child_jobs(self, parent_job_id: str) -> list[dict]:
+        """Return child jobs of a script job, which exist after the script finishes."""
+        parent = self.job_resource(parent_job_id)
+        query = parent["configuration"].get("query")
+        if query is None or "destinationTable" in query or parent["status"]["state"] != "DONE":
+            return []
+        child = parent | {
+            "jobReference": parent["jobReference"] | {"jobId": f"script_job_{parent_job_id}_0"},
+            "statistics": parent["statistics"] | {"query": {"dmlStats": self.dml_stats}, "parentJobId": parent_job_id},
+        }
+        return [child]
+
+    def remaining(self, job_id: str) -> float:
+        """Return seconds until the job finishes."""
+        return max(0.0, self.jobs[job_id]["created"] + self.job_duration - time.monotonic())
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler of ``StubBigQueryServer``."""
+
+    protocol_version = "HTTP/1.1"
+    server: StubBigQueryServer
+
+    def setup(self) -> None:
+        """Count a new connection."""
+        super().setup()
+        with self.server.lock:
+            self.server.num_connections += 1
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Suppress access logs."""
+
+    def send_not_modified(self) -> None:
+        """Send ``304 Not Modified`` without a body."""
+        self.send_response(304)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_json(self, body: dict, status: int = 200) -> None:
+        """Send JSON response."""
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self) -> dict:
+        """Read JSON request body."""
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def count_request(self) -> bool:
+        """Count a new request and return ``True`` if an injected fault has been sent as the response."""
+        with self.server.lock:
+            self.server.num_requests += 1
+            faults = self.server.request_faults
+            fault = next((f for f in faults if f[0] == self.command), None)
+            if fault:
+                faults.remove(fault)
+        if fault is None:
+            return False
+        _, status, reason = fault
+        # Discard the request body so that the connection can be reused.
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_json({"error": {"code": status, "errors": [{"reason": reason}], "message": reason}}, status=status)
+        return True
+
+    def do_POST(self) -> None:
+        """Handle ``jobs.insert`` and ``jobs.cancel``."""
+        if self.count_request():
+            return
+        url = urlparse(self.path)
+        m = re.fullmatch(r"/bigquery/v2/projects/([^/]+)/jobs/([^/]+)/cancel", url.path)
+        if m and m.group(2) in self.server.jobs:
+            self.send_json(self.server.cancel_job(m.group(2)))
+            return
+        m = re.fullmatch(r"/bigquery/v2/projects/([^/]+)/jobs", url.path)
+        if not m:
+            self.send_json({"error": {"code": 404, "message": "Not found"}}, status=404)
+            return
+        payload = self.read_json()
+        if payload.get("jobReference", {}).get("jobId") in self.server.jobs:
+            self.send_json({"error": {"code": 409, "message": "Already Exists"}}, status=409)
+            return
+        self.send_json(self.server.create_job(project=m.group(1), payload=payload))
+
+    def table_id(self) -> str | None:
+        """Return ``<PROJECT_ID>.<DATASET_ID>.<TABLE_ID>`` if the request is for ``tables`` API."""
+        m = re.fullmatch(r"/bigquery/v2/projects/([^/]+)/datasets/([^/]+)/tables/([^/]+)", urlparse(self.path).path)
+        return ".".join(m.groups()) if m else None
+
+    def do_PATCH(self) -> None:
+        """Handle ``tables.patch``. Labels are merged and other fields are replaced."""
+        if self.count_request():
+            return
+        table_id = self.table_id()
+        if table_id not in self.server.tables:
+            self.send_json({"error": {"code": 404, "message": "Not found"}}, status=404)
+            return
+        body = self.read_json()
+        with self.server.lock:
+            table = self.server.tables[table_id]
+            table["labels"] |= body.pop("labels", {})
+            table |= body
+            table["etag"] = uuid.uuid4().hex
+        self.send_json(self.server.tables[table_id])
+
+    def get_table(self, table_id: str, params: dict[str, list[str]]) -> None:
+        """Handle ``tables.get`` with a field mask and ``If-None-Match``."""
+        if table_id not in self.server.tables:
+            self.send_json({"error": {"code": 404, "message": "Not found"}}, status=404)
+            return
+        table = self.server.tables[table_id]
+        if self.headers.get("If-None-Match") == table["etag"]:
+            self.send_not_modified()
+            return
+        if "fields" in params:
+            fields = params["fields"][0].split(",")
+            table = {k: v for k, v in table.items() if k in fields}
+        self.send_json(table)
+
+    def do_GET(self) -> None:
+        """Handle ``jobs.get``, ``jobs.list`` of child jobs, ``jobs.getQueryResults`` and ``tables.get``."""
+        if self.count_request():
+            return
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        if table_id := self.table_id():
+            self.get_table(table_id, params)
+            return
+
+        if re.fullmatch(r"/bigquery/v2/projects/([^/]+)/jobs", url.path):
+            parent_job_id = params.get("parentJobId", [""])[0]
+            jobs = self.server.child_jobs(parent_job_id) if parent_job_id in self.server.jobs else []
+            self.send_json({"kind": "bigquery#jobList", "jobs": jobs})
+            return
+
+        m = re.fullmatch(r"/bigquery/v2/projects/([^/]+)/(jobs|queries)/([^/]+)", url.path)
+        if not m or m.group(3) not in self.server.jobs:
+            self.send_json({"error": {"code": 404, "message": "Not found"}}, status=404)
+            return
+
+        job_id = m.group(3)
+        if m.group(2) == "jobs":
+            self.send_json(self.server.job_resource(job_id))
+            return
+
+        timeout = int(params.get("timeoutMs", ["10000"])[0]) / 1000
+        time.sleep(min(timeout, self.server.remaining(job_id)))
+        job = self.server.job_resource(job_id)
+        # BigQuery responds with the error of a failed job instead of the results.
+        if error := job["status"].get("errorResult"):
+            status = ERROR_STATUS_CODES.get(error["reason"], 400)
+            self.send_json({"error": {"code": status, "errors": [error], "message": error["message"]}}, status=status)
+            return
+        self.send_json(
+            {
+                "kind": "bigquery#getQueryResultsResponse",
+                "jobReference": job["jobReference"],
+                "jobComplete": job["status"]["state"] == "DONE",
+            },
+        )
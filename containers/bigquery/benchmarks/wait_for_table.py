@@ -0,0 +1,117 @@
+"""Check polling of ``wait-for-table`` against a local stub server.
+
+Each scenario modifies the stub tables in a background thread while the sensor polls them, and the number of
+requests is compared with polling the full table resource at a fixed interval.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.wait_for_table
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import requests
+from google.auth.credentials import AnonymousCredentials
+from tasks.jobs import JobClient
+from tasks.retry import Backoff
+from tasks.sensor import is_ready, wait_for_table
+
+from benchmarks.stub_server import StubBigQueryServer
+
+FIXED_INTERVAL = 0.05
+
+
+def wait_fixed_interval(
+    endpoint: str,
+    table_id: str,
+    min_rows: int,
+    max_staleness_seconds: float,
+    timeout: float,
+) -> bool:
+    """Wait in the way of ad-hoc components: ``tables.get`` of the full resource at a fixed interval."""
+    project, dataset, table = table_id.split(".")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        response = requests.get(f"{endpoint}/projects/{project}/datasets/{dataset}/tables/{table}", timeout=10)
+        resource = response.json() if response.ok else None
+        if is_ready(resource, min_rows, max_staleness_seconds, now_ms=int(time.time() * 1000)):
+            return True
+        time.sleep(FIXED_INTERVAL)
+    return False
+
+
+def main() -> None:
+    """Run the scenarios and exit with non-zero status if any of them does not behave as expected."""
+    table_id = "stub-project.sandbox.events"
+    # name, table to wait for, changes of (delay, table, rows), min rows, max staleness, whether it gets ready
+    scenarios = [
+        ("created", table_id, [(0.5, table_id, 1)], 0, 0.0, True),
+        ("rows", table_id, [(0.0, table_id, 0), (0.4, table_id, 5), (0.8, table_id, 20)], 10, 0.0, True),
+        ("partition", f"{table_id}$20240101", [(0.5, f"{table_id}$20240101", 3)], 1, 0.0, True),
+        ("stale", table_id, [(0.0, table_id, 10)], 0, 0.3, False),
+        ("fresh", table_id, [(0.0, table_id, 10), (0.3, table_id, 10)], 0, 0.2, True),
+    ]
+    failures = 0
+
+    print(f"{'scenario':<10} {'ready':<6} {'wall [s]':>9} {'requests':>9} {'304':>4} {'fixed interval':>15}")  # noqa: T201
+    for name, target, changes, min_rows, max_staleness, ready in scenarios:
+        with StubBigQueryServer() as server:
+            client = JobClient(credentials=AnonymousCredentials(), endpoint=server.endpoint)
+            first = [c for c in changes if c[0] == 0.0]
+            for _, t, rows in first:
+                server.set_table(t, last_modified_ms=int(time.time() * 1000) - 1000, num_rows=rows)
+
+            def modify(changes: list[tuple[float, str, int]] = changes, server: StubBigQueryServer = server) -> None:
+                start = time.monotonic()
+                for delay, t, rows in changes:
+                    if delay:
+                        time.sleep(max(0.0, delay - (time.monotonic() - start)))
+                        server.set_table(t, num_rows=rows)
+
+            thread = threading.Thread(target=modify)
+            thread.start()
+            start = time.perf_counter()
+            project, dataset, table = target.split(".")
+            try:
+                _, stats = wait_for_table(
+                    client,
+                    project=project,
+                    dataset=dataset,
+                    table=table,
+                    min_rows=min_rows,
+                    max_staleness_seconds=max_staleness,
+                    timeout_seconds=1.5,
+                    backoff=Backoff(initial=0.05, maximum=0.4),
+                )
+                result = True
+            except TimeoutError:
+                stats, result = {"not_modified": "-"}, False
+            wall = time.perf_counter() - start
+            thread.join()
+            num_requests = server.num_requests
+
+            server.tables.clear()
+            for _, t, rows in first:
+                server.set_table(t, last_modified_ms=int(time.time() * 1000) - 1000, num_rows=rows)
+            server.reset_counters()
+            thread = threading.Thread(target=modify)
+            thread.start()
+            wait_fixed_interval(server.endpoint, target, min_rows, max_staleness, timeout=wall)
+            thread.join()
+
+        print(  # noqa: T201
+            f"{name:<10} {result!s:<6} {wall:>9.2f} {num_requests:>9} {stats['not_modified']:>4} {server.num_requests:>15}",
+        )
+        if result != ready:
+            print(f"  expected ready={ready}")  # noqa: T201
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
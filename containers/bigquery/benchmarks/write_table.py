@@ -0,0 +1,53 @@
+"""Benchmark writing local files through Storage Write API streams with a local fake.
+
+Run from ``containers/bigquery``::
+
+    python -m benchmarks.write_table
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tasks.storage_write import write_table
+
+from benchmarks.fake_storage import FakeStreamWriter
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-files", type=int, default=8)
+    parser.add_argument("--rows-per-file", type=int, default=250_000)
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        paths = []
+        for i in range(args.num_files):
+            n = args.rows_per_file
+            table = pa.table(
+                {
+                    "id": pa.array(range(i * n, (i + 1) * n), pa.int64()),
+                    "value": pa.array([j / 7 for j in range(n)]),
+                },
+            )
+            paths.append(Path(d) / f"data-{i:012d}.parquet")
+            pq.write_table(table, paths[-1])
+
+        print(f"{'streams':>7} {'rows':>10} {'time [s]':>9} {'rows/s':>12}")  # noqa: T201
+        for max_streams in args.streams:
+            writer = FakeStreamWriter()
+            start = time.perf_counter()
+            rows = write_table(writer=writer, table="projects/p/datasets/d/tables/t", paths=paths, max_streams=max_streams)
+            elapsed = time.perf_counter() - start
+            print(f"{max_streams:>7} {rows:>10} {elapsed:>9.2f} {rows / elapsed:>12,.0f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
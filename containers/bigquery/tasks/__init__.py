@@ -1,76 +1,234 @@
 from __future__ import annotations
 
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
 
-import google.auth
-import google.auth.transport.requests
 import invoke
 import requests
-from google.cloud import bigquery
-from google.protobuf.json_format import MessageToJson
-from google_cloud_pipeline_components.container.utils import artifact_utils
-from google_cloud_pipeline_components.proto.gcp_resources_pb2 import GcpResources
-from google_cloud_pipeline_components.types.artifact_types import BQTable
-
-
-def insert_bigquery_job(payload: dict, project: str) -> requests.Response:
-    """Insert BigQuery job using REST API."""
-    creds, _ = google.auth.default()
-    creds.refresh(google.auth.transport.requests.Request())
-
-    headers = {
-        "Content-type": "application/json",
-        "Authorization": f"Bearer {creds.token}",
-        "User-Agent": "google-cloud-pipeline-components",
-    }
 
-    job = requests.post(
-        url=f"https://www.googleapis.com/bigquery/v2/projects/{project}/jobs",
-        data=json.dumps(payload),
-        headers=headers,
-        timeout=90,
-    ).json()
-
-    # Wait for the job finishing.
-    while True:
-
-        if job["status"]["state"] == "DONE":
-            if "errorResult" in job["status"]:
-                raise Exception(job["status"]["errorResult"])
-            break
-
-        if not creds.valid:
-            creds.refresh(google.auth.transport.requests.Request())
-
-        job = requests.get(
-            url=job["selfLink"],
-            headers={
-                "Content-type": "application/json",
-                "Authorization": f"Bearer {creds.token}",
-            },
-            timeout=90,
-        ).json()
+from . import freshness, sensor
+from .cancellation import IN_FLIGHT_JOBS, cancel_on_termination
+from .executor_output import (
+    OutputArtifact,
+    bq_table,
+    input_artifact_metadata,
+    output_artifact_uri,
+    update_output_artifacts,
+    write_gcp_resources,
+)
+from .jobs import JobClient, deterministic_job_id, dry_run_bytes_processed, get_client, insert_bigquery_job
+from .manifest import MANIFEST_FILE_NAME, build_manifest, combine_manifests, write_manifest
+from .metrics import PhaseTimer, dml_metrics, job_metrics, total_job_metrics, write_metrics_file
+from .retry import RETRIES, Backoff, retry_call
 
-        time.sleep(3)
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
-    return job
+    from google.cloud import bigquery
 
+T = TypeVar("T")
 
-@invoke.task
-def query(
-    c: invoke.Context,  # noqa: ARG001
+
+def query_payload(
     job_project: str,
     query: str,
     destination_project: str,
     destination_dataset: str,
     destination_table: str,
     location: str = "US",
+    query_params: list | None = None,
+    labels: dict | None = None,
+    create_disposition: str = "CREATE_IF_NEEDED",
+    write_disposition: str = "WRITE_TRUNCATE",
+    time_partitioning: dict | None = None,
+    range_partitioning: dict | None = None,
+    clustering_fields: list[str] | None = None,
+    use_query_cache: bool = True,  # noqa: FBT001, FBT002
+    max_bytes_billed: int = 0,
+) -> dict:
+    """Build request body of ``jobs.insert`` for a query job.
+
+    The destination table is omitted if ``destination_table`` is empty, as required by scripts.
+    The result of a query without the destination table is written into an anonymous table, and cached results
+    are returned from there if ``use_query_cache`` is set.
+    ``destination_table`` may have a partition decorator such as ``table$20240101``.
+    Bytes billed are not limited if ``max_bytes_billed`` is 0.
+    """
+    payload = {
+        "configuration": {
+            "query": {
+                "query": query,
+                "queryParameters": query_params or [],
+                "useLegacySql": False,
+                "useQueryCache": use_query_cache,
+            },
+            "labels": labels or {},
+        },
+        "jobReference": {
+            "projectId": job_project,
+            "location": location,
+        },
+    }
+    if max_bytes_billed:
+        payload["configuration"]["query"]["maximumBytesBilled"] = str(max_bytes_billed)
+    if destination_table:
+        payload["configuration"]["query"] |= {
+            "destinationTable": {
+                "projectId": destination_project,
+                "datasetId": destination_dataset,
+                "tableId": destination_table,
+            },
+            "createDisposition": create_disposition,
+            "writeDisposition": write_disposition,
+        }
+        if time_partitioning:
+            payload["configuration"]["query"]["timePartitioning"] = time_partitioning
+        if range_partitioning:
+            payload["configuration"]["query"]["rangePartitioning"] = range_partitioning
+        if clustering_fields:
+            payload["configuration"]["query"]["clustering"] = {"fields": clustering_fields}
+    return payload
+
+
+def merge_script(
+    query: str,
+    destination_project: str,
+    destination_dataset: str,
+    destination_table: str,
+    merge_keys: list[str],
+    watermark_column: str = "",
+) -> str:
+    """Return a script upserting the result of ``query`` into the destination table on ``merge_keys``.
+
+    The result is staged in a temporary table and merged into the destination, which is created if missing.
+    Columns other than the keys are updated, and ``WHEN MATCHED`` is omitted if there are no such columns.
+    Columns are inserted by name because the staged columns may be in a different order from the destination.
+    If ``watermark_column`` is given, rows of the destination older than the staged rows are not scanned, which
+    prunes partitions of a table partitioned by the column.
+    """
+    table = f"{destination_project}.{destination_dataset}.{destination_table}"
+    body = query.strip().rstrip(";")
+    on = " AND ".join(f"T.`{k}` = S.`{k}`" for k in merge_keys)
+    # The watermark is embedded as a literal with `%T` because a subquery in the condition does not prune partitions.
+    watermark = ""
+    if watermark_column:
+        on += f" AND T.`{watermark_column}` >= %T"
+        watermark = f"\n  (SELECT MIN(`{watermark_column}`) FROM kfpc_staging),"  # noqa: S608
+
+    # `update_columns` is NULL if all columns are keys, so `CONCAT` omits `WHEN MATCHED` instead of `UPDATE SET NULL`.
+    return f"""DECLARE update_columns, insert_columns, insert_values STRING;
+
+CREATE TEMP TABLE kfpc_staging AS (
+{body}
+);
+
+CREATE TABLE IF NOT EXISTS `{table}` AS SELECT * FROM kfpc_staging LIMIT 0;
+
+SET (update_columns, insert_columns, insert_values) = (
+  SELECT AS STRUCT
+    STRING_AGG(
+      IF(column_name IN UNNEST({json.dumps(merge_keys)}), NULL, FORMAT("`%s` = S.`%s`", column_name, column_name)),
+      ", " ORDER BY ordinal_position
+    ),
+    STRING_AGG(FORMAT("`%s`", column_name), ", " ORDER BY ordinal_position),
+    STRING_AGG(FORMAT("S.`%s`", column_name), ", " ORDER BY ordinal_position)
+  FROM `{destination_project}.{destination_dataset}.INFORMATION_SCHEMA.COLUMNS`
+  WHERE table_name = "{destination_table}"
+);
+
+EXECUTE IMMEDIATE FORMAT(
+  '''
+  MERGE `{table}` AS T
+  USING kfpc_staging AS S
+  ON {on}
+  %s
+  WHEN NOT MATCHED THEN INSERT (%s) VALUES (%s)
+  ''',{watermark}
+  IFNULL(CONCAT("WHEN MATCHED THEN UPDATE SET ", update_columns), ""),
+  insert_columns,
+  insert_values
+);"""  # noqa: S608
+
+
+def check_bytes_billed(payload: dict, project: str, max_bytes_billed: int) -> int:
+    """Estimate bytes processed by the query with a dry run, and fail if it exceeds ``max_bytes_billed``."""
+    estimated_bytes = dry_run_bytes_processed(payload=payload, project=project)
+    if max_bytes_billed and estimated_bytes > max_bytes_billed:
+        msg = f"The query would process {estimated_bytes} bytes, which exceeds max_bytes_billed {max_bytes_billed}."
+        raise RuntimeError(msg)
+    return estimated_bytes
+
+
+def script_dml_metrics(project: str, job: dict) -> dict[str, float]:
+    """Return the numbers of rows modified by DML statements of a script job.
+
+    Empty metrics are returned if child jobs cannot be listed, because the rows have been modified anyway.
+    """
+    job_id = job["jobReference"]["jobId"]
+    try:
+        child_jobs = get_client().list_child_jobs(project=project, parent_job_id=job_id)
+    except requests.RequestException as e:
+        print(f"Rows modified by {job_id} are not reported: {e}")  # noqa: T201
+        return {}
+    return dml_metrics(child_jobs)
+
+
+def timestamp_ms(value: str) -> int:
+    """Return milliseconds since the epoch of RFC 3339 timestamp such as ``2025-01-01T00:00:00Z``."""
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def metrics_artifact(
+    executor_input: str,
+    job: dict | None,
+    timer: PhaseTimer,
+    metrics_file: str = "",
+    extra_metrics: dict | None = None,
+) -> OutputArtifact:
+    """Build ``system.Metrics`` artifact of job statistics and phase durations, and dump it to ``metrics_file``.
+
+    ``job`` is ``None`` if the task finished without running a job. Retries of requests and jobs are counted.
+    """
+    metrics = (job_metrics(job) if job else {}) | timer.metrics() | RETRIES.metrics() | (extra_metrics or {})
+    if metrics_file:
+        ref = job["jobReference"] if job else {}
+        labels = {"job_id": ref.get("jobId", ""), "location": ref.get("location", "")}
+        write_metrics_file(metrics_file, metrics=metrics, labels=labels)
+    return OutputArtifact(name="metrics", uri=output_artifact_uri(executor_input, "metrics"), metadata=metrics)
+
+
+@invoke.task(iterable=["depend_on_uri"])
+@cancel_on_termination()
+def query(  # noqa: PLR0913, PLR0917
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    query: str,
+    destination_project: str = "",
+    destination_dataset: str = "",
+    destination_table: str = "",
+    location: str = "US",
     query_params: str = "[]",
     labels: str = "{}",
+    use_query_cache: bool = True,  # noqa: FBT001, FBT002
+    max_bytes_billed: int = 0,
+    dry_run_first: bool = False,  # noqa: FBT001, FBT002
     create_disposition: str = "CREATE_IF_NEEDED",
     write_disposition: str = "WRITE_TRUNCATE",
+    time_partitioning: str = "{}",
+    range_partitioning: str = "{}",
+    clustering_fields: str = "[]",
+    destination_expiration: str = "",
+    mode: str = "truncate",
+    merge_keys: str = "[]",
+    watermark_column: str = "",
+    pipeline_job_id: str = "",
+    pipeline_task_name: str = "",
+    skip_if_fresh: bool = False,  # noqa: FBT001, FBT002
+    depend_on_uri: list[str] | None = None,
+    metrics_file: str = "",
     executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
     gcp_resources: str = "tmp/gcp_resources.json",
 ) -> None:
@@ -88,6 +246,13 @@ def query(
         JSON string for query parameters.
     labels:
         JSON string for labels.
+    use_query_cache:
+        useQueryCache of JobConfigurationQuery. Cached results are used only without the destination table.
+    max_bytes_billed:
+        maximumBytesBilled of JobConfigurationQuery. The job fails if it would bill more bytes. Unlimited if 0.
+    dry_run_first:
+        If set, bytes processed by the query are estimated with a dry run before the job is submitted,
+        and the task fails immediately if the estimate exceeds ``max_bytes_billed``.
     create_disposition:
         createDisposition of JobConfigurationQuery.
         https://cloud.google.com/bigquery/docs/reference/rest/v2/Job#jobconfigurationquery
@@ -101,123 +266,1002 @@ def query(
     destination_dataset:
         BigQuery dataset ID of destination.
     destination_table:
-        BigQuery table ID of destination.
+        BigQuery table ID of destination. A partition decorator such as ``table$20240101`` with
+        ``WRITE_TRUNCATE`` replaces only the partition. If empty, the result is written into an anonymous
+        table, which is emitted as the output.
+    time_partitioning:
+        JSON string for timePartitioning of JobConfigurationQuery.
+    range_partitioning:
+        JSON string for rangePartitioning of JobConfigurationQuery.
+    clustering_fields:
+        JSON array of columns to cluster the destination table by.
+    destination_expiration:
+        Expiration time of the destination table in RFC 3339 format. The table is not changed if empty.
+    mode:
+        ``truncate`` to overwrite the destination table with the result, or ``merge`` to upsert the result
+        into the destination table on ``merge_keys`` with a script job.
+    merge_keys:
+        JSON array of key columns of ``merge`` mode.
+    watermark_column:
+        Column of ``merge`` mode whose minimum in the result limits rows of the destination table to scan.
+    pipeline_job_id:
+        Pipeline run ID. If set with ``pipeline_task_name``, the job ID is derived from them and the job
+        configuration, and a job submitted by a previous attempt of the task is re-attached.
+    pipeline_task_name:
+        Pipeline task name.
+    skip_if_fresh:
+        If set, the job is skipped when the destination table was written by the same query after all tables of
+        ``depend_on_uri`` were modified, and the existing table is emitted as the output.
+    depend_on_uri:
+        URIs of ``google.BQTable`` artifacts of source tables checked by ``skip_if_fresh``.
+        Repeat the option for multiple tables.
+    metrics_file:
+        Path to dump metrics of the job. Prometheus textfile if it ends with ``.prom``, and JSON otherwise.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+    gcp_resources:
+        GCP resources output path.
+
+    """
+    job_query, job_destination = query, (destination_project, destination_dataset, destination_table)
+    if mode == "merge":
+        # A script job merges the result, and the job configuration cannot have the destination table.
+        job_query = merge_script(
+            query,
+            *job_destination,
+            merge_keys=json.loads(merge_keys),
+            watermark_column=watermark_column,
+        )
+        job_destination = ("", "", "")
+
+    payload = query_payload(
+        job_project=job_project,
+        query=job_query,
+        destination_project=job_destination[0],
+        destination_dataset=job_destination[1],
+        destination_table=job_destination[2],
+        location=location,
+        query_params=json.loads(query_params),
+        labels=json.loads(labels),
+        create_disposition=create_disposition,
+        write_disposition=write_disposition,
+        time_partitioning=json.loads(time_partitioning),
+        range_partitioning=json.loads(range_partitioning),
+        clustering_fields=json.loads(clustering_fields),
+        use_query_cache=use_query_cache,
+        max_bytes_billed=max_bytes_billed,
+    )
+
+    if pipeline_job_id and pipeline_task_name:
+        payload["jobReference"]["jobId"] = deterministic_job_id(pipeline_job_id, pipeline_task_name, payload)
+
+    timer = PhaseTimer()
+    # Table metadata and the output artifact refer to the whole table rather than the partition.
+    destination = (destination_project, destination_dataset, destination_table.split("$", maxsplit=1)[0])
+    digest = freshness.query_hash(payload)
+    fresh = False
+
+    if skip_if_fresh:
+        with timer.phase("freshness_check"):
+            sources = [parse_table_uri(uri) for uri in depend_on_uri or []]
+            fresh = freshness.is_fresh(get_client(), destination=destination, sources=sources, digest=digest)
+
+    extra_metrics = {"skipped": int(fresh)}
+    if dry_run_first and not fresh:
+        with timer.phase("dry_run"):
+            estimated_bytes = check_bytes_billed(payload=payload, project=job_project, max_bytes_billed=max_bytes_billed)
+        extra_metrics["estimated_bytes_processed"] = estimated_bytes
+
+    job = None if fresh else insert_bigquery_job(payload=payload, project=job_project, timer=timer)
+
+    # The anonymous table of the result, which is the cached one if `cache_hit` of the metrics is 1.
+    if not destination_table and mode != "merge":
+        ref = job["configuration"]["query"]["destinationTable"]
+        destination = (ref["projectId"], ref["datasetId"], ref["tableId"])
+
+    # Report rows upserted by MERGE statement of the script.
+    if mode == "merge" and job:
+        with timer.phase("dml_stats"):
+            extra_metrics |= script_dml_metrics(project=job_project, job=job)
+
+    with timer.phase("artifact_write"):
+        # Update labels and expiration of the destination table at once.
+        table_patch = {}
+        if skip_if_fresh and job:
+            table_patch["labels"] = freshness.fresh_labels(digest, started_ms=int(job["statistics"]["creationTime"]))
+        if destination_expiration:
+            table_patch["expirationTime"] = str(timestamp_ms(destination_expiration))
+        if table_patch:
+            get_client().patch_table(*destination, body=table_patch)
+
+        # Write GCP resources.
+        write_gcp_resources(gcp_resources, [job] if job else [])
+
+        # Write BQTable artifact.
+        bq_table_artifact = bq_table("destination_table", *destination)
+
+    metrics = metrics_artifact(
+        executor_input,
+        job=job,
+        timer=timer,
+        metrics_file=metrics_file,
+        extra_metrics=extra_metrics,
+    )
+    update_output_artifacts(executor_input, [bq_table_artifact, metrics])
+
+
+@invoke.task
+@cancel_on_termination()
+def query_batch(
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    queries: str,
+    location: str = "US",
+    max_concurrency: int = 16,
+    labels: str = "{}",
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+    gcp_resources: str = "tmp/gcp_resources.json",
+) -> None:
+    """Execute BigQuery query jobs concurrently.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    job_project:
+        Google Cloud Platform project where the jobs are executed.
+    queries:
+        JSON array of objects with keys ``query``, ``destination_project``, ``destination_dataset`` and
+        ``destination_table``.
+    location:
+        Location of the dataset that will be queried.
+    max_concurrency:
+        Maximum number of jobs running at the same time.
+    labels:
+        JSON string for labels.
+    metrics_file:
+        Path to dump metrics summed over the jobs. Prometheus textfile if it ends with ``.prom``, and JSON otherwise.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+    gcp_resources:
+        GCP resources output path.
+
+    """
+    specs = json.loads(queries)
+    client = JobClient(pool_maxsize=max_concurrency)
+    # Durations of phases of concurrent jobs are summed up.
+    timer = PhaseTimer()
+
+    def run(spec: dict) -> dict:
+        payload = query_payload(job_project=job_project, location=location, labels=json.loads(labels), **spec)
+        return insert_bigquery_job(payload=payload, project=job_project, timer=timer, client=client)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(run, spec) for spec in specs]
+        wait(futures)
+
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    jobs = [f.result() for f in futures if f.exception() is None]
+
+    # Write GCP resources even if some jobs failed.
+    write_gcp_resources(gcp_resources, jobs)
+
+    if errors:
+        msg = f"{len(errors)} of {len(specs)} query jobs failed."
+        raise RuntimeError(msg) from errors[0]
+
+    with timer.phase("artifact_write"):
+        # Write BQTable artifacts.
+        bq_table_artifacts = [
+            bq_table(
+                name=f"destination_table{i + 1}",
+                project_id=spec["destination_project"],
+                dataset_id=spec["destination_dataset"],
+                table_id=spec["destination_table"],
+            )
+            for i, spec in enumerate(specs)
+        ]
+
+    metrics = metrics_artifact(
+        executor_input,
+        job=None,
+        timer=timer,
+        metrics_file=metrics_file,
+        extra_metrics=total_job_metrics(jobs),
+    )
+    update_output_artifacts(executor_input, [*bq_table_artifacts, metrics])
+
+
+def script_statement(query: str, destination_project: str, destination_dataset: str, destination_table: str) -> str:
+    """Return a statement of a script materializing the result of ``query`` like ``WRITE_TRUNCATE``."""
+    # A trailing comment or semicolon of the query must not swallow the closing parenthesis.
+    body = query.strip().rstrip(";")
+    return f"CREATE OR REPLACE TABLE `{destination_project}.{destination_dataset}.{destination_table}` AS (\n{body}\n);"
+
+
+@invoke.task(iterable=["query", "destination_project", "destination_dataset", "destination_table"])
+@cancel_on_termination()
+def query_script(
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    query: list[str] | None = None,
+    destination_project: list[str] | None = None,
+    destination_dataset: list[str] | None = None,
+    destination_table: list[str] | None = None,
+    location: str = "US",
+    labels: str = "{}",
+    pipeline_job_id: str = "",
+    pipeline_task_name: str = "",
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+    gcp_resources: str = "tmp/gcp_resources.json",
+) -> None:
+    """Execute queries as one BigQuery multi-statement script job.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    job_project:
+        Google Cloud Platform project where the job is executed.
+    query:
+        SQL strings executed in order. Repeat the option for multiple queries.
+    destination_project:
+        Google Cloud Platform project ID of destination of each query.
+    destination_dataset:
+        BigQuery dataset ID of destination of each query.
+    destination_table:
+        BigQuery table ID of destination of each query.
+    location:
+        Location of the dataset that will be queried.
+    labels:
+        JSON string for labels.
+    pipeline_job_id:
+        Pipeline run ID used to derive the job ID with ``pipeline_task_name``.
+    pipeline_task_name:
+        Pipeline task name.
+    metrics_file:
+        Path to dump metrics of the job. Prometheus textfile if it ends with ``.prom``, and JSON otherwise.
     executor_input:
         Automatically passed by Kubeflow Pipelines.
     gcp_resources:
         GCP resources output path.
 
     """
+    destinations = list(zip(destination_project or [], destination_dataset or [], destination_table or [], strict=True))
+    statements = [script_statement(q, *d) for q, d in zip(query or [], destinations, strict=True)]
+
+    payload = query_payload(
+        job_project=job_project,
+        query="\n\n".join(statements),
+        destination_project="",
+        destination_dataset="",
+        destination_table="",
+        location=location,
+        labels=json.loads(labels),
+    )
+
+    if pipeline_job_id and pipeline_task_name:
+        payload["jobReference"]["jobId"] = deterministic_job_id(pipeline_job_id, pipeline_task_name, payload)
+
+    timer = PhaseTimer()
+    job = insert_bigquery_job(payload=payload, project=job_project, timer=timer)
+
+    with timer.phase("artifact_write"):
+        # Write GCP resources.
+        write_gcp_resources(gcp_resources, [job])
+
+        # Write BQTable artifacts.
+        bq_table_artifacts = [
+            bq_table(name=f"destination_table{i + 1}", project_id=p, dataset_id=d, table_id=t)
+            for i, (p, d, t) in enumerate(destinations)
+        ]
+
+    update_output_artifacts(
+        executor_input,
+        [*bq_table_artifacts, metrics_artifact(executor_input, job=job, timer=timer, metrics_file=metrics_file)],
+    )
+
+
+def parse_table_uri(table_uri: str) -> tuple[str, str, str]:
+    """Return project, dataset and table IDs of URI of ``google.BQTable`` artifact.
+
+    ``table_uri`` is
+    https://www.googleapis.com/bigquery/v2/projects/<PROJECT_ID>/datasets/<DATASET_ID>/tables/<TABLE_ID>
+    """
+    parts = table_uri.split("/")
+    return parts[-5], parts[-3], parts[-1]
+
+
+def local_path(uri: str) -> Path:
+    """Return the path where ``gs://`` URI is mounted by Vertex Pipelines."""
+    return Path(uri.replace("gs://", "/gcs/", 1))
+
+
+FILE_EXTENSIONS = {
+    "NEWLINE_DELIMITED_JSON": ".jsonl",
+    "CSV": ".csv",
+    "AVRO": ".avro",
+    "PARQUET": ".parquet",
+    "ARROW": ".arrow",
+}
+
+
+def file_pattern(destination_format: str, compression: str) -> str:
+    """Return the file name pattern of extracted files."""
+    extension = FILE_EXTENSIONS[destination_format]
+    # Avro and Parquet are compressed inside the files.
+    if compression == "GZIP" and destination_format in ["NEWLINE_DELIMITED_JSON", "CSV"]:
+        extension += ".gz"
+    return f"data-*{extension}"
+
+
+def run_client_job(submit: Callable[[], T], timer: PhaseTimer, max_attempts: int = 3) -> T:
+    """Submit a job with ``google.cloud.bigquery`` and wait for it.
+
+    The job is resubmitted if it fails with a transient error, and cancelled if the process is terminated.
+    """
+
+    def run(attempt: int) -> T:  # noqa: ARG001
+        with timer.phase("submit"):
+            job = submit()
+        with timer.phase("wait"), IN_FLIGHT_JOBS.track(
+            job.job_id,
+            cancel=lambda timeout: job.cancel(retry=None, timeout=timeout),
+            done=lambda timeout: job.done(retry=None, timeout=timeout),
+        ):
+            job.result()
+        return job
+
+    return retry_call(run, kind="job", deadline=None, max_attempts=max_attempts)
+
+
+def extract_slices(
+    client: bigquery.Client,
+    table: tuple[str, str, str],
+    partitions: list[str],
+    row_filters: list[str],
+    split_by_partition: bool,  # noqa: FBT001
+) -> list[dict]:
+    """Return slices of ``table`` extracted by separate jobs into the prefixes of the destination.
+
+    A slice has ``source``, which is the table with a partition decorator, or ``row_filter`` selecting its rows.
+    The whole table is one slice without a prefix if it is not split.
+    """
+    project, dataset, table_id = table
+    if split_by_partition:
+        partitions = client.list_partitions(".".join(table))
+    if partitions:
+        return [{"prefix": f"partition={p}", "source": (project, dataset, f"{table_id}${p}")} for p in partitions]
+    if row_filters:
+        return [{"prefix": f"filter={i}", "row_filter": f} for i, f in enumerate(row_filters)]
+    return [{"prefix": "", "source": table}]
+
+
+def table_schema(project: str, dataset: str, table: str) -> list[dict]:
+    """Return fields of the table schema with a field-masked ``tables.get``."""
+    return get_client().get_table(project, dataset, table, fields="schema").get("schema", {}).get("fields", [])
+
+
+def num_rows(table: tuple[str, str, str]) -> int | None:
+    """Return the number of rows of the table with a field-masked ``tables.get``."""
+    rows = get_client().get_table(*table, fields="numRows").get("numRows")
+    # int64 values are strings in BigQuery REST API.
+    return None if rows is None else int(rows)
+
+
+@invoke.task
+@cancel_on_termination()
+def extract(
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    table_uri: str,
+    destination_uri: str,
+    location: str = "US",
+    destination_format: str = "NEWLINE_DELIMITED_JSON",
+    compression: str = "NONE",
+    partitions: str = "[]",
+    row_filters: str = "[]",
+    split_by_partition: bool = False,  # noqa: FBT001, FBT002
+    max_concurrency: int = 8,
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+) -> None:
+    """Execute BigQuery extract job.
+
+    If the table is split by ``partitions``, ``split_by_partition`` or ``row_filters``, up to ``max_concurrency``
+    jobs extract the slices into their prefixes, and the files of all jobs are recorded in one manifest.
+    Rows matching a filter are selected into an anonymous table by a query job before they are extracted.
+    """
+    from google.cloud import bigquery, storage  # noqa: PLC0415
+
+    table = parse_table_uri(table_uri)
+    pattern = file_pattern(destination_format=destination_format, compression=compression)
+
+    timer = PhaseTimer()
+    client = bigquery.Client()
+    storage_client = storage.Client(project=job_project)
+    with timer.phase("plan"):
+        slices = extract_slices(
+            client,
+            table=table,
+            partitions=json.loads(partitions),
+            row_filters=json.loads(row_filters),
+            split_by_partition=split_by_partition,
+        )
+        # Record the schema so that `load` needs no hand-written schema.
+        schema = table_schema(*table)
+
+    def run(s: dict) -> tuple[bigquery.ExtractJob, dict]:
+        source = s.get("source")
+        if "row_filter" in s:
+            query_job = run_client_job(
+                lambda: client.query(
+                    f"SELECT * FROM `{'.'.join(table)}` WHERE {s['row_filter']}",  # noqa: S608
+                    project=job_project,
+                    location=location,
+                ),
+                timer=timer,
+            )
+            source = (query_job.destination.project, query_job.destination.dataset_id, query_job.destination.table_id)
+        destination_uris = ["/".join(p for p in [destination_uri.rstrip("/"), s["prefix"], pattern] if p)]
+        job = run_client_job(
+            lambda: client.extract_table(
+                project=job_project,
+                source=".".join(source),
+                destination_uris=destination_uris,
+                location=location,
+                job_config=bigquery.ExtractJobConfig(
+                    destination_format=destination_format,
+                    compression=compression,
+                    # `load` skips the header, which is recorded in the metadata.
+                    print_header=True,
+                    use_avro_logical_types=destination_format == bigquery.DestinationFormat.AVRO,
+                ),
+            ),
+            timer=timer,
+        )
+        with timer.phase("artifact_write"):
+            # Record exact files so that consumers need not list the bucket.
+            manifest = build_manifest(
+                client=storage_client,
+                root_uri=destination_uri,
+                destination_uris=destination_uris,
+                file_counts=job.destination_uri_file_counts,
+                total_rows=num_rows(source),
+                input_bytes=job._properties.get("statistics", {}).get("extract", {}).get("inputBytes"),  # noqa: SLF001
+            )
+        return job, manifest
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(slices)))) as executor:
+        futures = [executor.submit(run, s) for s in slices]
+        wait(futures)
+
+    errors = [f.exception() for f in futures if f.exception() is not None]
+    if errors:
+        msg = f"{len(errors)} of {len(slices)} extract jobs failed."
+        raise RuntimeError(msg) from errors[0]
+    jobs, manifests = zip(*(f.result() for f in futures), strict=True)
+
+    with timer.phase("artifact_write"):
+        if len(slices) == 1 and not slices[0]["prefix"]:
+            manifest = manifests[0]
+        else:
+            manifest = combine_manifests(list(manifests), prefixes=[s["prefix"] for s in slices])
+        manifest_uri = write_manifest(client=storage_client, directory_uri=destination_uri, manifest=manifest)
+
+        # Record the format so that `load` can read the files without options.
+        output_files_artifact = OutputArtifact(
+            name="output_files",
+            uri=destination_uri,
+            metadata={
+                "destinationFormat": destination_format,
+                "compression": compression,
+                "printHeader": destination_format == "CSV",
+                "filePattern": f"*/{pattern}" if slices[0]["prefix"] else pattern,
+                "manifest": manifest,
+                "manifestUri": manifest_uri,
+                "schema": schema,
+            },
+        )
+
+    # Statistics of each job are not reported when the table is split, but the number of jobs and input bytes are.
+    job = jobs[0]._properties if len(jobs) == 1 else None  # noqa: SLF001
+    extra_metrics = {} if job else {"extract_jobs": len(jobs), "input_bytes": manifest["inputBytes"] or 0}
+    update_output_artifacts(
+        executor_input,
+        [
+            output_files_artifact,
+            metrics_artifact(executor_input, job=job, timer=timer, metrics_file=metrics_file, extra_metrics=extra_metrics),
+        ],
+    )
+
+
+# Maximum number of source URIs of a load job.
+MAX_SOURCE_URIS = 10_000
+
+
+def source_uris_of(
+    source_uri: str,
+    source_uri_suffix: str | None,
+    metadata: dict,
+    explicit: bool = True,  # noqa: FBT001, FBT002
+) -> list[str]:
+    """Return URIs of files to load from a source artifact.
+
+    Without ``source_uri_suffix``, files listed in the manifest recorded by ``extract`` are loaded explicitly.
+    If ``explicit`` is ``False``, they are matched by a wildcard URI per directory, because a URI can have only
+    one wildcard and files of a split extract are in subdirectories.
+    """
+    if source_uri_suffix:
+        return [f"{source_uri.rstrip('/')}/{source_uri_suffix.lstrip('/')}"]
+    if "manifest" in metadata and explicit:
+        return [f["uri"] for f in metadata["manifest"]["files"]]
+    if "manifest" in metadata:
+        pattern = metadata["filePattern"].rsplit("/", 1)[-1]
+        directories = dict.fromkeys(f["uri"].rsplit("/", 1)[0] for f in metadata["manifest"]["files"])
+        return [f"{directory}/{pattern}" for directory in directories]
+    if "filePattern" in metadata:
+        return [f"{source_uri.rstrip('/')}/{metadata['filePattern']}"]
+    return [source_uri]
+
+
+def load_source_uris(source_uri: list[str], source_uri_suffix: str | None, source_metadata: list[dict]) -> list[str]:
+    """Return URIs of files of all source artifacts, falling back to wildcards if there are too many files."""
+
+    def uris(explicit: bool) -> list[str]:  # noqa: FBT001
+        return [
+            uri
+            for artifact_uri, metadata in zip(source_uri, source_metadata, strict=True)
+            for uri in source_uris_of(artifact_uri, source_uri_suffix, metadata, explicit=explicit)
+        ]
+
+    source_uris = uris(explicit=True)
+    if len(source_uris) > MAX_SOURCE_URIS:
+        source_uris = uris(explicit=False)
+    if len(source_uris) > MAX_SOURCE_URIS:
+        msg = f"{len(source_uris)} source URIs exceed {MAX_SOURCE_URIS} of a load job. Load fewer artifacts at once."
+        raise ValueError(msg)
+    return source_uris
+
+
+def artifact_schema(metadata: dict) -> list[dict]:
+    """Return the schema recorded in the metadata of a source artifact by ``extract``.
+
+    The schema is fetched once by ``extract`` and passed to ``load`` in the artifact, so ``load`` sends no request
+    for it. An empty list is returned for artifacts not written by ``extract``.
+    """
+    return metadata.get("schema", [])
+
+
+@invoke.task(iterable=["source_uri"])
+@cancel_on_termination()
+def load(
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    destination_project: str,
+    destination_dataset: str,
+    destination_table: str,
+    schema: str,
+    source_uri: list[str] | None = None,
+    source_uri_suffix: str | None = None,
+    source_format: str | None = None,
+    location: str = "US",
+    write_disposition: str = "WRITE_TRUNCATE",
+    skip_leading_rows: int | None = None,
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+) -> None:
+    """Execute BigQuery load job.
+
+    Files of all ``source_uri`` are loaded by one job. ``source_uri_suffix``, ``source_format``, an empty
+    ``schema`` and ``skip_leading_rows`` default to the values recorded in the metadata of the source artifacts
+    by ``extract``. The header of CSV files written by ``extract`` is skipped. Files listed in the manifests are
+    loaded by their URIs, or by wildcard URIs if they exceed ``MAX_SOURCE_URIS`` of a load job.
+    """
+    from google.cloud import bigquery  # noqa: PLC0415
+
+    source_uri = source_uri or []
+    # `source_uri` is given in the order of inputs `source_artifact1`, `source_artifact2` and so on.
+    source_metadata = [input_artifact_metadata(executor_input, f"source_artifact{i + 1}") for i in range(len(source_uri))]
+    if not source_format:
+        formats = {m.get("destinationFormat", "NEWLINE_DELIMITED_JSON") for m in source_metadata}
+        if len(formats) > 1:
+            msg = f"Source artifacts have different formats {sorted(formats)}, so source_format must be specified."
+            raise ValueError(msg)
+        source_format = formats.pop() if formats else "NEWLINE_DELIMITED_JSON"
+
+    if skip_leading_rows is None and source_format == "CSV":
+        headers = {bool(m.get("printHeader")) for m in source_metadata}
+        if len(headers) > 1:
+            msg = "Some source artifacts have CSV headers and others do not, so skip_leading_rows must be specified."
+            raise ValueError(msg)
+        skip_leading_rows = int(headers.pop()) if headers else 0
+
+    source_uris = load_source_uris(source_uri, source_uri_suffix, source_metadata)
+
+    fields = json.loads(schema)
+    if not fields:
+        schemas = [s for s in map(artifact_schema, source_metadata) if s]
+        if any(s != schemas[0] for s in schemas):
+            msg = "Source artifacts have different schemas, so schema must be specified."
+            raise ValueError(msg)
+        fields = schemas[0] if schemas else []
+
+    job_config = bigquery.LoadJobConfig(
+        source_format=source_format,
+        schema=fields or None,
+        use_avro_logical_types=source_format == bigquery.SourceFormat.AVRO,
+        write_disposition=write_disposition,
+    )
+    # `skipLeadingRows` is only valid for CSV, and `None` would be sent as a string.
+    if source_format == "CSV":
+        job_config.skip_leading_rows = skip_leading_rows
+
+    timer = PhaseTimer()
+    client = bigquery.Client()
+    job = run_client_job(
+        lambda: client.load_table_from_uri(
+            project=job_project,
+            source_uris=source_uris,
+            destination=f"{destination_project}.{destination_dataset}.{destination_table}",
+            location=location,
+            job_config=job_config,
+        ),
+        timer=timer,
+    )
+
+    with timer.phase("artifact_write"):
+        # Write BQTable artifact.
+        bq_table_artifact = bq_table(
+            name="destination_table",
+            project_id=destination_project,
+            dataset_id=destination_dataset,
+            table_id=destination_table,
+        )
+
+    update_output_artifacts(
+        executor_input,
+        [
+            bq_table_artifact,
+            metrics_artifact(executor_input, job=job._properties, timer=timer, metrics_file=metrics_file),  # noqa: SLF001
+        ],
+    )
+
+
+def copy_payload(
+    job_project: str,
+    source_tables: list[tuple[str, str, str]],
+    destination_project: str,
+    destination_dataset: str,
+    destination_table: str,
+    location: str = "US",
+    operation_type: str = "COPY",
+    write_disposition: str = "WRITE_TRUNCATE",
+    destination_expiration_time: str = "",
+) -> dict:
+    """Build request body of ``jobs.insert`` for a copy job."""
     payload = {
         "configuration": {
-            "query": {
-                "query": query,
+            "copy": {
+                "sourceTables": [
+                    {"projectId": project, "datasetId": dataset, "tableId": table}
+                    for project, dataset, table in source_tables
+                ],
                 "destinationTable": {
                     "projectId": destination_project,
                     "datasetId": destination_dataset,
                     "tableId": destination_table,
                 },
-                "createDisposition": create_disposition,
+                "operationType": operation_type,
                 "writeDisposition": write_disposition,
-                "queryParameters": json.loads(query_params),
-                "useLegacySql": False,
             },
-            "labels": json.loads(labels),
         },
         "jobReference": {
             "projectId": job_project,
             "location": location,
         },
     }
+    if destination_expiration_time:
+        payload["configuration"]["copy"]["destinationExpirationTime"] = destination_expiration_time
+    return payload
 
-    job = insert_bigquery_job(payload=payload, project=job_project)
 
-    # Write BQTable artifact.
-    bq_table_artifact = BQTable.create(
-        name="destination_table",
-        project_id=destination_project,
-        dataset_id=destination_dataset,
-        table_id=destination_table,
+@invoke.task(iterable=["source_table_uri"])
+@cancel_on_termination()
+def copy(
+    c: invoke.Context,  # noqa: ARG001
+    job_project: str,
+    destination_project: str,
+    destination_dataset: str,
+    destination_table: str,
+    source_table_uri: list[str] | None = None,
+    location: str = "US",
+    operation_type: str = "COPY",
+    write_disposition: str = "WRITE_TRUNCATE",
+    destination_expiration_time: str = "",
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+    gcp_resources: str = "tmp/gcp_resources.json",
+) -> None:
+    """Execute BigQuery copy job.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    job_project:
+        Google Cloud Platform project where the job is executed.
+    destination_project:
+        Google Cloud Platform project ID of destination.
+    destination_dataset:
+        BigQuery dataset ID of destination.
+    destination_table:
+        BigQuery table ID of destination.
+    source_table_uri:
+        URIs of ``google.BQTable`` artifacts of source tables. Repeat the option for multiple tables.
+    location:
+        Location of the source and destination tables.
+    operation_type:
+        operationType of JobConfigurationTableCopy.
+        https://cloud.google.com/bigquery/docs/reference/rest/v2/Job#jobconfigurationtablecopy
+    write_disposition:
+        writeDisposition of JobConfigurationTableCopy.
+    destination_expiration_time:
+        Expiration time of the destination table in RFC 3339 format. Never expires if empty.
+    metrics_file:
+        Path to dump metrics of the job. Prometheus textfile if it ends with ``.prom``, and JSON otherwise.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+    gcp_resources:
+        GCP resources output path.
+
+    """
+    payload = copy_payload(
+        job_project=job_project,
+        source_tables=[parse_table_uri(uri) for uri in source_table_uri or []],
+        destination_project=destination_project,
+        destination_dataset=destination_dataset,
+        destination_table=destination_table,
+        location=location,
+        operation_type=operation_type,
+        write_disposition=write_disposition,
+        destination_expiration_time=destination_expiration_time,
     )
-    artifact_utils.update_output_artifacts(executor_input, [bq_table_artifact])
 
-    # Write GCP resources.
-    bq_resources = GcpResources()
-    b = bq_resources.resources.add()
-    b.resource_type = "BigQueryJob"
-    b.resource_uri = job["selfLink"]
+    timer = PhaseTimer()
+    job = insert_bigquery_job(payload=payload, project=job_project, timer=timer)
+
+    with timer.phase("artifact_write"):
+        # Write GCP resources.
+        write_gcp_resources(gcp_resources, [job])
 
-    Path(gcp_resources).parent.mkdir(parents=True, exist_ok=True)
+        # Write BQTable artifact.
+        bq_table_artifact = bq_table(
+            name="destination_table",
+            project_id=destination_project,
+            dataset_id=destination_dataset,
+            table_id=destination_table,
+        )
 
-    with Path(gcp_resources).open("w") as f:
-        f.write(MessageToJson(bq_resources))
+    update_output_artifacts(
+        executor_input,
+        [bq_table_artifact, metrics_artifact(executor_input, job=job, timer=timer, metrics_file=metrics_file)],
+    )
 
 
 @invoke.task
-def extract(
+def read_table(
     c: invoke.Context,  # noqa: ARG001
     job_project: str,
     table_uri: str,
     destination_uri: str,
-    location: str = "US",
+    selected_fields: str = "[]",
+    row_restriction: str = "",
+    max_streams: int = 4,
+    file_format: str = "PARQUET",
     executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
 ) -> None:
-    """Execute BigQuery extract job."""
-    # `table_uri` is
-    # https://www.googleapis.com/bigquery/v2/projects/<PROJECT_ID>/datasets/<DATASET_ID>/tables/<TABLE_ID>
-    source_project = table_uri.split("/")[-5]
-    source_dataset = table_uri.split("/")[-3]
-    source_table = table_uri.split("/")[-1]
+    """Read BigQuery table with Storage Read API into Arrow IPC or Parquet files.
 
-    client = bigquery.Client()
-    job = client.extract_table(
-        project=job_project,
-        source=f"{source_project}.{source_dataset}.{source_table}",
-        destination_uris=f"{destination_uri.rstrip('/')}/data-*.jsonl",
-        location=location,
-        job_config=bigquery.ExtractJobConfig(
-            destination_format=bigquery.DestinationFormat.NEWLINE_DELIMITED_JSON,
-        ),
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    job_project:
+        Google Cloud Platform project billed for the read session.
+    table_uri:
+        URI of ``google.BQTable`` artifact.
+    destination_uri:
+        URI of the output artifact. Files are written to the path mounted by Vertex Pipelines.
+    selected_fields:
+        JSON array of columns to read. All columns are read if empty.
+    row_restriction:
+        SQL filter applied on the server.
+    max_streams:
+        Maximum number of streams read concurrently.
+    file_format:
+        ``ARROW`` or ``PARQUET``.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+
+    """
+    from . import storage_read  # noqa: PLC0415
+
+    source_project, source_dataset, source_table = parse_table_uri(table_uri)
+    directory = local_path(destination_uri)
+
+    manifest = storage_read.read_table(
+        reader=storage_read.BigQueryStreamReader(project=job_project),
+        table=f"projects/{source_project}/datasets/{source_dataset}/tables/{source_table}",
+        directory=directory,
+        file_format=file_format,
+        selected_fields=json.loads(selected_fields),
+        row_restriction=row_restriction,
+        max_streams=max_streams,
     )
-    job.result()
+    for f in manifest["files"]:
+        f["uri"] = f"{destination_uri.rstrip('/')}/{f['path']}"
+    (directory / MANIFEST_FILE_NAME).write_text(json.dumps(manifest))
+
+    output_files_artifact = OutputArtifact(
+        name="output_files",
+        uri=destination_uri,
+        metadata={
+            "destinationFormat": file_format,
+            "compression": "NONE",
+            "filePattern": f"data-*{FILE_EXTENSIONS[file_format]}",
+            "manifest": manifest,
+            "manifestUri": f"{destination_uri.rstrip('/')}/{MANIFEST_FILE_NAME}",
+        },
+    )
+    update_output_artifacts(executor_input, [output_files_artifact])
 
 
 @invoke.task
-def load(
+def write_table(
     c: invoke.Context,  # noqa: ARG001
     job_project: str,
+    source_path: str,
     destination_project: str,
     destination_dataset: str,
     destination_table: str,
-    schema: str,
-    source_uri: str,
-    source_uri_suffix: str | None = None,
-    location: str = "US",
+    schema: str = "[]",
+    batch_size: int = 10_000,
+    max_streams: int = 4,
     executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
 ) -> None:
-    """Execute BigQuery load job."""
-    if source_uri_suffix:
-        source_uri = f"{source_uri.rstrip('/')}/{source_uri_suffix.lstrip('/')}"
+    """Write Arrow IPC or Parquet files into BigQuery table with Storage Write API.
 
-    client = bigquery.Client()
-    job = client.load_table_from_uri(
-        project=job_project,
-        source_uris=source_uri,
-        destination=f"{destination_project}.{destination_dataset}.{destination_table}",
-        location=location,
-        job_config=bigquery.LoadJobConfig(
-            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-            schema=json.loads(schema),
-            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
-        ),
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    job_project:
+        Google Cloud Platform project used to create the destination table.
+    source_path:
+        Local path of the source artifact.
+    destination_project:
+        Google Cloud Platform project ID of destination.
+    destination_dataset:
+        BigQuery dataset ID of destination.
+    destination_table:
+        BigQuery table ID of destination.
+    schema:
+        JSON string of BigQuery table schema. If not empty, the table is created unless it exists.
+    batch_size:
+        Maximum number of rows in an append request.
+    max_streams:
+        Maximum number of streams written concurrently.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+
+    """
+    from google.cloud import bigquery  # noqa: PLC0415
+
+    from . import storage_write  # noqa: PLC0415
+
+    # Files listed in the manifest of `extract` or `read_table` are preferred to listing the directory.
+    source_metadata = input_artifact_metadata(executor_input, "source_artifact")
+    directory = Path(source_path)
+    if "manifest" in source_metadata:
+        paths = [directory / (f["path"] if "path" in f else Path(f["uri"]).name) for f in source_metadata["manifest"]["files"]]
+    else:
+        paths = sorted(p for p in directory.iterdir() if p.suffix in [".arrow", ".parquet"])
+
+    if json.loads(schema):
+        client = bigquery.Client(project=job_project)
+        client.create_table(
+            bigquery.Table(f"{destination_project}.{destination_dataset}.{destination_table}", schema=json.loads(schema)),
+            exists_ok=True,
+        )
+
+    storage_write.write_table(
+        writer=storage_write.BigQueryStreamWriter(),
+        table=f"projects/{destination_project}/datasets/{destination_dataset}/tables/{destination_table}",
+        paths=paths,
+        batch_size=batch_size,
+        max_streams=max_streams,
     )
-    job.result()
 
     # Write BQTable artifact.
-    bq_table_artifact = BQTable.create(
+    bq_table_artifact = bq_table(
         name="destination_table",
         project_id=destination_project,
         dataset_id=destination_dataset,
         table_id=destination_table,
     )
-    artifact_utils.update_output_artifacts(executor_input, [bq_table_artifact])
+    update_output_artifacts(executor_input, [bq_table_artifact])
+
+
+@invoke.task
+def wait_for_table(
+    c: invoke.Context,  # noqa: ARG001
+    project: str,
+    dataset: str,
+    table: str,
+    partition: str = "",
+    min_rows: int = 0,
+    max_staleness_seconds: float = 0.0,
+    timeout_seconds: float = 3600.0,
+    poll_interval_seconds: float = 5.0,
+    max_poll_interval_seconds: float = 300.0,
+    metrics_file: str = "",
+    executor_input: str = '{"outputs": {"outputFile": "tmp/executor_input.json"}}',
+) -> None:
+    """Wait until a BigQuery table or partition is ready and emit the table as ``google.BQTable`` artifact.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    project:
+        Google Cloud Platform project ID of the table.
+    dataset:
+        BigQuery dataset ID of the table.
+    table:
+        BigQuery table ID of the table.
+    partition:
+        Partition ID such as ``20240101``. If not empty, the conditions are checked for the partition.
+    min_rows:
+        Minimum number of rows of the table or the partition.
+    max_staleness_seconds:
+        Maximum seconds since the table or the partition was last modified. Disabled if ``0``.
+    timeout_seconds:
+        Fail if the table is not ready in this time.
+    poll_interval_seconds:
+        Initial interval of polling, which grows while the table is not modified.
+    max_poll_interval_seconds:
+        Maximum interval of polling.
+    metrics_file:
+        Path to dump metrics of polling. Prometheus textfile if it ends with ``.prom``, and JSON otherwise.
+    executor_input:
+        Automatically passed by Kubeflow Pipelines.
+
+    """
+    timer = PhaseTimer()
+    with timer.phase("wait"):
+        resource, stats = sensor.wait_for_table(
+            get_client(),
+            project=project,
+            dataset=dataset,
+            table=f"{table}${partition}" if partition else table,
+            min_rows=min_rows,
+            max_staleness_seconds=max_staleness_seconds,
+            timeout_seconds=timeout_seconds,
+            backoff=Backoff(initial=poll_interval_seconds, maximum=max_poll_interval_seconds),
+        )
+
+    with timer.phase("artifact_write"):
+        # The table without the partition decorator can be given to `depend_on` of `Query`.
+        bq_table_artifact = bq_table(name="table", project_id=project, dataset_id=dataset, table_id=table)
+
+    extra_metrics = stats | {"num_rows": int(resource.get("numRows", 0))}
+    update_output_artifacts(
+        executor_input,
+        [
+            bq_table_artifact,
+            metrics_artifact(executor_input, job=None, timer=timer, metrics_file=metrics_file, extra_metrics=extra_metrics),
+        ],
+    )
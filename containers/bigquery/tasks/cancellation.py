@@ -0,0 +1,116 @@
+"""Cancel in-flight BigQuery jobs when the task process is terminated.
+
+Kubernetes sends ``SIGTERM`` to a pod when the pipeline run is cancelled or the pod is evicted, and the process is
+killed after the grace period. Jobs waited by the task are cancelled in between so that they stop consuming slots.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import signal
+import threading
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from types import FrameType
+
+SIGNALS = [signal.SIGTERM, signal.SIGINT]
+
+
+class InFlightJob(NamedTuple):
+    """Functions to cancel a job and to check whether it has finished within the given timeout in seconds.
+
+    They should not retry requests beyond the timeout, which is the remaining time of the signal handler.
+    """
+
+    cancel: Callable[[float], object]
+    done: Callable[[float], bool]
+
+
+class InFlightJobs:
+    """Registry of jobs which the process is waiting for."""
+
+    def __init__(self) -> None:
+        """Initialize ``InFlightJobs``."""
+        self._jobs: dict[str, InFlightJob] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def track(self, job_id: str, cancel: Callable[[float], object], done: Callable[[float], bool]) -> Iterator[None]:
+        """Register the job while the block waits for it."""
+        with self._lock:
+            self._jobs[job_id] = InFlightJob(cancel=cancel, done=done)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._jobs.pop(job_id, None)
+
+    def cancel_all(self, timeout: float = 10.0, interval: float = 0.5) -> list[str]:
+        """Request cancellation of all jobs and wait up to ``timeout`` seconds until they finish.
+
+        Each call is given the remaining time, so that a slow request does not outlive ``timeout``.
+        Returns IDs of jobs whose cancellation is not confirmed. Errors are ignored because the process is exiting.
+        """
+        with self._lock:
+            jobs = dict(self._jobs)
+
+        deadline = time.monotonic() + timeout
+        for job in jobs.values():
+            if (remaining := deadline - time.monotonic()) <= 0:
+                break
+            with contextlib.suppress(Exception):
+                job.cancel(remaining)
+
+        pending = dict(jobs)
+        while pending and time.monotonic() < deadline:
+            for job_id, job in list(pending.items()):
+                if (remaining := deadline - time.monotonic()) <= 0:
+                    break
+                with contextlib.suppress(Exception):
+                    if job.done(remaining):
+                        del pending[job_id]
+            if pending:
+                time.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+        return list(pending)
+
+
+IN_FLIGHT_JOBS = InFlightJobs()
+
+
+@contextlib.contextmanager
+def cancel_on_termination(timeout: float = 10.0) -> Iterator[None]:
+    """Cancel jobs in ``IN_FLIGHT_JOBS`` on ``SIGTERM`` or ``SIGINT`` before the process exits.
+
+    After the jobs are cancelled, the previous handlers are restored and the signal is raised again,
+    so the process exits as it would without this handler. Handlers are installed only in the main thread.
+    This can be used as a decorator of a task.
+
+    Parameters
+    ----------
+    timeout:
+        Seconds to wait for confirmation of the cancellation, which should be shorter than the grace period.
+
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def restore() -> None:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    def handle(signum: int, frame: FrameType | None) -> None:  # noqa: ARG001
+        pending = IN_FLIGHT_JOBS.cancel_all(timeout=timeout)
+        if pending:
+            print(f"Cancellation of BigQuery jobs is not confirmed: {', '.join(pending)}")  # noqa: T201
+        restore()
+        signal.raise_signal(signum)
+
+    previous = {signum: signal.signal(signum, handle) for signum in SIGNALS}
+    try:
+        yield
+    finally:
+        restore()
@@ -0,0 +1,74 @@
+"""Write executor output and ``GcpResources`` with the standard library only.
+
+This is what ``google_cloud_pipeline_components.container.utils.artifact_utils`` and ``GcpResources`` proto
+produce, without importing them, ``kfp`` and protobuf at startup of short tasks.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+BIGQUERY_TABLE_URI = "https://www.googleapis.com/bigquery/v2/projects/{}/datasets/{}/tables/{}"
+
+
+class OutputArtifact(NamedTuple):
+    """Output artifact written into the executor output."""
+
+    name: str
+    uri: str | None
+    metadata: dict
+
+
+def bq_table(name: str, project_id: str, dataset_id: str, table_id: str) -> OutputArtifact:
+    """Return ``google.BQTable`` artifact as ``BQTable.create`` does."""
+    return OutputArtifact(
+        name=name,
+        uri=BIGQUERY_TABLE_URI.format(project_id, dataset_id, table_id),
+        metadata={"projectId": project_id, "datasetId": dataset_id, "tableId": table_id},
+    )
+
+
+def input_artifact_metadata(executor_input: str, name: str) -> dict:
+    """Return metadata of the input artifact ``name`` in the executor input."""
+    artifacts = json.loads(executor_input).get("inputs", {}).get("artifacts", {}).get(name, {}).get("artifacts", [])
+    return artifacts[0].get("metadata", {}) if artifacts else {}
+
+
+def output_artifact_uri(executor_input: str, name: str) -> str | None:
+    """Return URI of the output artifact ``name`` in the executor input."""
+    artifacts = json.loads(executor_input).get("outputs", {}).get("artifacts", {}).get(name, {}).get("artifacts", [])
+    return artifacts[0].get("uri") if artifacts else None
+
+
+def update_output_artifacts(executor_input: str, artifacts: list[OutputArtifact]) -> None:
+    """Write artifacts into the executor output file.
+
+    The file is overwritten, so all artifacts of a task must be written at once.
+    Artifacts not declared in the executor input are ignored.
+    """
+    executor_input_json = json.loads(executor_input)
+    output_artifacts = executor_input_json.get("outputs", {}).get("artifacts", {})
+    executor_output = {"artifacts": {}}
+
+    for artifact in artifacts:
+        if artifact.name not in output_artifacts:
+            continue
+        artifacts_list = output_artifacts[artifact.name].get("artifacts")
+        if artifacts_list:
+            runtime_artifact = artifacts_list[0] | {"uri": artifact.uri, "metadata": artifact.metadata}
+            artifacts_list = {"artifacts": [runtime_artifact]}
+        executor_output["artifacts"][artifact.name] = artifacts_list
+
+    output_file = Path(executor_input_json["outputs"]["outputFile"])
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(executor_output))
+
+
+def write_gcp_resources(path: str, jobs: list[dict]) -> None:
+    """Write ``GcpResources`` of BigQuery jobs to ``path`` in the JSON format of the proto."""
+    resources = {"resources": [{"resourceType": "BigQueryJob", "resourceUri": job["selfLink"]} for job in jobs]}
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(resources, indent=2))
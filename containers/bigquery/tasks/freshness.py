@@ -0,0 +1,77 @@
+"""Make-style freshness check of query destination tables.
+
+A query job records a hash of its configuration and the time it started in labels of the destination table.
+The job can be skipped on the next run if the configuration is unchanged and no source table has been modified
+since the recorded start. The start of the job is used instead of ``lastModifiedTime`` of the destination table
+because updating the labels modifies the table, and a source modified while the job was running must not be
+treated as read by it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import requests
+
+if TYPE_CHECKING:
+    from .jobs import JobClient
+
+HASH_LABEL = "kfpc-query-hash"
+STARTED_LABEL = "kfpc-query-started-ms"
+
+# Only these fields are returned by `tables.get`, which avoids sending the schema of wide tables.
+TABLE_FIELDS = "lastModifiedTime,labels"
+
+
+def query_hash(payload: dict) -> str:
+    """Return a label value identifying the query configuration of the request body of ``jobs.insert``."""
+    configuration = json.dumps(payload["configuration"]["query"], sort_keys=True)
+    return hashlib.sha256(configuration.encode()).hexdigest()[:32]
+
+
+def get_tables(client: JobClient, tables: list[tuple[str, str, str]]) -> list[dict | None]:
+    """Get ``lastModifiedTime`` and labels of tables concurrently on the shared session.
+
+    ``None`` is returned for a table which does not exist.
+    """
+
+    def get(table: tuple[str, str, str]) -> dict | None:
+        try:
+            return client.get_table(*table, fields=TABLE_FIELDS)
+        except requests.HTTPError as e:
+            if e.response.status_code != HTTPStatus.NOT_FOUND:
+                raise
+            return None
+
+    if not tables:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(tables), 16)) as executor:
+        return list(executor.map(get, tables))
+
+
+def is_fresh(
+    client: JobClient,
+    destination: tuple[str, str, str],
+    sources: list[tuple[str, str, str]],
+    digest: str,
+) -> bool:
+    """Return ``True`` if ``destination`` was written by the query ``digest`` after all ``sources`` were modified."""
+    destination_table, *source_tables = get_tables(client, [destination, *sources])
+    if destination_table is None:
+        return False
+
+    labels = destination_table.get("labels", {})
+    if labels.get(HASH_LABEL) != digest or STARTED_LABEL not in labels:
+        return False
+
+    started_ms = int(labels[STARTED_LABEL])
+    return all(t is not None and int(t["lastModifiedTime"]) <= started_ms for t in source_tables)
+
+
+def fresh_labels(digest: str, started_ms: int) -> dict:
+    """Return labels of the destination table recording the query ``digest`` and the start of its job."""
+    return {HASH_LABEL: digest, STARTED_LABEL: str(started_ms)}
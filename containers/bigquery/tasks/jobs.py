@@ -0,0 +1,334 @@
+"""Client for BigQuery jobs REST API."""
+
+from __future__ import annotations
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import google.auth
+import google.auth.transport.requests
+import requests
+import requests.adapters
+
+from .cancellation import IN_FLIGHT_JOBS
+from .metrics import PhaseTimer
+from .retry import Backoff, is_retryable, retry_call
+
+if TYPE_CHECKING:
+    from google.auth.credentials import Credentials
+
+API_ENDPOINT = os.environ.get("BIGQUERY_API_ENDPOINT", "https://bigquery.googleapis.com/bigquery/v2")
+SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+# `jobs.getQueryResults` holds the request on the server until the job finishes or this timeout elapses.
+LONG_POLL_TIMEOUT_MS = 10_000
+
+
+class JobError(Exception):
+    """BigQuery job finished with ``errorResult``."""
+
+    def __init__(self, error_result: dict) -> None:
+        """Initialize ``JobError`` with ``errorResult`` of the job."""
+        super().__init__(error_result)
+        self.error_result = error_result
+
+
+class JobClient:
+    """BigQuery jobs REST API client sharing one keep-alive session.
+
+    Parameters
+    ----------
+    credentials:
+        Google credentials. Application default credentials are used if ``None``.
+    endpoint:
+        Base URL of BigQuery REST API.
+    pool_maxsize:
+        Maximum number of pooled connections, which should cover the number of threads using this client.
+    retry_deadline:
+        Seconds to retry a request failed with a transient error such as 429, 5xx or a connection error.
+
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials | None = None,
+        endpoint: str = API_ENDPOINT,
+        pool_maxsize: int = 10,
+        retry_deadline: float = 600.0,
+    ) -> None:
+        """Initialize ``JobClient``."""
+        if credentials is None:
+            credentials, _ = google.auth.default(scopes=SCOPES)
+        self.credentials = credentials
+        self.endpoint = endpoint.rstrip("/")
+        self.retry_deadline = retry_deadline
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Content-type": "application/json",
+                "User-Agent": "google-cloud-pipeline-components",
+            },
+        )
+        # Reentrant because a signal handler may cancel jobs while the main thread refreshes credentials.
+        self._lock = threading.RLock()
+
+    def _authorize(self) -> None:
+        """Refresh credentials only when they are expired and update the session header."""
+        with self._lock:
+            if self.credentials.valid and "Authorization" in self.session.headers:
+                return
+            if not self.credentials.valid:
+                self.credentials.refresh(google.auth.transport.requests.Request(self.session))
+            if self.credentials.token:
+                self.session.headers["Authorization"] = f"Bearer {self.credentials.token}"
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: dict | None = None,
+        json: dict | None = None,
+        headers: dict | None = None,
+        deadline: float | None = None,
+        timeout: float = 90.0,
+    ) -> dict:
+        """Send a request to BigQuery REST API and return the JSON response.
+
+        Requests failed with transient errors are retried until ``deadline`` seconds, which defaults to
+        ``retry_deadline``. ``0`` disables retries. Each attempt waits for the response up to ``timeout`` seconds.
+        An empty dict is returned for ``304 Not Modified`` of a conditional request.
+        """
+
+        def send(attempt: int) -> dict:  # noqa: ARG001
+            self._authorize()
+            response = self.session.request(
+                method=method,
+                url=f"{self.endpoint}/{path.lstrip('/')}",
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=timeout,
+            )
+            response.raise_for_status()
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                return {}
+            return response.json()
+
+        return retry_call(send, kind="request", deadline=self.retry_deadline if deadline is None else deadline)
+
+    def insert_job(self, project: str, payload: dict) -> dict:
+        """Insert a job with ``jobs.insert``.
+
+        ``jobReference.jobId`` should be set because the request may be retried. If the job has been inserted by
+        a previous request or another attempt of the task, the existing job is returned.
+        """
+        ref = payload["jobReference"]
+        try:
+            return self.request("POST", f"projects/{project}/jobs", json=payload)
+        except requests.HTTPError as e:
+            if e.response.status_code != HTTPStatus.CONFLICT or not ref.get("jobId"):
+                raise
+            return self.get_job(project=project, job_id=ref["jobId"], location=ref["location"])
+
+    def insert_or_attach_job(self, project: str, payload: dict) -> dict:
+        """Return the existing job with ``jobReference.jobId``, or insert a job with the ID if it does not exist."""
+        ref = payload["jobReference"]
+        try:
+            return self.get_job(project=project, job_id=ref["jobId"], location=ref["location"])
+        except requests.HTTPError as e:
+            if e.response.status_code != HTTPStatus.NOT_FOUND:
+                raise
+        return self.insert_job(project=project, payload=payload)
+
+    def get_job(self, project: str, job_id: str, location: str, timeout: float | None = None) -> dict:
+        """Get a job resource with ``jobs.get``.
+
+        If ``timeout`` is given, the request is sent once and waits up to ``timeout`` seconds.
+        """
+        bound = {} if timeout is None else {"deadline": 0, "timeout": timeout}
+        return self.request("GET", f"projects/{project}/jobs/{job_id}", params={"location": location}, **bound)
+
+    def cancel_job(self, project: str, job_id: str, location: str, timeout: float | None = None) -> dict:
+        """Request cancellation of a job with ``jobs.cancel``.
+
+        If ``timeout`` is given, the request is sent once and waits up to ``timeout`` seconds.
+        """
+        bound = {} if timeout is None else {"deadline": 0, "timeout": timeout}
+        path = f"projects/{project}/jobs/{job_id}/cancel"
+        return self.request("POST", path, params={"location": location}, **bound)
+
+    def list_child_jobs(self, project: str, parent_job_id: str) -> list[dict]:
+        """List jobs of statements of a script job with ``jobs.list``.
+
+        ``allUsers`` is not set because child jobs are owned by the user of the script job, and it would require the
+        ``bigquery.jobs.listAll`` permission.
+        """
+        jobs, page_token = [], None
+        while True:
+            params = {"parentJobId": parent_job_id}
+            if page_token:
+                params["pageToken"] = page_token
+            response = self.request("GET", f"projects/{project}/jobs", params=params)
+            jobs += response.get("jobs", [])
+            if not (page_token := response.get("nextPageToken")):
+                return jobs
+
+    def get_query_results(self, project: str, job_id: str, location: str, timeout_ms: int) -> dict:
+        """Wait on the server for a query job up to ``timeout_ms`` with ``jobs.getQueryResults``.
+
+        The request is not retried because BigQuery responds with the error of a failed job, such as
+        ``backendError``, which must be handled as a job error rather than a request error.
+        """
+        return self.request(
+            "GET",
+            f"projects/{project}/queries/{job_id}",
+            params={"location": location, "timeoutMs": timeout_ms, "maxResults": 0},
+            deadline=0,
+        )
+
+    def get_table(
+        self,
+        project: str,
+        dataset: str,
+        table: str,
+        fields: str | None = None,
+        etag: str | None = None,
+    ) -> dict | None:
+        """Get a table resource with ``tables.get``, only with ``fields`` if given.
+
+        If ``etag`` is given, ``None`` is returned when the table is not modified since the resource with the ETag.
+        """
+        params = {"fields": fields} if fields else None
+        headers = {"If-None-Match": etag} if etag else None
+        path = f"projects/{project}/datasets/{dataset}/tables/{table}"
+        return self.request("GET", path, params=params, headers=headers) or None
+
+    def patch_table(self, project: str, dataset: str, table: str, body: dict) -> dict:
+        """Update fields of a table in ``body`` with ``tables.patch``."""
+        return self.request("PATCH", f"projects/{project}/datasets/{dataset}/tables/{table}", json=body)
+
+    def wait_job(self, job: dict) -> dict:
+        """Wait for the job to finish and return the final job resource.
+
+        Query jobs are long-polled with ``jobs.getQueryResults``.
+        Other jobs, and query jobs whose long poll returns early, are polled with ``jobs.get`` with backoff.
+        The job is cancelled if the process is terminated while waiting in ``cancel_on_termination``.
+        """
+        ref = job["jobReference"]
+        project, job_id, location = ref["projectId"], ref["jobId"], ref["location"]
+
+        def done(timeout: float) -> bool:
+            return self.get_job(project=project, job_id=job_id, location=location, timeout=timeout)["status"]["state"] == "DONE"
+
+        with IN_FLIGHT_JOBS.track(
+            job_id,
+            cancel=lambda timeout: self.cancel_job(project=project, job_id=job_id, location=location, timeout=timeout),
+            done=done,
+        ):
+            return self._wait_job(job)
+
+    def _wait_job(self, job: dict) -> dict:
+        ref = job["jobReference"]
+        is_query = "query" in job.get("configuration", {})
+        backoff = Backoff()
+
+        while job["status"]["state"] != "DONE":
+            if is_query:
+                start = time.monotonic()
+                try:
+                    result = self.get_query_results(
+                        project=ref["projectId"],
+                        job_id=ref["jobId"],
+                        location=ref["location"],
+                        timeout_ms=LONG_POLL_TIMEOUT_MS,
+                    )
+                except requests.RequestException:
+                    # The job may have failed. `jobs.get` below tells it apart from an error of the request.
+                    result = {}
+                returned_early = time.monotonic() - start < LONG_POLL_TIMEOUT_MS / 2000
+                if not result.get("jobComplete") and returned_early:
+                    backoff.sleep()
+            else:
+                backoff.sleep()
+
+            job = self.get_job(project=ref["projectId"], job_id=ref["jobId"], location=ref["location"])
+
+        if "errorResult" in job["status"]:
+            raise JobError(job["status"]["errorResult"])
+
+        return job
+
+
+def deterministic_job_id(pipeline_job_id: str, pipeline_task_name: str, payload: dict) -> str:
+    """Derive a job ID from the pipeline run, the task and the request body of ``jobs.insert``."""
+    h = hashlib.sha256()
+    for key in [pipeline_job_id, pipeline_task_name, json.dumps(payload, sort_keys=True)]:
+        h.update(key.encode())
+        h.update(b"\0")
+    return f"kfpc_{h.hexdigest()}"
+
+
+@functools.cache
+def get_client() -> JobClient:
+    """Return the process-wide ``JobClient``."""
+    return JobClient()
+
+
+def dry_run_bytes_processed(payload: dict, project: str) -> int:
+    """Return bytes which the query of ``payload`` would process, estimated with a dry run job."""
+    dry_run = copy.deepcopy(payload)
+    dry_run["configuration"]["dryRun"] = True
+    # A dry run is not stored, so it must not consume the deterministic job ID.
+    dry_run["jobReference"].pop("jobId", None)
+    job = get_client().insert_job(project=project, payload=dry_run)
+    return int(job["statistics"]["query"]["totalBytesProcessed"])
+
+
+def is_retryable_job_error(error: BaseException) -> bool:
+    """Return whether the job failed with a transient error and should be resubmitted."""
+    return isinstance(error, JobError) and is_retryable(error)
+
+
+def insert_bigquery_job(
+    payload: dict,
+    project: str,
+    timer: PhaseTimer | None = None,
+    client: JobClient | None = None,
+    max_attempts: int = 3,
+) -> dict:
+    """Insert BigQuery job using REST API and wait for it.
+
+    If ``jobReference.jobId`` is set, an existing job with the ID is waited instead of inserting a new one.
+    A job failed with a transient error such as ``backendError`` is resubmitted up to ``max_attempts`` times in
+    total with the job ID suffixed by ``_retry<N>``. Time to insert and to wait for the job is recorded as
+    ``submit`` and ``wait`` phases of ``timer``.
+    """
+    client = client or get_client()
+    timer = timer or PhaseTimer()
+    ref = payload["jobReference"]
+    attach = bool(ref.get("jobId"))
+    # The job ID is set in advance so that retried `jobs.insert` requests do not insert duplicated jobs.
+    job_id = ref.get("jobId") or f"kfpc_{uuid.uuid4().hex}"
+
+    def run(attempt: int) -> dict:
+        attempt_payload = payload | {"jobReference": ref | {"jobId": f"{job_id}_retry{attempt}" if attempt else job_id}}
+        with timer.phase("submit"):
+            if attach:
+                job = client.insert_or_attach_job(project=project, payload=attempt_payload)
+            else:
+                job = client.insert_job(project=project, payload=attempt_payload)
+        with timer.phase("wait"):
+            return client.wait_job(job)
+
+    return retry_call(run, kind="job", deadline=None, max_attempts=max_attempts, retryable=is_retryable_job_error)
@@ -0,0 +1,95 @@
+"""Manifest of files written by extract jobs."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from google.cloud import storage
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+def split_gcs_uri(uri: str) -> tuple[str, str]:
+    """Split ``gs://<BUCKET>/<NAME>`` into bucket and object name."""
+    bucket, _, name = uri.removeprefix("gs://").partition("/")
+    return bucket, name
+
+
+def shard_uris(destination_uri: str, file_count: int) -> list[str]:
+    """Return URIs of files written to a wildcard destination URI.
+
+    BigQuery replaces ``*`` with a 12-digit zero-padded sequence number starting from zero.
+    """
+    return [destination_uri.replace("*", f"{i:012d}") for i in range(file_count)]
+
+
+def build_manifest(
+    client: storage.Client,
+    root_uri: str,
+    destination_uris: list[str],
+    file_counts: list[int],
+    total_rows: int | None,
+    input_bytes: int | None,
+) -> dict:
+    """Build a manifest of exact file URIs, sizes and row counts of an extract job.
+
+    Sizes are collected by one listing per destination URI prefix in this task, so that consumers of the manifest
+    never need to list the bucket. Row counts per file are not reported by BigQuery, so ``rows`` is recorded only
+    when the whole table is written to a single file. ``path`` of each file is relative to ``root_uri`` so that
+    readers can resolve files in a copied or mounted directory.
+    """
+    uris = [
+        uri
+        for destination_uri, file_count in zip(destination_uris, file_counts, strict=True)
+        for uri in shard_uris(destination_uri, file_count)
+    ]
+
+    sizes = {}
+    for destination_uri in destination_uris:
+        bucket, name = split_gcs_uri(destination_uri)
+        prefix = name.split("*")[0]
+        sizes.update({f"gs://{bucket}/{blob.name}": blob.size for blob in client.list_blobs(bucket, prefix=prefix)})
+
+    root = f"{root_uri.rstrip('/')}/"
+    files = [{"uri": uri, "path": uri.removeprefix(root), "bytes": sizes.get(uri)} for uri in uris]
+    if len(files) == 1 and total_rows is not None:
+        files[0]["rows"] = total_rows
+
+    return {
+        "files": files,
+        "totalBytes": sum(f["bytes"] or 0 for f in files),
+        "totalRows": total_rows,
+        "inputBytes": input_bytes,
+    }
+
+
+def write_manifest(client: storage.Client, directory_uri: str, manifest: dict) -> str:
+    """Write the manifest as a sidecar file in the directory and return its URI."""
+    bucket, name = split_gcs_uri(f"{directory_uri.rstrip('/')}/{MANIFEST_FILE_NAME}")
+    client.bucket(bucket).blob(name).upload_from_string(json.dumps(manifest), content_type="application/json")
+    return f"gs://{bucket}/{name}"
+
+
+def combine_manifests(manifests: list[dict], prefixes: list[str]) -> dict:
+    """Combine manifests of extract jobs written into ``prefixes`` of the same directory.
+
+    Totals are ``None`` if any of the manifests lacks them. Each prefix is recorded with its number of files and rows.
+    """
+
+    def total(key: str) -> int | None:
+        values = [m[key] for m in manifests]
+        # `inputBytes` is a string because int64 values are strings in BigQuery REST API.
+        return None if None in values else sum(int(v) for v in values)
+
+    return {
+        "files": [f for m in manifests for f in m["files"]],
+        "totalBytes": total("totalBytes"),
+        "totalRows": total("totalRows"),
+        "inputBytes": total("inputBytes"),
+        "slices": [
+            {"prefix": prefix, "files": len(m["files"]), "totalRows": m["totalRows"]}
+            for prefix, m in zip(prefixes, manifests, strict=True)
+        ],
+    }
@@ -0,0 +1,141 @@
+"""Metrics of BigQuery jobs and wall-clock time of task phases."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Sections of `statistics` in job resource whose scalar values are reported.
+STATISTICS_SECTIONS = ["query", "load", "extract", "copy"]
+
+
+class PhaseTimer:
+    """Measure wall-clock time of named phases of a task.
+
+    Phases can be measured in multiple threads, in which case durations of concurrent phases are summed up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize ``PhaseTimer``."""
+        self.durations_ms: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the block as the phase ``name``. Repeated phases are accumulated."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.durations_ms[name] = self.durations_ms.get(name, 0.0) + elapsed_ms
+
+    def metrics(self) -> dict[str, float]:
+        """Return durations as metrics."""
+        return {f"phase_{name}_ms": ms for name, ms in self.durations_ms.items()}
+
+
+def snake_case(name: str) -> str:
+    """Convert camelCase to snake_case."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def to_number(value: object) -> float | None:
+    """Convert JSON scalar to a number. int64 values are strings in BigQuery REST API."""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, int | float):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def job_metrics(job: dict) -> dict[str, float]:
+    """Extract numeric statistics of a job resource of BigQuery REST API.
+
+    Returns scalar statistics such as ``total_slot_ms``, ``total_bytes_billed`` and ``cache_hit``,
+    ``queue_ms`` and ``run_ms`` derived from the timestamps, and wall and slot time of each query stage.
+    """
+    statistics = job.get("statistics", {})
+    metrics = {}
+
+    for key, value in statistics.items():
+        number = to_number(value)
+        if number is not None and not key.endswith("Time"):
+            metrics[snake_case(key)] = number
+
+    for section in STATISTICS_SECTIONS:
+        for key, value in statistics.get(section, {}).items():
+            number = to_number(value)
+            if number is not None:
+                metrics[snake_case(key)] = number
+
+    creation, start, end = (to_number(statistics.get(k)) for k in ["creationTime", "startTime", "endTime"])
+    if creation is not None and start is not None:
+        metrics["queue_ms"] = start - creation
+    if start is not None and end is not None:
+        metrics["run_ms"] = end - start
+
+    for stage in statistics.get("query", {}).get("queryPlan", []):
+        metrics |= stage_metrics(stage)
+
+    return metrics
+
+
+def dml_metrics(jobs: list[dict]) -> dict[str, float]:
+    """Return the numbers of rows inserted, updated and deleted by DML statements of child jobs of a script."""
+    metrics = {}
+    for job in jobs:
+        for key, value in job.get("statistics", {}).get("query", {}).get("dmlStats", {}).items():
+            metrics[snake_case(key)] = metrics.get(snake_case(key), 0.0) + (to_number(value) or 0.0)
+    return metrics
+
+
+def total_job_metrics(jobs: list[dict]) -> dict[str, float]:
+    """Return ``job_metrics`` summed over jobs, such as total slot time and bytes billed, and the number of jobs.
+
+    Metrics of query stages are excluded because stages of different jobs share IDs.
+    """
+    metrics = {"jobs": float(len(jobs))}
+    for job in jobs:
+        for key, value in job_metrics(job).items():
+            if not key.startswith("stage_"):
+                metrics[key] = metrics.get(key, 0.0) + value
+    return metrics
+
+
+def stage_metrics(stage: dict) -> dict[str, float]:
+    """Return wall and slot time of a stage in ``queryPlan`` of a query job."""
+    metrics = {}
+    start, end = to_number(stage.get("startMs")), to_number(stage.get("endMs"))
+    if start is not None and end is not None:
+        metrics[f"stage_{stage['id']}_wall_ms"] = end - start
+    if (slot_ms := to_number(stage.get("slotMs"))) is not None:
+        metrics[f"stage_{stage['id']}_slot_ms"] = slot_ms
+    return metrics
+
+
+def write_metrics_file(path: str, metrics: dict[str, float], labels: dict[str, str]) -> None:
+    """Write metrics as Prometheus textfile if ``path`` ends with ``.prom``, and as JSON otherwise."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    if not path.endswith(".prom"):
+        Path(path).write_text(json.dumps({"labels": labels, "metrics": metrics}))
+        return
+
+    label_text = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    lines = [f"kfpc_bigquery_{name}{{{label_text}}} {value}" for name, value in sorted(metrics.items())]
+    Path(path).write_text("\n".join(lines) + "\n")
@@ -0,0 +1,141 @@
+"""Classification and retries of transient BigQuery errors.
+
+Failed requests are retried with backoff until a deadline, and jobs failed with transient errors are
+resubmitted in the same process instead of failing the pod. Every retry is counted in ``RETRIES``.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, TypeVar
+
+import requests
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# https://cloud.google.com/bigquery/docs/error-messages
+RETRYABLE_REASONS = {
+    "backendError",
+    "internalError",
+    "rateLimitExceeded",
+    "jobBackendError",
+    "jobInternalError",
+    "jobRateLimitExceeded",
+}
+
+
+class Backoff:
+    """Exponential backoff with jitter.
+
+    Each delay is drawn uniformly from the upper half of ``initial * multiplier ** n`` capped by ``maximum``.
+    """
+
+    def __init__(self, initial: float = 0.5, maximum: float = 10.0, multiplier: float = 2.0) -> None:
+        """Initialize ``Backoff``."""
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """Return the next delay in seconds."""
+        delay = min(self.maximum, self.initial * self.multiplier**self.attempts)
+        self.attempts += 1
+        return random.uniform(delay / 2, delay)  # noqa: S311
+
+    def sleep(self) -> None:
+        """Sleep for the next delay."""
+        time.sleep(self.next_delay())
+
+    def reset(self) -> None:
+        """Restart from the initial delay."""
+        self.attempts = 0
+
+
+class RetryCounter:
+    """Thread-safe counts of retries of each kind such as ``request`` and ``job``."""
+
+    def __init__(self) -> None:
+        """Initialize ``RetryCounter``."""
+        self.counts = {"request": 0, "job": 0}
+        self._lock = threading.Lock()
+
+    def increment(self, kind: str) -> None:
+        """Count a retry of ``kind``."""
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def metrics(self) -> dict[str, int]:
+        """Return counts as metrics."""
+        with self._lock:
+            return {f"retries_{kind}": count for kind, count in self.counts.items()}
+
+
+RETRIES = RetryCounter()
+
+
+def error_reasons(error: BaseException) -> set[str]:
+    """Return BigQuery error reasons of an exception of REST API, a job or the client library."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        try:
+            errors = error.response.json().get("error", {}).get("errors", [])
+        except ValueError:
+            errors = []
+    elif error_result := getattr(error, "error_result", None):
+        errors = [error_result]
+    else:
+        # `google.api_core.exceptions.GoogleAPICallError` has the list of errors of the response or the job.
+        errors = getattr(error, "errors", None) or []
+    return {e.get("reason") for e in errors if isinstance(e, dict)} - {None}
+
+
+def status_code(error: BaseException) -> int | None:
+    """Return HTTP status code of an exception of REST API or the client library."""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return whether the error is transient, such as 429, 5xx, ``rateLimitExceeded`` and ``backendError``."""
+    if isinstance(error, requests.ConnectionError | requests.Timeout):
+        return True
+    return status_code(error) in RETRYABLE_STATUS_CODES or bool(error_reasons(error) & RETRYABLE_REASONS)
+
+
+def retry_call(
+    func: Callable[[int], T],
+    kind: str,
+    deadline: float | None = 600.0,
+    max_attempts: int | None = None,
+    backoff: Backoff | None = None,
+    retryable: Callable[[BaseException], bool] = is_retryable,
+) -> T:
+    """Call ``func`` with the attempt number until it succeeds or fails with an error which is not ``retryable``.
+
+    Errors are retried with ``backoff`` and counted as ``kind`` in ``RETRIES``. The last error is raised if the next
+    attempt would start after ``deadline`` seconds or exceed ``max_attempts``. ``None`` means no limit.
+    """
+    backoff = backoff or Backoff()
+    stop = None if deadline is None else time.monotonic() + deadline
+    attempt = 0
+    while True:
+        try:
+            return func(attempt)
+        except Exception as e:
+            delay = backoff.next_delay()
+            exhausted = max_attempts is not None and attempt + 1 >= max_attempts
+            expired = stop is not None and time.monotonic() + delay > stop
+            if not retryable(e) or exhausted or expired:
+                raise
+        RETRIES.increment(kind)
+        time.sleep(delay)
+        attempt += 1
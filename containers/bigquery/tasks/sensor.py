@@ -0,0 +1,96 @@
+"""Wait until a BigQuery table or partition is ready.
+
+The table is polled with ``tables.get`` masked to a few fields. Each poll after the first is conditional on the
+ETag of the previous response, so an unmodified table costs a ``304 Not Modified`` without a body.
+The interval grows with backoff while nothing changes, and is reset when the table is modified but not ready yet,
+because a table being written is likely to become ready soon.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import requests
+
+from .retry import Backoff
+
+if TYPE_CHECKING:
+    from .jobs import JobClient
+
+# `etag` is used for conditional requests. `numRows` and `lastModifiedTime` are of the partition for a decorator.
+TABLE_FIELDS = "etag,lastModifiedTime,numRows"
+
+
+def is_ready(table: dict | None, min_rows: int, max_staleness_seconds: float, now_ms: int) -> bool:
+    """Return whether the table exists with at least ``min_rows`` rows and was modified recently enough.
+
+    ``max_staleness_seconds`` is disabled if ``0``.
+    """
+    if table is None:
+        return False
+    # int64 values are strings in BigQuery REST API.
+    enough_rows = int(table.get("numRows", 0)) >= min_rows
+    fresh = not max_staleness_seconds or now_ms - int(table["lastModifiedTime"]) <= max_staleness_seconds * 1000
+    return enough_rows and fresh
+
+
+def wait_for_table(
+    client: JobClient,
+    project: str,
+    dataset: str,
+    table: str,
+    min_rows: int = 0,
+    max_staleness_seconds: float = 0.0,
+    timeout_seconds: float = 3600.0,
+    backoff: Backoff | None = None,
+) -> tuple[dict, dict[str, int]]:
+    """Poll the table until it is ready and return its resource with counts of polls.
+
+    ``table`` may have a partition decorator such as ``<TABLE_ID>$20240101``. The interval is capped by half of
+    ``max_staleness_seconds`` because a modification is fresh enough only for that time.
+    ``TimeoutError`` is raised if the table is not ready in ``timeout_seconds``.
+    """
+    backoff = backoff or Backoff(initial=5.0, maximum=300.0)
+    deadline = time.monotonic() + timeout_seconds
+    max_interval = max_staleness_seconds / 2 if max_staleness_seconds else math.inf
+    stats = {"polls": 0, "not_modified": 0, "not_found": 0}
+    resource = None
+
+    while True:
+        stats["polls"] += 1
+        try:
+            response = client.get_table(
+                project,
+                dataset,
+                table,
+                fields=TABLE_FIELDS,
+                etag=resource["etag"] if resource else None,
+            )
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code != HTTPStatus.NOT_FOUND:
+                raise
+            stats["not_found"] += 1
+            resource = response = None
+
+        if response is None and resource is not None:
+            stats["not_modified"] += 1
+        elif response is not None:
+            # The table has been created or modified since the previous poll.
+            if stats["polls"] > 1:
+                backoff.reset()
+            resource = response
+
+        if is_ready(resource, min_rows, max_staleness_seconds, now_ms=int(time.time() * 1000)):
+            return resource, stats
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            state = "not found"
+            if resource is not None:
+                state = f"{resource.get('numRows')} rows modified at {resource['lastModifiedTime']} ms"
+            msg = f"Table {project}.{dataset}.{table} is not ready in {timeout_seconds} s: {state}."
+            raise TimeoutError(msg)
+        time.sleep(min(backoff.next_delay(), remaining, max_interval))
@@ -0,0 +1,164 @@
+"""Read BigQuery tables with Storage Read API into Arrow IPC or Parquet files."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Protocol
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+FILE_EXTENSIONS = {
+    "ARROW": ".arrow",
+    "PARQUET": ".parquet",
+}
+
+
+class StreamReader(Protocol):
+    """Interface of Storage Read API used by ``read_table``, which can be replaced with a local fake."""
+
+    def create_session(
+        self,
+        table: str,
+        selected_fields: list[str],
+        row_restriction: str,
+        max_streams: int,
+    ) -> tuple[bytes, list[str]]:
+        """Create a read session and return serialized Arrow schema and names of streams."""
+
+    def read_stream(self, stream: str) -> Iterator[bytes]:
+        """Yield serialized Arrow record batches of the stream."""
+
+
+class BigQueryStreamReader:
+    """``StreamReader`` backed by BigQuery Storage Read API.
+
+    Parameters
+    ----------
+    project:
+        Google Cloud Platform project billed for the read session.
+
+    """
+
+    def __init__(self, project: str) -> None:
+        """Initialize ``BigQueryStreamReader``."""
+        from google.cloud import bigquery_storage_v1  # noqa: PLC0415
+
+        self.project = project
+        self.types = bigquery_storage_v1.types
+        self.client = bigquery_storage_v1.BigQueryReadClient()
+
+    def create_session(
+        self,
+        table: str,
+        selected_fields: list[str],
+        row_restriction: str,
+        max_streams: int,
+    ) -> tuple[bytes, list[str]]:
+        """Create a read session of Arrow format."""
+        session = self.client.create_read_session(
+            parent=f"projects/{self.project}",
+            read_session=self.types.ReadSession(
+                table=table,
+                data_format=self.types.DataFormat.ARROW,
+                read_options=self.types.ReadSession.TableReadOptions(
+                    selected_fields=selected_fields,
+                    row_restriction=row_restriction,
+                ),
+            ),
+            max_stream_count=max_streams,
+        )
+        return session.arrow_schema.serialized_schema, [stream.name for stream in session.streams]
+
+    def read_stream(self, stream: str) -> Iterator[bytes]:
+        """Yield serialized record batches. Broken connections are resumed from the last offset by the client."""
+        for response in self.client.read_rows(stream):
+            yield response.arrow_record_batch.serialized_record_batch
+
+
+def open_writer(path: Path, schema: pa.Schema, file_format: str) -> pa.ipc.RecordBatchFileWriter | pq.ParquetWriter:
+    """Open a writer of Arrow IPC file or Parquet file."""
+    if file_format == "ARROW":
+        return pa.ipc.new_file(str(path), schema)
+    return pq.ParquetWriter(str(path), schema)
+
+
+def write_stream(reader: StreamReader, stream: str, schema: pa.Schema, path: Path, file_format: str) -> int:
+    """Write record batches of a stream into a file and return the number of rows.
+
+    Record batches are decoded without copying from buffers received from the stream.
+    """
+    num_rows = 0
+    with open_writer(path=path, schema=schema, file_format=file_format) as writer:
+        for serialized in reader.read_stream(stream):
+            batch = pa.ipc.read_record_batch(pa.py_buffer(serialized), schema)
+            writer.write_batch(batch)
+            num_rows += batch.num_rows
+    return num_rows
+
+
+def read_table(
+    reader: StreamReader,
+    table: str,
+    directory: Path,
+    file_format: str = "PARQUET",
+    selected_fields: list[str] | None = None,
+    row_restriction: str = "",
+    max_streams: int = 4,
+) -> dict:
+    """Read a table with parallel streams into one file per stream and return the manifest of files.
+
+    Parameters
+    ----------
+    reader:
+        Storage Read API or its fake.
+    table:
+        Table path ``projects/<PROJECT_ID>/datasets/<DATASET_ID>/tables/<TABLE_ID>``.
+    directory:
+        Local directory to write files.
+    file_format:
+        ``ARROW`` for Arrow IPC files or ``PARQUET``.
+    selected_fields:
+        Columns to read. All columns are read if empty.
+    row_restriction:
+        SQL filter applied on the server.
+    max_streams:
+        Maximum number of streams read concurrently.
+
+    """
+    serialized_schema, streams = reader.create_session(
+        table=table,
+        selected_fields=selected_fields or [],
+        row_restriction=row_restriction,
+        max_streams=max_streams,
+    )
+    schema = pa.ipc.read_schema(pa.py_buffer(serialized_schema))
+
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [directory / f"data-{i:012d}{FILE_EXTENSIONS[file_format]}" for i in range(len(streams))]
+
+    def write(stream: str, path: Path) -> int:
+        return write_stream(reader=reader, stream=stream, schema=schema, path=path, file_format=file_format)
+
+    with ThreadPoolExecutor(max_workers=max(1, len(streams))) as executor:
+        num_rows = list(executor.map(write, streams, paths))
+
+    # An empty table has no streams. Write an empty file so that readers get the schema.
+    if not streams:
+        paths = [directory / f"data-{0:012d}{FILE_EXTENSIONS[file_format]}"]
+        open_writer(path=paths[0], schema=schema, file_format=file_format).close()
+        num_rows = [0]
+
+    files = [
+        {"path": path.name, "bytes": path.stat().st_size, "rows": n}
+        for path, n in zip(paths, num_rows, strict=True)
+    ]
+    return {
+        "files": files,
+        "totalBytes": sum(f["bytes"] for f in files),
+        "totalRows": sum(num_rows),
+    }
@@ -0,0 +1,154 @@
+"""Write Arrow IPC or Parquet files into BigQuery with Storage Write API."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Protocol
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class StreamWriter(Protocol):
+    """Interface of Storage Write API used by ``write_table``, which can be replaced with a local fake."""
+
+    def create_stream(self, table: str) -> str:
+        """Create a pending stream and return its name."""
+
+    def append(self, stream: str, schema: pa.Schema, batches: Iterator[pa.RecordBatch]) -> None:
+        """Append record batches to the stream."""
+
+    def finalize(self, stream: str) -> int:
+        """Finalize the stream and return the number of rows."""
+
+    def commit(self, table: str, streams: list[str]) -> None:
+        """Commit streams atomically."""
+
+
+class BigQueryStreamWriter:
+    """``StreamWriter`` backed by BigQuery Storage Write API with pending streams."""
+
+    def __init__(self) -> None:
+        """Initialize ``BigQueryStreamWriter``."""
+        from google.cloud import bigquery_storage_v1  # noqa: PLC0415
+
+        self.types = bigquery_storage_v1.types
+        self.client = bigquery_storage_v1.BigQueryWriteClient()
+
+    def create_stream(self, table: str) -> str:
+        """Create a pending stream, whose rows are invisible until committed."""
+        stream = self.client.create_write_stream(
+            parent=table,
+            write_stream=self.types.WriteStream(type_=self.types.WriteStream.Type.PENDING),
+        )
+        return stream.name
+
+    def append(self, stream: str, schema: pa.Schema, batches: Iterator[pa.RecordBatch]) -> None:
+        """Append record batches with offsets so that retried requests are not duplicated."""
+
+        def requests() -> Iterator:
+            offset = 0
+            for i, batch in enumerate(batches):
+                request = self.types.AppendRowsRequest(
+                    offset=offset,
+                    arrow_rows=self.types.AppendRowsRequest.ArrowData(
+                        rows=self.types.ArrowRecordBatch(serialized_record_batch=batch.serialize().to_pybytes()),
+                    ),
+                )
+                # The writer schema is sent only with the first request of the connection.
+                if i == 0:
+                    request.write_stream = stream
+                    request.arrow_rows.writer_schema = self.types.ArrowSchema(
+                        serialized_schema=schema.serialize().to_pybytes(),
+                    )
+                offset += batch.num_rows
+                yield request
+
+        for response in self.client.append_rows(requests()):
+            if response.error.code or response.row_errors:
+                msg = f"Failed to append rows to {stream}: {response.error.message} {list(response.row_errors)}"
+                raise RuntimeError(msg)
+
+    def finalize(self, stream: str) -> int:
+        """Finalize the stream."""
+        return self.client.finalize_write_stream(name=stream).row_count
+
+    def commit(self, table: str, streams: list[str]) -> None:
+        """Commit pending streams atomically."""
+        response = self.client.batch_commit_write_streams(request={"parent": table, "write_streams": streams})
+        if response.stream_errors:
+            msg = f"Failed to commit streams to {table}: {list(response.stream_errors)}"
+            raise RuntimeError(msg)
+
+
+def read_batches(path: Path, batch_size: int) -> Iterator[pa.RecordBatch]:
+    """Yield record batches of at most ``batch_size`` rows from Arrow IPC or Parquet file."""
+    if path.suffix == ".parquet":
+        yield from pq.ParquetFile(str(path)).iter_batches(batch_size=batch_size)
+        return
+
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def schema_of(path: Path) -> pa.Schema:
+    """Return Arrow schema of Arrow IPC or Parquet file."""
+    if path.suffix == ".parquet":
+        return pq.read_schema(str(path))
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).schema
+
+
+def write_table(
+    writer: StreamWriter,
+    table: str,
+    paths: list[Path],
+    batch_size: int = 10_000,
+    max_streams: int = 4,
+) -> int:
+    """Write files into a table with parallel pending streams committed atomically, and return the number of rows.
+
+    Parameters
+    ----------
+    writer:
+        Storage Write API or its fake.
+    table:
+        Table path ``projects/<PROJECT_ID>/datasets/<DATASET_ID>/tables/<TABLE_ID>``.
+    paths:
+        Arrow IPC or Parquet files with the same schema.
+    batch_size:
+        Maximum number of rows in an append request.
+    max_streams:
+        Maximum number of streams written concurrently. Files are distributed to streams in round-robin.
+
+    ``FileNotFoundError`` is raised if ``paths`` is empty, because the schema of the rows is unknown.
+
+    """
+    if not paths:
+        msg = "No Arrow IPC or Parquet files to write into the table."
+        raise FileNotFoundError(msg)
+
+    schema = schema_of(paths[0])
+    num_streams = max(1, min(max_streams, len(paths)))
+    groups = [paths[i::num_streams] for i in range(num_streams)]
+
+    def write(group: list[Path]) -> tuple[str, int]:
+        stream = writer.create_stream(table)
+        batches = (batch for path in group for batch in read_batches(path, batch_size))
+        writer.append(stream=stream, schema=schema, batches=batches)
+        return stream, writer.finalize(stream)
+
+    # Nothing is visible in the table unless all streams are written.
+    with ThreadPoolExecutor(max_workers=num_streams) as executor:
+        results = list(executor.map(write, groups))
+
+    writer.commit(table=table, streams=[stream for stream, _ in results])
+    return sum(n for _, n in results)
@@ -1,3 +1,53 @@
-from kfpc.bigquery.extract import Extract as Extract
-from kfpc.bigquery.load import Load as Load
-from kfpc.bigquery.query import Query as Query
+"""Kubeflow Pipelines components for BigQuery.
+
+Submodules are imported on the first access to their attributes, so that ``import kfpc`` does not import ``kfp``.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kfpc.bigquery.copy import Copy as Copy
+    from kfpc.bigquery.extract import Extract as Extract
+    from kfpc.bigquery.load import Load as Load
+    from kfpc.bigquery.optimizer import optimize as optimize
+    from kfpc.bigquery.query import Query as Query
+    from kfpc.bigquery.query_batch import QueryBatch as QueryBatch
+    from kfpc.bigquery.query_script import QueryScript as QueryScript
+    from kfpc.bigquery.read_table import ReadTable as ReadTable
+    from kfpc.bigquery.reader import ExtractReader as ExtractReader
+    from kfpc.bigquery.wait_for_table import WaitForTable as WaitForTable
+    from kfpc.bigquery.write_table import WriteTable as WriteTable
+
+_SUBMODULES = {
+    "Copy": "kfpc.bigquery.copy",
+    "Extract": "kfpc.bigquery.extract",
+    "ExtractReader": "kfpc.bigquery.reader",
+    "Load": "kfpc.bigquery.load",
+    "Query": "kfpc.bigquery.query",
+    "QueryBatch": "kfpc.bigquery.query_batch",
+    "QueryScript": "kfpc.bigquery.query_script",
+    "ReadTable": "kfpc.bigquery.read_table",
+    "WaitForTable": "kfpc.bigquery.wait_for_table",
+    "WriteTable": "kfpc.bigquery.write_table",
+    "optimize": "kfpc.bigquery.optimizer",
+}
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining ``name`` on the first access."""
+    if name not in _SUBMODULES:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(_SUBMODULES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return names including ones not imported yet."""
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,170 @@
+"""Module for BigQuery copy job."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+import yaml
+from kfp.components import load_component_from_text
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+from kfpc.version import get_version
+
+
+@functools.cache
+def _load_component(name: str, image_version: str, num_sources: int) -> YamlComponent:
+    """Compile the component spec once per name, image version and number of source tables."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "location", "type": "String"},
+            {"name": "destination_project", "type": "String"},
+            {"name": "destination_dataset", "type": "String"},
+            {"name": "destination_table", "type": "String"},
+            {"name": "operation_type", "type": "String"},
+            {"name": "write_disposition", "type": "String"},
+            {"name": "destination_expiration_time", "type": "String"},
+        ],
+        "outputs": [
+            {"name": "destination_table", "type": "google.BQTable"},
+            {"name": "gcp_resources", "type": "String"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "copy"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--location", {"inputValue": "location"},
+                    "--destination-project", {"inputValue": "destination_project"},
+                    "--destination-dataset", {"inputValue": "destination_dataset"},
+                    "--destination-table", {"inputValue": "destination_table"},
+                    "--operation-type", {"inputValue": "operation_type"},
+                    "--write-disposition", {"inputValue": "write_disposition"},
+                    "--destination-expiration-time", {"inputValue": "destination_expiration_time"},
+                    "--gcp-resources", {"outputPath": "gcp_resources"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    for i in range(num_sources):
+        component_dict["inputs"].append({"name": f"source_table{i + 1}", "type": "google.BQTable"})
+        component_dict["implementation"]["container"]["args"] += [
+            "--source-table-uri", {"inputUri": f"source_table{i + 1}"},
+        ]
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class CopyTask:
+    """Kubeflow Pipelines task for BigQuery copy job."""
+
+    def __init__(self, task: PipelineTask) -> None:
+        """Initialize ``CopyTask`` instance."""
+        self.task = task
+
+    @property
+    def destination_table(self) -> PipelineArtifactChannel:
+        """Return destination_table artifact."""
+        return self.task.outputs["destination_table"]
+
+    @property
+    def gcp_resources(self) -> PipelineArtifactChannel:
+        """Return gcp_resources artifact."""
+        return self.task.outputs["gcp_resources"]
+
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
+
+class Copy:
+    """Kubeflow Pipelines component for BigQuery copy job.
+
+    Tables are copied inside BigQuery, so this replaces a pair of ``kfpc.bigquery.Extract`` and
+    ``kfpc.bigquery.Load`` when the source and destination tables are in the same location.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``Copy`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        job_project: PipelineParameterChannel | str,
+        source_table_artifacts: list[PipelineArtifactChannel],
+        destination_project: PipelineParameterChannel | str,
+        destination_dataset: PipelineParameterChannel | str,
+        destination_table: PipelineParameterChannel | str,
+        location: PipelineParameterChannel | str = "US",
+        operation_type: PipelineParameterChannel | str = "COPY",
+        write_disposition: PipelineParameterChannel | str = "WRITE_TRUNCATE",
+        destination_expiration_time: PipelineParameterChannel | str = "",
+    ) -> CopyTask:
+        """Generate a Kubeflow Pipelines task to execute BigQuery copy job.
+
+        Parameters
+        ----------
+        job_project:
+            Google Cloud Platform project ID to execute copy job.
+        source_table_artifacts:
+            `google.BQTable` artifacts generated by other tasks. Rows of all tables are copied into
+            the destination table if more than one table is given, which is only allowed for ``COPY``.
+        destination_project:
+            Google Cloud Platform project ID of the destination table.
+        destination_dataset:
+            BigQuery dataset ID of the destination table.
+        destination_table:
+            BigQuery table ID of the destination table.
+        location:
+            Location of BigQuery source and destination tables.
+        operation_type:
+            ``COPY``, ``SNAPSHOT`` to create a read-only table snapshot, ``CLONE`` to create a writable
+            table clone, or ``RESTORE`` to restore a table snapshot.
+        write_disposition:
+            ``WRITE_TRUNCATE``, ``WRITE_APPEND`` or ``WRITE_EMPTY``.
+            ``SNAPSHOT`` and ``CLONE`` require ``WRITE_EMPTY``.
+        destination_expiration_time:
+            Expiration time of the destination table in RFC 3339 format such as ``2025-01-01T00:00:00Z``.
+            Never expires if empty.
+
+        Returns
+        -------
+        CopyTask
+
+        """
+        if not source_table_artifacts:
+            msg = "source_table_artifacts must not be empty."
+            raise ValueError(msg)
+
+        source_tables = {f"source_table{i + 1}": t for i, t in enumerate(source_table_artifacts)}
+        component = _load_component(name=self.name, image_version=get_version(), num_sources=len(source_tables))
+        task = component(
+            job_project=job_project,
+            location=location,
+            destination_project=destination_project,
+            destination_dataset=destination_dataset,
+            destination_table=destination_table,
+            operation_type=operation_type,
+            write_disposition=write_disposition,
+            destination_expiration_time=destination_expiration_time,
+            **source_tables,
+        )
+
+        return CopyTask(task=task)
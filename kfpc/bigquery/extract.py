@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
 import yaml
@@ -10,10 +11,54 @@ from kfp.components import load_component_from_text
 if TYPE_CHECKING:
     from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
     from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
 
 from kfpc.version import get_version
 
 
+@functools.cache
+def _load_component(name: str, image_version: str, split_by_partition: bool) -> YamlComponent:  # noqa: FBT001
+    """Compile the component spec once per name, image version and static flags."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "location", "type": "String"},
+            {"name": "source_table_artifact", "type": "google.BQTable"},
+            {"name": "destination_format", "type": "String"},
+            {"name": "compression", "type": "String"},
+            {"name": "partitions", "type": "JsonArray"},
+            {"name": "row_filters", "type": "JsonArray"},
+            {"name": "max_concurrency", "type": "Integer"},
+        ],
+        "outputs": [
+            {"name": "output_files", "type": "Artifact"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "extract"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--location", {"inputValue": "location"},
+                    "--table-uri", {"inputUri": "source_table_artifact"},
+                    "--destination-uri", {"outputUri": "output_files"},
+                    "--destination-format", {"inputValue": "destination_format"},
+                    "--compression", {"inputValue": "compression"},
+                    "--partitions", {"inputValue": "partitions"},
+                    "--row-filters", {"inputValue": "row_filters"},
+                    "--max-concurrency", {"inputValue": "max_concurrency"},
+                    "--executor-input", {"executorInput": None},
+                    *(["--split-by-partition"] if split_by_partition else []),
+                ],
+            },
+        },
+    }
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
 class ExtractTask:
     """Kubeflow Pipelines task for BigQuery extract job."""
 
@@ -26,6 +71,11 @@ class ExtractTask:
         """Return output_files artifact."""
         return self.task.outputs["output_files"]
 
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
 
 class Extract:
     """Kubeflow Pipelines component for BigQuery extract job.
@@ -46,6 +96,12 @@ class Extract:
         job_project: PipelineParameterChannel | str,
         source_table_artifact: PipelineArtifactChannel | None,
         location: PipelineParameterChannel | str = "US",
+        destination_format: PipelineParameterChannel | str = "NEWLINE_DELIMITED_JSON",
+        compression: PipelineParameterChannel | str = "NONE",
+        partitions: PipelineParameterChannel | list[str] | None = None,
+        split_by_partition: bool = False,  # noqa: FBT001, FBT002
+        row_filters: PipelineParameterChannel | list[str] | None = None,
+        max_concurrency: PipelineParameterChannel | int = 8,
     ) -> ExtractTask:
         """Generate Kubeflow Pipelines task to submit BigQuery extract job.
 
@@ -58,42 +114,49 @@ class Extract:
             Typically, ``kfpc.bigquery.Query.destination_table`` is used.
         location:
             Location of BigQuery sources.
+        destination_format:
+            ``NEWLINE_DELIMITED_JSON``, ``CSV``, ``AVRO`` or ``PARQUET``.
+            The format, the file name pattern and the schema of the source table are recorded in the metadata of
+            ``output_files``, so that ``kfpc.bigquery.Load`` can load the files without options.
+        compression:
+            ``NONE``, ``GZIP``, ``DEFLATE``, ``SNAPPY`` or ``ZSTD``.
+            Available values depend on ``destination_format``.
+        partitions:
+            Partition IDs such as ``20240101`` of a partitioned table. Each partition is extracted by its own job with
+            the decorator ``<TABLE_ID>$<PARTITION_ID>`` into the prefix ``partition=<PARTITION_ID>/`` of
+            ``output_files``.
+        split_by_partition:
+            Extract every partition of the table like ``partitions``. The partitions are listed when the task runs.
+        row_filters:
+            SQL conditions such as ``region = 'JP'``. Rows matching each condition are selected by a query job and
+            extracted into the prefix ``filter=<INDEX>/`` of ``output_files``.
+        max_concurrency:
+            Maximum number of jobs running at the same time when the table is split.
+            The files of all jobs are recorded in one manifest in the metadata of ``output_files``.
 
         Returns
         -------
         self
 
         """
-        component_dict = {
-            "name": self.name,
-            "inputs": [
-                {"name": "job_project", "type": "String"},
-                {"name": "location", "type": "String"},
-                {"name": "source_table_artifact", "type": "google.BQTable"},
-            ],
-            "outputs": [
-                {"name": "output_files", "type": "Artifact"},
-            ],
-            "implementation": {
-                "container": {
-                    "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{get_version()}",
-                    "command": ["inv", "extract"],
-                    "args": [
-                        "--job-project", {"inputValue": "job_project"},
-                        "--location", {"inputValue": "location"},
-                        "--table-uri", {"inputUri": "source_table_artifact"},
-                        "--destination-uri", {"outputUri": "output_files"},
-                        "--executor-input", {"executorInput": None},
-                    ],
-                },
-            },
-        }
-
-        component = load_component_from_text(yaml.dump(component_dict))
+        if sum([bool(partitions), split_by_partition, bool(row_filters)]) > 1:
+            msg = "Only one of partitions, split_by_partition and row_filters can be specified."
+            raise ValueError(msg)
+
+        component = _load_component(
+            name=self.name,
+            image_version=get_version(),
+            split_by_partition=split_by_partition,
+        )
         task = component(
             job_project=job_project,
             location=location,
             source_table_artifact=source_table_artifact,
+            destination_format=destination_format,
+            compression=compression,
+            partitions=partitions or [],
+            row_filters=row_filters or [],
+            max_concurrency=max_concurrency,
         )
 
         return ExtractTask(task=task)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
 import yaml
@@ -10,10 +11,60 @@ from kfp.components import load_component_from_text
 if TYPE_CHECKING:
     from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
     from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
 
 from kfpc.version import get_version
 
 
+@functools.cache
+def _load_component(name: str, image_version: str, num_sources: int) -> YamlComponent:
+    """Compile the component spec once per name, image version and number of source artifacts."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "schema", "type": "JsonArray"},
+            {"name": "location", "type": "String"},
+            {"name": "source_uri_suffix", "type": "String"},
+            {"name": "source_format", "type": "String"},
+            {"name": "destination_project", "type": "String"},
+            {"name": "destination_dataset", "type": "String"},
+            {"name": "destination_table", "type": "String"},
+            {"name": "write_disposition", "type": "String"},
+        ],
+        "outputs": [
+            {"name": "destination_table", "type": "google.BQTable"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "load"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--location", {"inputValue": "location"},
+                    "--source-uri-suffix", {"inputValue": "source_uri_suffix"},
+                    "--source-format", {"inputValue": "source_format"},
+                    "--schema", {"inputValue": "schema"},
+                    "--destination-project", {"inputValue": "destination_project"},
+                    "--destination-dataset", {"inputValue": "destination_dataset"},
+                    "--destination-table", {"inputValue": "destination_table"},
+                    "--write-disposition", {"inputValue": "write_disposition"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    for i in range(num_sources):
+        component_dict["inputs"].append({"name": f"source_artifact{i + 1}", "type": "Artifact"})
+        component_dict["implementation"]["container"]["args"] += [
+            "--source-uri", {"inputUri": f"source_artifact{i + 1}"},
+        ]
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
 class LoadTask:
     """Kubeflow Pipelines task for BigQuery load job."""
 
@@ -26,6 +77,11 @@ class LoadTask:
         """Return destination_table artifact."""
         return self.task.outputs["destination_table"]
 
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
 
 class Load:
     """Kubeflow Pipelines component for BigQuery load job.
@@ -47,10 +103,12 @@ class Load:
         destination_project: PipelineParameterChannel | str,
         destination_dataset: PipelineParameterChannel | str,
         destination_table: PipelineParameterChannel | str,
-        schema: PipelineParameterChannel | list[dict],
-        source_artifact: PipelineArtifactChannel,
+        schema: PipelineParameterChannel | list[dict] | None = None,
+        source_artifact: PipelineArtifactChannel | list[PipelineArtifactChannel] | None = None,
         source_uri_suffix: str = "",
         location: str = "US",
+        source_format: PipelineParameterChannel | str = "",
+        write_disposition: PipelineParameterChannel | str = "WRITE_TRUNCATE",
     ) -> LoadTask:
         """Generate a Kubeflow Pipelines task to execute BigQuery load job.
 
@@ -58,7 +116,6 @@ class Load:
         ----------
         job_project:
             Google Cloud Platform project ID to execute load job.
-        source_artifact:
         destination_project:
             Google Cloud Platform project ID of the destination table.
         destination_dataset:
@@ -67,57 +124,49 @@ class Load:
             BigQuery table ID of the destination table.
         schema:
             BigQuery table schema of the destination table.
+            If empty, the schema of the source table recorded by ``kfpc.bigquery.Extract`` is used if any.
         source_artifact:
-            Source artifact to be loaded.
+            Source artifact to be loaded, or a list of source artifacts.
+            Files of all artifacts are loaded by one job, so the destination table is updated atomically.
         source_uri_suffix:
             Load files matched to ``os.path.join(source_uri, source_uri_suffix)``.
-            ``source_uri`` is Kubeflow Pipelines placeholder ``inputPath`` of ``source_artifact``.
+            ``source_uri`` is Kubeflow Pipelines placeholder ``inputPath`` of each source artifact.
+            If empty, the file name pattern recorded by ``kfpc.bigquery.Extract`` is used if any.
         location:
             Location of BigQuery destination table.
+        source_format:
+            ``NEWLINE_DELIMITED_JSON``, ``CSV``, ``AVRO`` or ``PARQUET``.
+            If empty, the format recorded by ``kfpc.bigquery.Extract`` is used,
+            and ``NEWLINE_DELIMITED_JSON`` otherwise.
+        write_disposition:
+            ``WRITE_TRUNCATE``, ``WRITE_APPEND`` or ``WRITE_EMPTY``.
 
-        """
-        component_dict = {
-            "name": self.name,
-            "inputs": [
-                {"name": "job_project", "type": "String"},
-                {"name": "schema", "type": "JsonArray"},
-                {"name": "location", "type": "String"},
-                {"name": "source_uri_suffix", "type": "String"},
-                {"name": "source_artifact", "type": "Artifact"},
-                {"name": "destination_project", "type": "String"},
-                {"name": "destination_dataset", "type": "String"},
-                {"name": "destination_table", "type": "String"},
-            ],
-            "outputs": [
-                {"name": "destination_table", "type": "google.BQTable"},
-            ],
-            "implementation": {
-                "container": {
-                    "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{get_version()}",
-                    "command": ["inv", "load"],
-                    "args": [
-                        "--job-project", {"inputValue": "job_project"},
-                        "--location", {"inputValue": "location"},
-                        "--source-uri", {"inputUri": "source_artifact"},
-                        "--source-uri-suffix", {"inputValue": "source_uri_suffix"},
-                        "--schema", {"inputValue": "schema"},
-                        "--destination-project", {"inputValue": "destination_project"},
-                        "--destination-dataset", {"inputValue": "destination_dataset"},
-                        "--destination-table", {"inputValue": "destination_table"},
-                        "--executor-input", {"executorInput": None},
-                    ],
-                },
-            },
-        }
+        Returns
+        -------
+        LoadTask
 
-        component = load_component_from_text(yaml.dump(component_dict))
-        return component(
+        """
+        if isinstance(source_artifact, list):
+            source_artifacts = source_artifact
+        else:
+            source_artifacts = [] if source_artifact is None else [source_artifact]
+        if not source_artifacts:
+            msg = "source_artifact must not be empty."
+            raise ValueError(msg)
+
+        sources = {f"source_artifact{i + 1}": a for i, a in enumerate(source_artifacts)}
+        component = _load_component(name=self.name, image_version=get_version(), num_sources=len(sources))
+        task = component(
             job_project=job_project,
-            source_artifact=source_artifact,
             destination_project=destination_project,
             destination_dataset=destination_dataset,
             destination_table=destination_table,
             location=location,
-            schema=schema,
+            schema=schema or [],
             source_uri_suffix=source_uri_suffix,
+            source_format=source_format,
+            write_disposition=write_disposition,
+            **sources,
         )
+
+        return LoadTask(task=task)
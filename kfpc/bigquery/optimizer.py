@@ -0,0 +1,379 @@
+"""Compile-time pass fusing kfpc BigQuery tasks of a pipeline into fewer jobs and pods.
+
+Apply ``optimize`` under ``kfp.dsl.pipeline``. After the pipeline function defines its tasks, and before
+``kfp.compiler`` builds the pipeline spec from them, the pass rewrites the task graph:
+
+- A linear chain of ``Query`` tasks, where each task is consumed only by the next one, becomes one
+  ``QueryScript`` task that still creates every destination table and emits every ``google.BQTable`` artifact.
+- A pair of ``Extract`` and ``Load`` tasks in the same location becomes one ``Copy`` task.
+
+Only tasks without per-task settings such as retry, resources, caching options or display name are rewritten.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any
+
+from kfp.dsl import pipeline_channel, pipeline_context
+
+from kfpc.bigquery.copy import Copy
+from kfpc.bigquery.query_script import QueryScript
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from kfp.dsl.pipeline_task import PipelineTask
+
+IMAGE = "us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery"
+
+
+class OptimizationReport:
+    """Summary of rewrites applied by ``optimize``."""
+
+    def __init__(self) -> None:
+        """Initialize ``OptimizationReport``."""
+        self.fused_chains: list[list[str]] = []
+        self.copied_pairs: list[tuple[str, str]] = []
+
+    @property
+    def pods_eliminated(self) -> int:
+        """Return the number of pods no longer launched."""
+        return sum(len(chain) - 1 for chain in self.fused_chains) + len(self.copied_pairs)
+
+    @property
+    def jobs_eliminated(self) -> int:
+        """Return the number of BigQuery jobs no longer submitted by pods.
+
+        A script job still runs one child job per statement.
+        """
+        return sum(len(chain) - 1 for chain in self.fused_chains) + len(self.copied_pairs)
+
+    def __str__(self) -> str:
+        """Return a human readable report."""
+        lines = ["kfpc optimizer:"]
+        lines += [f"  fused {' -> '.join(chain)} into one script task" for chain in self.fused_chains]
+        lines += [f"  replaced {extract} -> {load} with a copy task" for extract, load in self.copied_pairs]
+        lines.append(f"  eliminated {self.pods_eliminated} pods and {self.jobs_eliminated} jobs")
+        return "\n".join(lines)
+
+
+def _command(task: PipelineTask) -> list[str] | None:
+    """Return the command of a kfpc BigQuery task, or ``None`` for other tasks."""
+    spec = task.container_spec
+    if spec is None or not spec.image.startswith(f"{IMAGE}:"):
+        return None
+    return spec.command
+
+
+def _is_plain(task: PipelineTask) -> bool:
+    """Return whether the task has no per-task settings which would be lost by rewriting it."""
+    task_spec = task._task_spec  # noqa: SLF001
+    return (
+        task_spec.retry_policy is None
+        and task_spec.display_name is None
+        and task_spec.trigger_condition is None
+        and task_spec.enable_caching == pipeline_context.Pipeline.get_execution_caching_default()
+        and task.container_spec.resources is None
+        and not task.container_spec.env
+        and not task.platform_config
+        and not task._ignore_upstream_failure_tag  # noqa: SLF001
+    )
+
+
+def _is_kfpc_task(task: PipelineTask, command: str) -> bool:
+    """Return whether the task runs ``inv <command>`` of kfpc and can be rewritten."""
+    return _command(task) == ["inv", command] and _is_plain(task)
+
+
+def _is_fusable_query(task: PipelineTask) -> bool:
+    """Return whether a Query task can be a statement of a script.
+
+    ``CREATE OR REPLACE TABLE`` statements are not partitioned, clustered nor expired, cannot replace a partition
+    nor merge, and need the destination table. A query skipped by its freshness check or limited in bytes billed
+    must keep its own task.
+    """
+    options = ["time_partitioning", "range_partitioning", "clustering_fields", "destination_expiration", "max_bytes_billed"]
+    return (
+        _is_kfpc_task(task, "query")
+        and _same(task.inputs.get("mode", "truncate"), "truncate")
+        and not _same(task.inputs["destination_table"], "")
+        and "$" not in str(task.inputs["destination_table"])
+        and not {"--skip-if-fresh", "--dry-run-first"} & set(task.container_spec.args)
+        and not any(task.inputs.get(k) for k in options)
+    )
+
+
+def _consumers(pipeline: pipeline_context.Pipeline, outputs: Any) -> dict[str, set[str]]:  # noqa: ANN401
+    """Return names of tasks consuming outputs of each task. Pipeline outputs are consumed by ``""``."""
+    consumers = {name: set() for name in pipeline.tasks}
+    for name, task in pipeline.tasks.items():
+        for channel in task.channel_inputs:
+            if channel.task_name in consumers:
+                consumers[channel.task_name].add(name)
+        for dependent in task.dependent_tasks:
+            consumers[dependent].add(name)
+    for channel in pipeline_channel.extract_pipeline_channels_from_any(outputs):
+        if channel.task_name in consumers:
+            consumers[channel.task_name].add("")
+    return consumers
+
+
+def _consumed_directly(pipeline: pipeline_context.Pipeline, names: set[str]) -> bool:
+    """Return whether outputs of tasks ``names`` are passed to other tasks only as whole input values.
+
+    Outputs embedded in strings or collections cannot be rewired.
+    """
+    for task in pipeline.tasks.values():
+        direct = {id(v) for v in task.inputs.values()}
+        if any(c.task_name in names and id(c) not in direct for c in task.channel_inputs):
+            return False
+    return True
+
+
+def _same(a: object, b: object) -> bool:
+    """Return whether two inputs are the same constant or the same pipeline channel."""
+    return str(a) == str(b)
+
+
+def _remove(pipeline: pipeline_context.Pipeline, old: list[PipelineTask]) -> None:
+    """Remove ``old`` tasks so that the replacing task can take over the name of the last one."""
+    for task in old:
+        del pipeline.tasks[task.name]
+        pipeline.remove_task_from_groups(task)
+
+
+def _replace(pipeline: pipeline_context.Pipeline, old: list[PipelineTask], new: PipelineTask, channels: dict) -> None:
+    """Put ``new`` task into the group of removed ``old`` tasks and rewire consumers to ``channels``.
+
+    ``channels`` maps ``(task name, output name)`` of removed tasks to channels of the new task.
+    """
+    group = old[-1].parent_task_group
+    pipeline.remove_task_from_groups(new)
+    new.parent_task_group = group
+    group.tasks.append(new)
+
+    old_names = {task.name for task in old}
+    for task in pipeline.tasks.values():
+        if task is new:
+            continue
+        for key, value in task.inputs.items():
+            if isinstance(value, pipeline_channel.PipelineChannel) and (value.task_name, value.name) in channels:
+                task.inputs[key] = task._task_spec.inputs[key] = channels[value.task_name, value.name]  # noqa: SLF001
+        task._channel_inputs = [c for c in task.channel_inputs if c.task_name not in old_names]  # noqa: SLF001
+        task._channel_inputs += [  # noqa: SLF001
+            v for v in task.inputs.values() if isinstance(v, pipeline_channel.PipelineChannel) and v.task_name == new.name
+        ]
+        dependents = task.dependent_tasks
+        if old_names & set(dependents):
+            dependents[:] = [d for d in dependents if d not in old_names] + [new.name]
+
+
+def _query_chains(pipeline: pipeline_context.Pipeline, consumers: dict[str, set[str]]) -> list[list[PipelineTask]]:
+    """Return linear chains of two or more Query tasks."""
+    queries = {name: task for name, task in pipeline.tasks.items() if _is_fusable_query(task)}
+
+    def next_of(task: PipelineTask) -> PipelineTask | None:
+        if len(consumers[task.name]) != 1:
+            return None
+        successor = queries.get(next(iter(consumers[task.name])))
+        if (
+            successor is None
+            or successor.parent_task_group is not task.parent_task_group
+            or not any(c.task_name == task.name and c.name == "destination_table" for c in successor.channel_inputs)
+            or any(c.task_name == task.name and c.name != "destination_table" for c in successor.channel_inputs)
+        ):
+            return None
+        if not all(_same(task.inputs[k], successor.inputs[k]) for k in ["job_project", "location"]):
+            return None
+        return successor
+
+    successors = {name: next_of(task) for name, task in queries.items()}
+    has_predecessor = {s.name for s in successors.values() if s is not None}
+
+    chains = []
+    for name, task in queries.items():
+        if name in has_predecessor:
+            continue
+        chain = [task]
+        while (successor := successors[chain[-1].name]) is not None:
+            chain.append(successor)
+        if len(chain) > 1 and _consumed_directly(pipeline, {t.name for t in chain}):
+            chains.append(chain)
+    return chains
+
+
+def _fuse_queries(pipeline: pipeline_context.Pipeline, chain: list[PipelineTask]) -> None:
+    """Replace a chain of Query tasks with a QueryScript task."""
+    names = {task.name for task in chain}
+    depend_on = {}
+    for task in chain:
+        for key, value in task.inputs.items():
+            is_table = key.startswith("table") and isinstance(value, pipeline_channel.PipelineChannel)
+            if is_table and value.task_name not in names:
+                depend_on[value.task_name, value.name] = value
+
+    first, last = chain[0], chain[-1]
+    _remove(pipeline, chain)
+    script_task = QueryScript(name=last.component_spec.name).task(
+        queries=[
+            {k: task.inputs[k] for k in ["query", "destination_project", "destination_dataset", "destination_table"]}
+            for task in chain
+        ],
+        job_project=first.inputs["job_project"],
+        location=first.inputs["location"],
+        depend_on=list(depend_on.values()),
+        deterministic_job_id=any(task.inputs["pipeline_job_id"] for task in chain),
+    )
+
+    channels = {(task.name, "destination_table"): t for task, t in zip(chain, script_task.destination_tables, strict=True)}
+    channels[last.name, "gcp_resources"] = script_task.gcp_resources
+    channels[last.name, "metrics"] = script_task.metrics
+    _replace(pipeline, old=chain, new=script_task.task, channels=channels)
+
+
+def _extract_load_pairs(
+    pipeline: pipeline_context.Pipeline,
+    consumers: dict[str, set[str]],
+) -> list[tuple[PipelineTask, PipelineTask]]:
+    """Return pairs of Extract task and Load task reading only its output in the same location."""
+    pairs = []
+    for name, extract in pipeline.tasks.items():
+        if not _is_kfpc_task(extract, "extract") or len(consumers[name]) != 1:
+            continue
+        load = pipeline.tasks.get(next(iter(consumers[name])))
+        if (
+            load is None
+            or not _is_kfpc_task(load, "load")
+            or load.parent_task_group is not extract.parent_task_group
+            or load.inputs["source_uri_suffix"]
+            or "source_artifact2" in load.inputs
+            # A copy job cannot apply the schema given to Load.
+            or load.inputs["schema"]
+            or load.inputs["source_format"] not in ["", extract.inputs["destination_format"]]
+            or not _same(load.inputs["location"], extract.inputs["location"])
+            or not isinstance(extract.inputs["source_table_artifact"], pipeline_channel.PipelineChannel)
+            # A copy job cannot select partitions or rows.
+            or extract.inputs["partitions"]
+            or extract.inputs["row_filters"]
+            or any(c.task_name == name and c.name != "output_files" for c in load.channel_inputs)
+            or not _consumed_directly(pipeline, {name, load.name})
+        ):
+            continue
+        pairs.append((extract, load))
+    return pairs
+
+
+def _copy_extract_load(pipeline: pipeline_context.Pipeline, extract: PipelineTask, load: PipelineTask) -> None:
+    """Replace a pair of Extract and Load tasks with a Copy task."""
+    _remove(pipeline, [extract, load])
+    copy_task = Copy(name=load.component_spec.name).task(
+        job_project=load.inputs["job_project"],
+        source_table_artifacts=[extract.inputs["source_table_artifact"]],
+        destination_project=load.inputs["destination_project"],
+        destination_dataset=load.inputs["destination_dataset"],
+        destination_table=load.inputs["destination_table"],
+        location=load.inputs["location"],
+        write_disposition=load.inputs["write_disposition"],
+    )
+    channels = {
+        (load.name, "destination_table"): copy_task.destination_table,
+        (load.name, "metrics"): copy_task.metrics,
+    }
+    _replace(pipeline, old=[extract, load], new=copy_task.task, channels=channels)
+
+
+def optimize_pipeline(
+    pipeline: pipeline_context.Pipeline,
+    outputs: Any = None,  # noqa: ANN401
+    fuse_queries: bool = True,  # noqa: FBT001, FBT002
+    copy_extract_load: bool = True,  # noqa: FBT001, FBT002
+) -> OptimizationReport:
+    """Rewrite tasks of ``pipeline`` being defined and return the report.
+
+    Parameters
+    ----------
+    pipeline:
+        Pipeline whose tasks have been defined, but not compiled.
+    outputs:
+        Outputs returned by the pipeline function. Tasks producing them are not rewritten.
+    fuse_queries:
+        Fuse linear chains of Query tasks into QueryScript tasks. Fused queries replace their destination tables
+        with ``CREATE OR REPLACE TABLE``, which drops labels, description and partitioning of existing tables
+        unlike ``WRITE_TRUNCATE`` of a query job.
+    copy_extract_load:
+        Replace Extract and Load pairs with Copy tasks. Pairs whose Load is given a schema are not replaced,
+        because a copy job keeps the schema of the source table.
+
+    """
+    report = OptimizationReport()
+
+    if fuse_queries:
+        consumers = _consumers(pipeline, outputs)
+        for chain in _query_chains(pipeline, consumers):
+            report.fused_chains.append([task.name for task in chain])
+            _fuse_queries(pipeline, chain)
+
+    if copy_extract_load:
+        consumers = _consumers(pipeline, outputs)
+        for extract, load in _extract_load_pairs(pipeline, consumers):
+            report.copied_pairs.append((extract.name, load.name))
+            _copy_extract_load(pipeline, extract, load)
+
+    return report
+
+
+def optimize(
+    pipeline_func: Callable | None = None,
+    *,
+    fuse_queries: bool = True,
+    copy_extract_load: bool = True,
+    verbose: bool = True,
+) -> Callable:
+    """Decorate a pipeline function to fuse its kfpc BigQuery tasks at compile time.
+
+    Examples
+    --------
+    >>> @kfp.dsl.pipeline(name="optimized")
+    ... @kfpc.bigquery.optimize
+    ... def pipeline_fn(project: str) -> None:
+    ...     ...
+
+    Parameters
+    ----------
+    pipeline_func:
+        Pipeline function.
+    fuse_queries:
+        Fuse linear chains of Query tasks into QueryScript tasks. Disable it if destination tables of the queries
+        exist with labels, description or partitioning to keep, which ``CREATE OR REPLACE TABLE`` would drop.
+    copy_extract_load:
+        Replace Extract and Load pairs in the same location with Copy tasks, unless Load is given a schema.
+    verbose:
+        Print the report of rewrites.
+
+    """
+    if pipeline_func is None:
+        return functools.partial(
+            optimize,
+            fuse_queries=fuse_queries,
+            copy_extract_load=copy_extract_load,
+            verbose=verbose,
+        )
+
+    @functools.wraps(pipeline_func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        outputs = pipeline_func(*args, **kwargs)
+        pipeline = pipeline_context.Pipeline.get_default_pipeline()
+        if pipeline is None:
+            return outputs
+        report = optimize_pipeline(
+            pipeline,
+            outputs=outputs,
+            fuse_queries=fuse_queries,
+            copy_extract_load=copy_extract_load,
+        )
+        if verbose:
+            print(report)  # noqa: T201
+        return outputs
+
+    return wrapper
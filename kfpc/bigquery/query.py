@@ -2,17 +2,101 @@
 
 from __future__ import annotations
 
+import functools
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
     from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
 
 import yaml
+from kfp import dsl
 from kfp.components import load_component_from_text
 
 from kfpc.version import get_version
 
+# Inputs passed only if they are set. The container defaults to empty values without them.
+OPTIONAL_INPUTS = {
+    "time_partitioning": "JsonObject",
+    "range_partitioning": "JsonObject",
+    "clustering_fields": "JsonArray",
+    "destination_expiration": "String",
+    "mode": "String",
+    "merge_keys": "JsonArray",
+    "watermark_column": "String",
+    "max_bytes_billed": "Integer",
+}
+
+
+@functools.cache
+def _load_component(
+    name: str,
+    image_version: str,
+    num_depend_on: int,
+    skip_if_fresh: bool,  # noqa: FBT001
+    dry_run_first: bool,  # noqa: FBT001
+    options: tuple[str, ...] = (),
+) -> YamlComponent:
+    """Compile the component spec once per name, image version and input signature.
+
+    ``options`` are names of ``OPTIONAL_INPUTS`` to be added, so that tasks without them compile smaller specs.
+    """
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "query", "type": "String"},
+            {"name": "location", "type": "String"},
+            {"name": "destination_project", "type": "String"},
+            {"name": "destination_dataset", "type": "String"},
+            {"name": "destination_table", "type": "String"},
+            {"name": "pipeline_job_id", "type": "String"},
+            {"name": "pipeline_task_name", "type": "String"},
+        ],
+        "outputs": [
+            {"name": "destination_table", "type": "google.BQTable"},
+            {"name": "gcp_resources", "type": "String"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "query"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--query", {"inputValue": "query"},
+                    "--location", {"inputValue": "location"},
+                    "--destination-project", {"inputValue": "destination_project"},
+                    "--destination-dataset", {"inputValue": "destination_dataset"},
+                    "--destination-table", {"inputValue": "destination_table"},
+                    "--pipeline-job-id", {"inputValue": "pipeline_job_id"},
+                    "--pipeline-task-name", {"inputValue": "pipeline_task_name"},
+                    "--gcp-resources", {"outputPath": "gcp_resources"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    for option in options:
+        component_dict["inputs"].append({"name": option, "type": OPTIONAL_INPUTS[option]})
+        component_dict["implementation"]["container"]["args"] += [f"--{option.replace('_', '-')}", {"inputValue": option}]
+
+    for i in range(num_depend_on):
+        component_dict["inputs"].append({"name": f"table{i + 1}", "type": "google.BQTable"})
+
+    if dry_run_first:
+        component_dict["implementation"]["container"]["args"].append("--dry-run-first")
+
+    # Source tables are passed only if their modification time is checked.
+    if skip_if_fresh:
+        component_dict["implementation"]["container"]["args"].append("--skip-if-fresh")
+        for i in range(num_depend_on):
+            component_dict["implementation"]["container"]["args"] += ["--depend-on-uri", {"inputUri": f"table{i + 1}"}]
+
+    return load_component_from_text(yaml.dump(component_dict))
+
 
 class QueryTask:
     """Kubeflow Pipelines task for BigQuery query job."""
@@ -31,6 +115,11 @@ class QueryTask:
         """Return gcp_resources artifact."""
         return self.task.outputs["gcp_resources"]
 
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
 
 class Query:
     """Kubeflow Pipelines component for BigQuery query job.
@@ -46,15 +135,26 @@ class Query:
         """Initialize ``Query`` instance."""
         self.name = name
 
-    def task(
+    def task(  # noqa: PLR0913, PLR0917
         self,
         query: PipelineParameterChannel | str,
         job_project: PipelineParameterChannel | str,
-        destination_project: PipelineParameterChannel | str,
-        destination_dataset: PipelineParameterChannel | str,
-        destination_table: PipelineParameterChannel | str,
+        destination_project: PipelineParameterChannel | str = "",
+        destination_dataset: PipelineParameterChannel | str = "",
+        destination_table: PipelineParameterChannel | str = "",
         location: PipelineParameterChannel | str = "US",
         depend_on: list[PipelineArtifactChannel] | None = None,
+        deterministic_job_id: bool = False,  # noqa: FBT001, FBT002
+        skip_if_fresh: bool = False,  # noqa: FBT001, FBT002
+        time_partitioning: PipelineParameterChannel | dict | None = None,
+        range_partitioning: PipelineParameterChannel | dict | None = None,
+        clustering_fields: PipelineParameterChannel | list[str] | None = None,
+        destination_expiration: PipelineParameterChannel | str = "",
+        mode: str = "truncate",
+        merge_keys: list[str] | None = None,
+        watermark_column: str = "",
+        max_bytes_billed: PipelineParameterChannel | int = 0,
+        dry_run_first: bool = False,  # noqa: FBT001, FBT002
     ) -> QueryTask:
         """Generate a Kubeflow Pipelines task.
 
@@ -72,70 +172,102 @@ class Query:
             BigQuery dataset ID of the destination table.
         destination_table:
             BigQuery table ID of the destination table.
+            A partition decorator such as ``table$20240101`` rewrites only the partition,
+            and the output artifact refers to the whole table.
+            If empty, the result is written into an anonymous table, which is emitted as the output and expires
+            in about a day. Results of the same query are then served from the query cache of BigQuery,
+            and ``cache_hit`` of ``metrics`` is 1.
         depend_on:
             Required table artifacts to execute this query.
+        deterministic_job_id:
+            If ``True``, the job ID is derived from the pipeline run, the task name and the job configuration.
+            A retried pod re-attaches to the job submitted by the previous attempt instead of resubmitting it.
+        skip_if_fresh:
+            If ``True``, the query job is skipped like ``make`` when the destination table was written by the same
+            query after all tables of ``depend_on`` were last modified. The existing table is emitted as the output.
+            Tables read by the query must be given in ``depend_on``, and caching of the task should be disabled.
+        time_partitioning:
+            ``TimePartitioning`` of the destination table such as ``{"type": "DAY", "field": "dt"}``.
+            https://cloud.google.com/bigquery/docs/reference/rest/v2/tables#TimePartitioning
+        range_partitioning:
+            ``RangePartitioning`` of the destination table such as
+            ``{"field": "id", "range": {"start": 0, "end": 100, "interval": 10}}``.
+        clustering_fields:
+            Up to four columns to cluster the destination table by.
+        destination_expiration:
+            Expiration time of the destination table in RFC 3339 format such as ``2025-01-01T00:00:00Z``.
+            The table is not changed if empty.
+        mode:
+            ``truncate`` to overwrite the destination table with the query result, or ``merge`` to upsert the
+            result into the destination table on ``merge_keys``. The result is staged in a temporary table and
+            merged in one script job, which reports the numbers of inserted and updated rows in ``metrics``.
+            The destination table is created without partitioning if it does not exist.
+        merge_keys:
+            Key columns to match rows of the result with rows of the destination table in ``merge`` mode.
+        watermark_column:
+            Column such as the partitioning column in ``merge`` mode. Rows of the destination table older than
+            the minimum of the column in the result are neither scanned nor updated.
+        max_bytes_billed:
+            Maximum bytes billed of the query job, which fails without being billed if it exceeds the limit.
+            Unlimited if 0.
+        dry_run_first:
+            If ``True``, bytes processed by the query are estimated with a dry run before the job is submitted,
+            and the task fails immediately if the estimate exceeds ``max_bytes_billed``.
+            The estimate is recorded as ``estimated_bytes_processed`` of ``metrics``.
 
         Returns
         -------
         QueryTask
 
         """
-        component_dict = {
-            "name": self.name,
-            "inputs": [
-                {"name": "job_project", "type": "String"},
-                {"name": "query", "type": "String"},
-                {"name": "location", "type": "String"},
-                {"name": "destination_project", "type": "String"},
-                {"name": "destination_dataset", "type": "String"},
-                {"name": "destination_table", "type": "String"},
-            ],
-            "outputs": [
-                {"name": "destination_table", "type": "google.BQTable"},
-                {"name": "gcp_resources", "type": "String"},
-            ],
-            "implementation": {
-                "container": {
-                    "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{get_version()}",
-                    "command": ["inv", "query"],
-                    "args": [
-                        "--job-project", {"inputValue": "job_project"},
-                        "--query", {"inputValue": "query"},
-                        "--location", {"inputValue": "location"},
-                        "--destination-project", {"inputValue": "destination_project"},
-                        "--destination-dataset", {"inputValue": "destination_dataset"},
-                        "--destination-table", {"inputValue": "destination_table"},
-                        "--gcp-resources", {"outputPath": "gcp_resources"},
-                        "--executor-input", {"executorInput": None},
-                    ],
-                },
-            },
-        }
+        if mode not in ["truncate", "merge"]:
+            msg = f"mode must be 'truncate' or 'merge', but got '{mode}'."
+            raise ValueError(msg)
+        if mode == "merge" and not merge_keys:
+            msg = "merge_keys must not be empty in 'merge' mode."
+            raise ValueError(msg)
+        table_options = [time_partitioning, range_partitioning, clustering_fields, destination_expiration]
+        # A pipeline channel cannot be checked until runtime, and `==` on it builds a condition instead of a bool.
+        no_destination = isinstance(destination_table, str) and not destination_table
+        if no_destination and (mode == "merge" or skip_if_fresh or any(table_options)):
+            msg = "destination_table is required by 'merge' mode, skip_if_fresh and options of the destination table."
+            raise ValueError(msg)
+        if mode == "merge" and (time_partitioning or range_partitioning or clustering_fields):
+            msg = "Partitioning and clustering are not applied in 'merge' mode. Create the destination table in advance."
+            raise ValueError(msg)
 
-        if depend_on:
-            additional_inputs = {}
-            for i, t in enumerate(depend_on):
-                key = f"table{i+1}"
-                component_dict["inputs"].append({"name": key, "type": "google.BQTable"})
-                additional_inputs[key] = t
-
-            task = load_component_from_text(yaml.dump(component_dict))(
-                query=query,
-                job_project=job_project,
-                location=location,
-                destination_project=destination_project,
-                destination_dataset=destination_dataset,
-                destination_table=destination_table,
-                **additional_inputs,
-            )
-        else:
-            task = load_component_from_text(yaml.dump(component_dict))(
-                query=query,
-                job_project=job_project,
-                location=location,
-                destination_project=destination_project,
-                destination_dataset=destination_dataset,
-                destination_table=destination_table,
-            )
+        options = {
+            "time_partitioning": time_partitioning,
+            "range_partitioning": range_partitioning,
+            "clustering_fields": clustering_fields,
+            "destination_expiration": destination_expiration,
+            "mode": "" if mode == "truncate" else mode,
+            "merge_keys": merge_keys,
+            "watermark_column": watermark_column,
+            "max_bytes_billed": max_bytes_billed,
+        }
+        # Pipeline channels are always set because their values are unknown until runtime.
+        options = {k: v for k, v in options.items() if v}
+        additional_inputs = {f"table{i + 1}": t for i, t in enumerate(depend_on or [])}
+        component = _load_component(
+            name=self.name,
+            image_version=get_version(),
+            num_depend_on=len(additional_inputs),
+            skip_if_fresh=skip_if_fresh,
+            dry_run_first=dry_run_first,
+            options=tuple(options),
+        )
+        task = component(
+            query=query,
+            job_project=job_project,
+            location=location,
+            destination_project=destination_project,
+            destination_dataset=destination_dataset,
+            destination_table=destination_table,
+            pipeline_job_id=dsl.PIPELINE_JOB_ID_PLACEHOLDER if deterministic_job_id else "",
+            pipeline_task_name=dsl.PIPELINE_TASK_NAME_PLACEHOLDER if deterministic_job_id else "",
+            **options,
+            **additional_inputs,
+        )
 
         return QueryTask(task=task)
@@ -0,0 +1,141 @@
+"""Module for BigQuery query jobs executed concurrently in one container."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+import yaml
+from kfp.components import load_component_from_text
+
+from kfpc.version import get_version
+
+
+@functools.cache
+def _load_component(name: str, image_version: str, num_queries: int, num_depend_on: int) -> YamlComponent:
+    """Compile the component spec once per name, image version and input signature."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "queries", "type": "JsonArray"},
+            {"name": "location", "type": "String"},
+            {"name": "max_concurrency", "type": "Integer"},
+        ],
+        "outputs": [
+            {"name": "gcp_resources", "type": "String"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "query-batch"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--queries", {"inputValue": "queries"},
+                    "--location", {"inputValue": "location"},
+                    "--max-concurrency", {"inputValue": "max_concurrency"},
+                    "--gcp-resources", {"outputPath": "gcp_resources"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    for i in range(num_queries):
+        component_dict["outputs"].append({"name": f"destination_table{i + 1}", "type": "google.BQTable"})
+
+    for i in range(num_depend_on):
+        component_dict["inputs"].append({"name": f"table{i + 1}", "type": "google.BQTable"})
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class QueryBatchTask:
+    """Kubeflow Pipelines task for BigQuery query jobs executed in one container."""
+
+    def __init__(self, task: PipelineTask, num_queries: int) -> None:
+        """Initialize ``QueryBatchTask``."""
+        self.task = task
+        self.num_queries = num_queries
+
+    @property
+    def destination_tables(self) -> list[PipelineArtifactChannel]:
+        """Return destination_table artifacts in the same order as ``queries``."""
+        return [self.task.outputs[f"destination_table{i + 1}"] for i in range(self.num_queries)]
+
+    @property
+    def gcp_resources(self) -> PipelineArtifactChannel:
+        """Return gcp_resources artifact."""
+        return self.task.outputs["gcp_resources"]
+
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics summed over the queries and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
+
+class QueryBatch:
+    """Kubeflow Pipelines component for BigQuery query jobs executed concurrently in one container.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``QueryBatch`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        queries: list[dict[str, str]],
+        job_project: PipelineParameterChannel | str,
+        location: PipelineParameterChannel | str = "US",
+        max_concurrency: PipelineParameterChannel | int = 16,
+        depend_on: list[PipelineArtifactChannel] | None = None,
+    ) -> QueryBatchTask:
+        """Generate a Kubeflow Pipelines task.
+
+        Parameters
+        ----------
+        queries:
+            List of dictionaries with keys ``query``, ``destination_project``, ``destination_dataset`` and
+            ``destination_table``. One ``google.BQTable`` artifact is generated for each element.
+        job_project:
+            Google Cloud Platform project ID to execute query jobs.
+        location:
+            Location of BigQuery sources.
+        max_concurrency:
+            Maximum number of query jobs running at the same time.
+        depend_on:
+            Required table artifacts to execute these queries.
+
+        Returns
+        -------
+        QueryBatchTask
+
+        """
+        additional_inputs = {f"table{i + 1}": t for i, t in enumerate(depend_on or [])}
+        component = _load_component(
+            name=self.name,
+            image_version=get_version(),
+            num_queries=len(queries),
+            num_depend_on=len(additional_inputs),
+        )
+        task = component(
+            queries=queries,
+            job_project=job_project,
+            location=location,
+            max_concurrency=max_concurrency,
+            **additional_inputs,
+        )
+
+        return QueryBatchTask(task=task, num_queries=len(queries))
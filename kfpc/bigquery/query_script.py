@@ -0,0 +1,155 @@
+"""Module for BigQuery multi-statement script materializing several tables in one job."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+import yaml
+from kfp import dsl
+from kfp.components import load_component_from_text
+
+from kfpc.version import get_version
+
+QUERY_KEYS = ["query", "destination_project", "destination_dataset", "destination_table"]
+
+
+@functools.cache
+def _load_component(name: str, image_version: str, num_queries: int, num_depend_on: int) -> YamlComponent:
+    """Compile the component spec once per name, image version and input signature."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "location", "type": "String"},
+            {"name": "pipeline_job_id", "type": "String"},
+            {"name": "pipeline_task_name", "type": "String"},
+        ],
+        "outputs": [
+            {"name": "gcp_resources", "type": "String"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "query-script"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--location", {"inputValue": "location"},
+                    "--pipeline-job-id", {"inputValue": "pipeline_job_id"},
+                    "--pipeline-task-name", {"inputValue": "pipeline_task_name"},
+                    "--gcp-resources", {"outputPath": "gcp_resources"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    # Each query is passed as separate inputs so that values can be pipeline parameters or task outputs.
+    for i in range(num_queries):
+        component_dict["outputs"].append({"name": f"destination_table{i + 1}", "type": "google.BQTable"})
+        for key in QUERY_KEYS:
+            component_dict["inputs"].append({"name": f"{key}{i + 1}", "type": "String"})
+            component_dict["implementation"]["container"]["args"] += [
+                f"--{key.replace('_', '-')}", {"inputValue": f"{key}{i + 1}"},
+            ]
+
+    for i in range(num_depend_on):
+        component_dict["inputs"].append({"name": f"table{i + 1}", "type": "google.BQTable"})
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class QueryScriptTask:
+    """Kubeflow Pipelines task for BigQuery multi-statement script."""
+
+    def __init__(self, task: PipelineTask, num_queries: int) -> None:
+        """Initialize ``QueryScriptTask``."""
+        self.task = task
+        self.num_queries = num_queries
+
+    @property
+    def destination_tables(self) -> list[PipelineArtifactChannel]:
+        """Return destination_table artifacts in the same order as ``queries``."""
+        return [self.task.outputs[f"destination_table{i + 1}"] for i in range(self.num_queries)]
+
+    @property
+    def gcp_resources(self) -> PipelineArtifactChannel:
+        """Return gcp_resources artifact."""
+        return self.task.outputs["gcp_resources"]
+
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of job statistics and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
+
+class QueryScript:
+    """Kubeflow Pipelines component for BigQuery multi-statement script.
+
+    Queries are executed in order as ``CREATE OR REPLACE TABLE`` statements of one script job,
+    so a query can read tables created by the preceding queries.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``QueryScript`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        queries: list[dict[str, PipelineParameterChannel | str]],
+        job_project: PipelineParameterChannel | str,
+        location: PipelineParameterChannel | str = "US",
+        depend_on: list[PipelineArtifactChannel] | None = None,
+        deterministic_job_id: bool = False,  # noqa: FBT001, FBT002
+    ) -> QueryScriptTask:
+        """Generate a Kubeflow Pipelines task.
+
+        Parameters
+        ----------
+        queries:
+            List of dictionaries with keys ``query``, ``destination_project``, ``destination_dataset`` and
+            ``destination_table``. One ``google.BQTable`` artifact is generated for each element.
+        job_project:
+            Google Cloud Platform project ID to execute the script job.
+        location:
+            Location of BigQuery sources.
+        depend_on:
+            Required table artifacts to execute the script.
+        deterministic_job_id:
+            If ``True``, the job ID is derived from the pipeline run, the task name and the job configuration.
+
+        Returns
+        -------
+        QueryScriptTask
+
+        """
+        additional_inputs = {f"table{i + 1}": t for i, t in enumerate(depend_on or [])}
+        query_inputs = {f"{key}{i + 1}": q[key] for i, q in enumerate(queries) for key in QUERY_KEYS}
+        component = _load_component(
+            name=self.name,
+            image_version=get_version(),
+            num_queries=len(queries),
+            num_depend_on=len(additional_inputs),
+        )
+        task = component(
+            job_project=job_project,
+            location=location,
+            pipeline_job_id=dsl.PIPELINE_JOB_ID_PLACEHOLDER if deterministic_job_id else "",
+            pipeline_task_name=dsl.PIPELINE_TASK_NAME_PLACEHOLDER if deterministic_job_id else "",
+            **query_inputs,
+            **additional_inputs,
+        )
+
+        return QueryScriptTask(task=task, num_queries=len(queries))
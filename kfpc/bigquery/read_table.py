@@ -0,0 +1,127 @@
+"""Module for reading BigQuery table with Storage Read API."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+import yaml
+from kfp.components import load_component_from_text
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+from kfpc.version import get_version
+
+
+@functools.cache
+def _load_component(name: str, image_version: str) -> YamlComponent:
+    """Compile the component spec once per name and image version."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "source_table_artifact", "type": "google.BQTable"},
+            {"name": "selected_fields", "type": "JsonArray"},
+            {"name": "row_restriction", "type": "String"},
+            {"name": "max_streams", "type": "Integer"},
+            {"name": "file_format", "type": "String"},
+        ],
+        "outputs": [
+            {"name": "output_files", "type": "Artifact"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "read-table"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--table-uri", {"inputUri": "source_table_artifact"},
+                    "--destination-uri", {"outputUri": "output_files"},
+                    "--selected-fields", {"inputValue": "selected_fields"},
+                    "--row-restriction", {"inputValue": "row_restriction"},
+                    "--max-streams", {"inputValue": "max_streams"},
+                    "--file-format", {"inputValue": "file_format"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class ReadTableTask:
+    """Kubeflow Pipelines task for reading BigQuery table with Storage Read API."""
+
+    def __init__(self, task: PipelineTask) -> None:
+        """Initialize ``ReadTableTask`` instance."""
+        self.task = task
+
+    @property
+    def output_files(self) -> PipelineArtifactChannel:
+        """Return output_files artifact."""
+        return self.task.outputs["output_files"]
+
+
+class ReadTable:
+    """Kubeflow Pipelines component for reading BigQuery table with Storage Read API.
+
+    Unlike ``kfpc.bigquery.Extract``, no extract job is submitted. Streams of a read session are written
+    concurrently into one file per stream, which can be read with ``kfpc.bigquery.ExtractReader``.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``ReadTable`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        job_project: PipelineParameterChannel | str,
+        source_table_artifact: PipelineArtifactChannel,
+        selected_fields: PipelineParameterChannel | list[str] | None = None,
+        row_restriction: PipelineParameterChannel | str = "",
+        max_streams: PipelineParameterChannel | int = 4,
+        file_format: PipelineParameterChannel | str = "PARQUET",
+    ) -> ReadTableTask:
+        """Generate Kubeflow Pipelines task to read BigQuery table.
+
+        Parameters
+        ----------
+        job_project:
+            Google Cloud Platform project ID billed for the read session.
+        source_table_artifact:
+            `google.BQTable` artifact generated by other tasks.
+        selected_fields:
+            Columns to read. All columns are read if empty.
+        row_restriction:
+            SQL filter applied on the server such as ``corpus_date > 1600``.
+        max_streams:
+            Maximum number of streams read concurrently.
+        file_format:
+            ``ARROW`` for Arrow IPC files or ``PARQUET``.
+
+        Returns
+        -------
+        ReadTableTask
+
+        """
+        component = _load_component(name=self.name, image_version=get_version())
+        task = component(
+            job_project=job_project,
+            source_table_artifact=source_table_artifact,
+            selected_fields=selected_fields or [],
+            row_restriction=row_restriction,
+            max_streams=max_streams,
+            file_format=file_format,
+        )
+
+        return ReadTableTask(task=task)
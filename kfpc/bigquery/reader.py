@@ -0,0 +1,404 @@
+"""Module for reading files written by ``kfpc.bigquery.Extract`` in downstream Python components."""
+
+from __future__ import annotations
+
+import base64
+import csv
+import datetime as dt
+import decimal
+import gzip
+import io
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    import pyarrow as pa
+    from kfp import dsl
+
+FORMATS = {
+    ".jsonl": "NEWLINE_DELIMITED_JSON",
+    ".json": "NEWLINE_DELIMITED_JSON",
+    ".csv": "CSV",
+    ".avro": "AVRO",
+    ".parquet": "PARQUET",
+    ".arrow": "ARROW",
+}
+
+_DONE = object()
+
+
+def _import_pyarrow() -> Any:  # noqa: ANN401
+    try:
+        import pyarrow as pa  # noqa: PLC0415
+    except ImportError as e:
+        msg = "pyarrow is required for Parquet and Arrow files and Arrow or NumPy batches: pip install pyarrow"
+        raise ImportError(msg) from e
+    return pa
+
+
+def _parse_timestamp(value: str) -> dt.datetime:
+    """Parse a timestamp written such as ``2024-01-01 00:00:00 UTC`` or with an offset."""
+    timestamp = dt.datetime.fromisoformat(value.removesuffix(" UTC"))
+    return timestamp.replace(tzinfo=dt.UTC) if timestamp.tzinfo is None else timestamp.astimezone(dt.UTC)
+
+
+# Parsers of BigQuery types written as strings in JSON and CSV files. An empty string of CSV is NULL.
+_PARSERS: dict[str, Callable[[str], Any]] = {
+    "INTEGER": int,
+    "INT64": int,
+    "FLOAT": float,
+    "FLOAT64": float,
+    "BOOLEAN": lambda v: v.lower() == "true",
+    "BOOL": lambda v: v.lower() == "true",
+    "BYTES": base64.b64decode,
+    "DATE": dt.date.fromisoformat,
+    "DATETIME": dt.datetime.fromisoformat,
+    "TIME": dt.time.fromisoformat,
+    "TIMESTAMP": _parse_timestamp,
+    "NUMERIC": decimal.Decimal,
+    "BIGNUMERIC": decimal.Decimal,
+}
+
+
+def _arrow_type(pa: Any, field: dict) -> pa.DataType:  # noqa: ANN401
+    """Return Arrow type of a field of BigQuery schema. Types such as ``GEOGRAPHY`` and ``JSON`` are strings."""
+    if field["type"] in ["RECORD", "STRUCT"]:
+        base = pa.struct([pa.field(f["name"], _arrow_type(pa, f)) for f in field.get("fields", [])])
+    else:
+        base = {
+            "INTEGER": pa.int64(),
+            "INT64": pa.int64(),
+            "FLOAT": pa.float64(),
+            "FLOAT64": pa.float64(),
+            "BOOLEAN": pa.bool_(),
+            "BOOL": pa.bool_(),
+            "BYTES": pa.binary(),
+            "DATE": pa.date32(),
+            "DATETIME": pa.timestamp("us"),
+            "TIME": pa.time64("us"),
+            "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+            "NUMERIC": pa.decimal128(38, 9),
+            "BIGNUMERIC": pa.decimal256(76, 38),
+        }.get(field["type"], pa.string())
+    return pa.list_(base) if field.get("mode") == "REPEATED" else base
+
+
+def _coerce(value: Any, field: dict) -> Any:  # noqa: ANN401
+    """Convert a value decoded from JSON, CSV or Avro into the Python type of the BigQuery field."""
+    if value is None:
+        return None
+    if field.get("mode") == "REPEATED":
+        return [_coerce(v, field | {"mode": "NULLABLE"}) for v in value]
+    if field["type"] in ["RECORD", "STRUCT"]:
+        return {f["name"]: _coerce(value.get(f["name"]), f) for f in field.get("fields", [])}
+    # Values decoded by JSON or Avro into non-strings already have the type.
+    parse = _PARSERS.get(field["type"])
+    if parse is None or not isinstance(value, str):
+        return value
+    return parse(value) if value else None
+
+
+def _open(path: Path) -> IO[bytes]:
+    return gzip.open(path) if path.suffix == ".gz" else path.open("rb")
+
+
+def _format_of(path: Path) -> str:
+    suffix = path.with_suffix("").suffix if path.suffix == ".gz" else path.suffix
+    return FORMATS[suffix]
+
+
+def _read_json(path: Path, chunk_size: int) -> Iterator[list[dict]]:
+    chunk = []
+    with _open(path) as f:
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_csv(path: Path, chunk_size: int) -> Iterator[list[dict]]:
+    chunk = []
+    with _open(path) as f:
+        for row in csv.DictReader(io.TextIOWrapper(f, encoding="utf-8", newline="")):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_avro(path: Path, chunk_size: int) -> Iterator[list[dict]]:
+    try:
+        import fastavro  # noqa: PLC0415
+    except ImportError as e:
+        msg = "fastavro is required for Avro files: pip install fastavro"
+        raise ImportError(msg) from e
+
+    chunk = []
+    with path.open("rb") as f:
+        for record in fastavro.reader(f):
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _read_parquet(path: Path, chunk_size: int) -> Iterator[pa.RecordBatch]:
+    _import_pyarrow()
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+
+
+def _read_arrow(path: Path, chunk_size: int) -> Iterator[pa.RecordBatch]:
+    pa = _import_pyarrow()
+
+    # Record batches are memory-mapped without copying.
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size)
+
+
+READERS: dict[str, Callable[[Path, int], Iterator[Any]]] = {
+    "NEWLINE_DELIMITED_JSON": _read_json,
+    "CSV": _read_csv,
+    "AVRO": _read_avro,
+    "PARQUET": _read_parquet,
+    "ARROW": _read_arrow,
+}
+
+
+class _Prefetcher:
+    """Decode files in worker threads into a bounded queue."""
+
+    def __init__(self, read: Callable[[Path, int], Iterator[Any]], files: list[Path], chunk_size: int, prefetch: int) -> None:
+        self.read = read
+        self.chunk_size = chunk_size
+        self.files: queue.Queue[Path] = queue.Queue()
+        for path in files:
+            self.files.put(path)
+        self.chunks: queue.Queue[Any] = queue.Queue(maxsize=prefetch)
+        self.stop = threading.Event()
+
+    def put(self, item: object) -> None:
+        """Put an item into the queue unless the consumer has stopped."""
+        while not self.stop.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def work(self) -> None:
+        """Decode files until no file is left."""
+        try:
+            while not self.stop.is_set():
+                try:
+                    path = self.files.get_nowait()
+                except queue.Empty:
+                    break
+                for chunk in self.read(path, self.chunk_size):
+                    if self.stop.is_set():
+                        return
+                    self.put(chunk)
+        except Exception as e:  # noqa: BLE001
+            self.put(e)
+        finally:
+            self.put(_DONE)
+
+    def run(self, num_workers: int) -> Iterator[Any]:
+        """Yield chunks until all workers finish, and raise exceptions raised in workers."""
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for _ in range(num_workers):
+                executor.submit(self.work)
+            try:
+                done = 0
+                while done < num_workers:
+                    item = self.chunks.get()
+                    if item is _DONE:
+                        done += 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                # Unblock workers when the consumer stops early.
+                self.stop.set()
+
+
+class ExtractReader:
+    """Streaming reader of files written by ``kfpc.bigquery.Extract`` or ``kfpc.bigquery.ReadTable``.
+
+    Files are decoded by ``num_workers`` threads in parallel. At most ``prefetch`` decoded chunks of
+    ``chunk_size`` rows are buffered, so memory usage is bounded regardless of the size of files.
+    Rows of different files are interleaved, so the order of rows is not preserved across files.
+
+    Parameters
+    ----------
+    source:
+        ``output_files`` artifact of ``kfpc.bigquery.Extract``, or a local directory containing extracted files
+        such as a ``/gcs/`` mounted path.
+    num_workers:
+        Number of threads decoding files.
+    prefetch:
+        Maximum number of decoded chunks buffered ahead of the consumer.
+    chunk_size:
+        Number of rows decoded at once by a thread.
+
+    Examples
+    --------
+    >>> reader = ExtractReader("/gcs/my-bucket/pipeline-root/extract/output_files")
+    >>> for batch in reader.batches(batch_size=1024, batch_format="numpy"):
+    ...     train_step(batch)
+
+    """
+
+    def __init__(
+        self,
+        source: dsl.Artifact | str | Path,
+        num_workers: int = 4,
+        prefetch: int = 16,
+        chunk_size: int = 1024,
+    ) -> None:
+        """Initialize ``ExtractReader`` and resolve files to be read."""
+        if isinstance(source, str | Path):
+            directory, metadata = Path(source), {}
+        else:
+            directory, metadata = Path(source.path), source.metadata or {}
+
+        manifest = metadata.get("manifest")
+        if manifest is None and (directory / "manifest.json").exists():
+            manifest = json.loads((directory / "manifest.json").read_text())
+
+        if manifest is not None:
+            self.files = [directory / (f["path"] if "path" in f else Path(f["uri"]).name) for f in manifest["files"]]
+        else:
+            self.files = sorted(directory.glob(metadata.get("filePattern", "data-*")))
+
+        if not self.files:
+            msg = f"No extracted files found in {directory}."
+            raise FileNotFoundError(msg)
+
+        self.format = metadata.get("destinationFormat") or _format_of(self.files[0])
+        # BigQuery schema recorded by `Extract`, which gives all Arrow batches the same columns and types.
+        self.schema: list[dict] = metadata.get("schema") or []
+        self.num_workers = num_workers
+        self.prefetch = prefetch
+        self.chunk_size = chunk_size
+
+    def _chunks(self) -> Iterator[Any]:
+        """Yield decoded chunks from files read in parallel."""
+        prefetcher = _Prefetcher(
+            read=READERS[self.format],
+            files=self.files,
+            chunk_size=self.chunk_size,
+            prefetch=self.prefetch,
+        )
+        yield from prefetcher.run(num_workers=min(self.num_workers, len(self.files)))
+
+    def records(self) -> Iterator[dict]:
+        """Yield rows as dictionaries."""
+        for chunk in self._chunks():
+            yield from chunk if isinstance(chunk, list) else chunk.to_pylist()
+
+    def batches(self, batch_size: int, batch_format: str = "dict") -> Iterator[Any]:
+        """Yield fixed-size batches of rows. Only the last batch may be smaller.
+
+        Parameters
+        ----------
+        batch_size:
+            Number of rows in a batch.
+        batch_format:
+            ``dict`` for lists of dictionaries, ``arrow`` for ``pyarrow.RecordBatch``
+            and ``numpy`` for dictionaries from column names to ``numpy.ndarray``.
+            Rows of JSON, CSV and Avro files are converted into Arrow with the schema recorded by
+            ``kfpc.bigquery.Extract`` if any, so all batches have the same columns and types.
+
+        """
+        if batch_format == "dict":
+            batch: list[dict] = []
+            for record in self.records():
+                batch.append(record)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        if batch_format not in ["arrow", "numpy"]:
+            msg = f"batch_format must be one of dict, arrow or numpy: {batch_format}"
+            raise ValueError(msg)
+
+        pa = _import_pyarrow()
+        for record_batch in self._arrow_batches(pa, batch_size):
+            if batch_format == "arrow":
+                yield record_batch
+            else:
+                yield {
+                    name: column.to_numpy(zero_copy_only=False)
+                    for name, column in zip(record_batch.schema.names, record_batch.columns, strict=True)
+                }
+
+    def _record_batch(self, pa: Any, rows: list[dict]) -> pa.RecordBatch:  # noqa: ANN401
+        """Convert decoded rows into ``pyarrow.RecordBatch`` with the recorded schema if any.
+
+        BigQuery omits NULL fields of JSON rows, so columns are not taken from the first row. Without the recorded
+        schema, columns and types are inferred from all rows of the chunk.
+        """
+        if not self.schema:
+            return pa.RecordBatch.from_struct_array(pa.array(rows))
+        schema = pa.schema([pa.field(f["name"], _arrow_type(pa, f)) for f in self.schema])
+        return pa.RecordBatch.from_pylist(
+            [{f["name"]: _coerce(row.get(f["name"]), f) for f in self.schema} for row in rows],
+            schema=schema,
+        )
+
+    def _arrow_batches(self, pa: Any, batch_size: int) -> Iterator[pa.RecordBatch]:  # noqa: ANN401
+        """Yield ``pyarrow.RecordBatch`` of ``batch_size`` rows."""
+        pending: list[pa.RecordBatch] = []
+        num_pending = 0
+        schema = None
+        for chunk in self._chunks():
+            record_batch = self._record_batch(pa, chunk) if isinstance(chunk, list) else chunk
+            pending.append(record_batch)
+            num_pending += record_batch.num_rows
+            if num_pending < batch_size:
+                continue
+            table = _concat_batches(pa, pending, schema)
+            schema = table.schema
+            offset = 0
+            while table.num_rows - offset >= batch_size:
+                yield table.slice(offset, batch_size).combine_chunks().to_batches()[0]
+                offset += batch_size
+            pending = table.slice(offset).to_batches()
+            num_pending = table.num_rows - offset
+        if num_pending:
+            yield _concat_batches(pa, pending, schema).combine_chunks().to_batches()[0]
+
+
+def _concat_batches(pa: Any, batches: list[pa.RecordBatch], schema: pa.Schema | None = None) -> pa.Table:  # noqa: ANN401
+    """Concatenate batches into a table, filling columns missing in some batches with nulls.
+
+    Batches of inferred schemas may differ, for example in a column whose values are all NULL in a chunk.
+    Columns of ``schema`` of previous batches are kept so that columns of yielded batches do not decrease.
+    """
+    tables = [schema.empty_table()] if schema is not None else []
+    tables += [pa.Table.from_batches([batch]) for batch in batches]
+    return pa.concat_tables(tables, promote_options="permissive")
@@ -0,0 +1,156 @@
+"""Module for waiting until a BigQuery table is ready."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+import yaml
+from kfp.components import load_component_from_text
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+from kfpc.version import get_version
+
+
+@functools.cache
+def _load_component(name: str, image_version: str) -> YamlComponent:
+    """Compile the component spec once per name and image version."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "project", "type": "String"},
+            {"name": "dataset", "type": "String"},
+            {"name": "table", "type": "String"},
+            {"name": "partition", "type": "String"},
+            {"name": "min_rows", "type": "Integer"},
+            {"name": "max_staleness_seconds", "type": "Float"},
+            {"name": "timeout_seconds", "type": "Float"},
+            {"name": "poll_interval_seconds", "type": "Float"},
+            {"name": "max_poll_interval_seconds", "type": "Float"},
+        ],
+        "outputs": [
+            {"name": "table", "type": "google.BQTable"},
+            {"name": "metrics", "type": "Metrics"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "wait-for-table"],
+                "args": [
+                    "--project", {"inputValue": "project"},
+                    "--dataset", {"inputValue": "dataset"},
+                    "--table", {"inputValue": "table"},
+                    "--partition", {"inputValue": "partition"},
+                    "--min-rows", {"inputValue": "min_rows"},
+                    "--max-staleness-seconds", {"inputValue": "max_staleness_seconds"},
+                    "--timeout-seconds", {"inputValue": "timeout_seconds"},
+                    "--poll-interval-seconds", {"inputValue": "poll_interval_seconds"},
+                    "--max-poll-interval-seconds", {"inputValue": "max_poll_interval_seconds"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class WaitForTableTask:
+    """Kubeflow Pipelines task waiting until a BigQuery table is ready."""
+
+    def __init__(self, task: PipelineTask) -> None:
+        """Initialize ``WaitForTableTask`` instance."""
+        self.task = task
+
+    @property
+    def table(self) -> PipelineArtifactChannel:
+        """Return table artifact, which can be given to ``depend_on`` of ``kfpc.bigquery.Query``."""
+        return self.task.outputs["table"]
+
+    @property
+    def metrics(self) -> PipelineArtifactChannel:
+        """Return metrics artifact of the number of polls and time of each phase of the task."""
+        return self.task.outputs["metrics"]
+
+
+class WaitForTable:
+    """Kubeflow Pipelines component waiting until a BigQuery table or partition is ready.
+
+    The table is polled with ``tables.get`` masked to a few fields and conditional on the ETag of the previous
+    response. The interval of polling grows while the table is not modified.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``WaitForTable`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        project: PipelineParameterChannel | str,
+        dataset: PipelineParameterChannel | str,
+        table: PipelineParameterChannel | str,
+        partition: PipelineParameterChannel | str = "",
+        min_rows: PipelineParameterChannel | int = 0,
+        max_staleness_seconds: PipelineParameterChannel | float = 0.0,
+        timeout_seconds: PipelineParameterChannel | float = 3600.0,
+        poll_interval_seconds: PipelineParameterChannel | float = 5.0,
+        max_poll_interval_seconds: PipelineParameterChannel | float = 300.0,
+    ) -> WaitForTableTask:
+        """Generate a Kubeflow Pipelines task to wait until a BigQuery table is ready.
+
+        Caching of the task is disabled.
+
+        Parameters
+        ----------
+        project:
+            Google Cloud Platform project ID of the table.
+        dataset:
+            BigQuery dataset ID of the table.
+        table:
+            BigQuery table ID of the table.
+        partition:
+            Partition ID such as ``20240101``. If not empty, ``min_rows`` and ``max_staleness_seconds`` are
+            checked for the partition.
+        min_rows:
+            Wait until the table or the partition has at least this number of rows.
+        max_staleness_seconds:
+            Wait until the table or the partition was modified within this number of seconds. Disabled if ``0``.
+        timeout_seconds:
+            The task fails if the table is not ready in this time.
+        poll_interval_seconds:
+            Initial interval of polling. It is doubled while the table is not modified, and reset when the table
+            is modified but not ready yet.
+        max_poll_interval_seconds:
+            Maximum interval of polling.
+
+        Returns
+        -------
+        WaitForTableTask
+
+        """
+        component = _load_component(name=self.name, image_version=get_version())
+        task = component(
+            project=project,
+            dataset=dataset,
+            table=table,
+            partition=partition,
+            min_rows=min_rows,
+            max_staleness_seconds=max_staleness_seconds,
+            timeout_seconds=timeout_seconds,
+            poll_interval_seconds=poll_interval_seconds,
+            max_poll_interval_seconds=max_poll_interval_seconds,
+        )
+        # A cached result would not wait for the table on the next run.
+        task.set_caching_options(enable_caching=False)
+
+        return WaitForTableTask(task=task)
@@ -0,0 +1,140 @@
+"""Module for writing local Arrow or Parquet artifact into BigQuery with Storage Write API."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+import yaml
+from kfp.components import load_component_from_text
+
+if TYPE_CHECKING:
+    from kfp.dsl.pipeline_channel import PipelineArtifactChannel, PipelineParameterChannel
+    from kfp.dsl.pipeline_task import PipelineTask
+    from kfp.dsl.yaml_component import YamlComponent
+
+from kfpc.version import get_version
+
+
+@functools.cache
+def _load_component(name: str, image_version: str) -> YamlComponent:
+    """Compile the component spec once per name and image version."""
+    component_dict = {
+        "name": name,
+        "inputs": [
+            {"name": "job_project", "type": "String"},
+            {"name": "source_artifact", "type": "Artifact"},
+            {"name": "destination_project", "type": "String"},
+            {"name": "destination_dataset", "type": "String"},
+            {"name": "destination_table", "type": "String"},
+            {"name": "schema", "type": "JsonArray"},
+            {"name": "batch_size", "type": "Integer"},
+            {"name": "max_streams", "type": "Integer"},
+        ],
+        "outputs": [
+            {"name": "destination_table", "type": "google.BQTable"},
+        ],
+        "implementation": {
+            "container": {
+                "image": f"us-central1-docker.pkg.dev/sfujiwara/kfpc/bigquery:{image_version}",
+                "command": ["inv", "write-table"],
+                "args": [
+                    "--job-project", {"inputValue": "job_project"},
+                    "--source-path", {"inputPath": "source_artifact"},
+                    "--destination-project", {"inputValue": "destination_project"},
+                    "--destination-dataset", {"inputValue": "destination_dataset"},
+                    "--destination-table", {"inputValue": "destination_table"},
+                    "--schema", {"inputValue": "schema"},
+                    "--batch-size", {"inputValue": "batch_size"},
+                    "--max-streams", {"inputValue": "max_streams"},
+                    "--executor-input", {"executorInput": None},
+                ],
+            },
+        },
+    }
+
+    return load_component_from_text(yaml.dump(component_dict))
+
+
+class WriteTableTask:
+    """Kubeflow Pipelines task for writing artifact into BigQuery with Storage Write API."""
+
+    def __init__(self, task: PipelineTask) -> None:
+        """Initialize ``WriteTableTask`` instance."""
+        self.task = task
+
+    @property
+    def destination_table(self) -> PipelineArtifactChannel:
+        """Return destination_table artifact."""
+        return self.task.outputs["destination_table"]
+
+
+class WriteTable:
+    """Kubeflow Pipelines component for writing Arrow or Parquet artifact into BigQuery with Storage Write API.
+
+    Files are appended to pending streams in parallel and committed atomically, so no staging on Cloud Storage
+    or load job is needed. Rows are appended to the destination table.
+
+    Parameters
+    ----------
+    name:
+        Name of the component.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize ``WriteTable`` instance."""
+        self.name = name
+
+    def task(
+        self,
+        job_project: PipelineParameterChannel | str,
+        source_artifact: PipelineArtifactChannel,
+        destination_project: PipelineParameterChannel | str,
+        destination_dataset: PipelineParameterChannel | str,
+        destination_table: PipelineParameterChannel | str,
+        schema: PipelineParameterChannel | list[dict] | None = None,
+        batch_size: PipelineParameterChannel | int = 10_000,
+        max_streams: PipelineParameterChannel | int = 4,
+    ) -> WriteTableTask:
+        """Generate a Kubeflow Pipelines task to write artifact into BigQuery.
+
+        Parameters
+        ----------
+        job_project:
+            Google Cloud Platform project ID to create the destination table.
+        source_artifact:
+            Artifact containing Arrow IPC or Parquet files with the same schema,
+            such as ``kfpc.bigquery.ReadTable.output_files``.
+        destination_project:
+            Google Cloud Platform project ID of the destination table.
+        destination_dataset:
+            BigQuery dataset ID of the destination table.
+        destination_table:
+            BigQuery table ID of the destination table.
+        schema:
+            BigQuery table schema used to create the destination table if it does not exist.
+            The destination table must exist if empty.
+        batch_size:
+            Maximum number of rows in an append request.
+        max_streams:
+            Maximum number of streams written concurrently.
+
+        Returns
+        -------
+        WriteTableTask
+
+        """
+        component = _load_component(name=self.name, image_version=get_version())
+        task = component(
+            job_project=job_project,
+            source_artifact=source_artifact,
+            destination_project=destination_project,
+            destination_dataset=destination_dataset,
+            destination_table=destination_table,
+            schema=schema or [],
+            batch_size=batch_size,
+            max_streams=max_streams,
+        )
+
+        return WriteTableTask(task=task)
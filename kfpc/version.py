@@ -1,8 +1,13 @@
 """Get version of `kfpc` package."""
 
-import pkg_resources
+import functools
+from importlib import metadata
 
 
+@functools.cache
 def get_version() -> str:
-    """Get version of `kfpc` package."""
-    return pkg_resources.get_distribution("kfpc").version
+    """Get version of `kfpc` package.
+
+    The version is resolved once per process, since it is used for the image tag of every task.
+    """
+    return metadata.version("kfpc")
@@ -9,6 +9,15 @@ import kfp
 import toml
 from google.cloud import aiplatform
 
+from .benchmark import benchmark_compile as benchmark_compile
+from .benchmark import benchmark_faults as benchmark_faults
+from .benchmark import benchmark_import as benchmark_import
+from .benchmark import benchmark_job_wait as benchmark_job_wait
+from .benchmark import benchmark_read_table as benchmark_read_table
+from .benchmark import benchmark_reader as benchmark_reader
+from .benchmark import benchmark_startup as benchmark_startup
+from .benchmark import benchmark_wait_for_table as benchmark_wait_for_table
+from .benchmark import benchmark_write_table as benchmark_write_table
 from .pipeline import pipeline_fn
 
 
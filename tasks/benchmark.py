@@ -0,0 +1,238 @@
+"""Benchmarks for kfpc."""
+
+import gzip
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import invoke
+import kfp
+import yaml
+
+import kfpc
+
+
+def build_synthetic_pipeline(num_tasks: int, optimize: bool = False) -> kfp.dsl.graph_component.GraphComponent:  # noqa: FBT001, FBT002
+    """Build a pipeline with ``num_tasks`` kfpc tasks.
+
+    Query tasks depend on up to three preceding query tasks, and every tenth task is an Extract and Load pair.
+    If ``optimize`` is ``True``, the tasks are rewritten by ``kfpc.bigquery.optimize``.
+    """
+
+    def pipeline_fn(project: str) -> None:
+        tables = []
+        n = 0
+        while n < num_tasks:
+            if n % 10 == 9:  # noqa: PLR2004
+                extract_task = kfpc.bigquery.Extract(name="extract").task(
+                    job_project=project,
+                    source_table_artifact=tables[-1],
+                )
+                kfpc.bigquery.Load(name="load").task(
+                    job_project=project,
+                    source_artifact=extract_task.output_files,
+                    destination_project=project,
+                    destination_dataset="sandbox",
+                    destination_table=f"load{n}",
+                    schema=[{"name": "x", "type": "INTEGER"}],
+                    source_uri_suffix="data-*.jsonl",
+                )
+                n += 2
+                continue
+            query_task = kfpc.bigquery.Query(name=f"query-{n % 10}").task(
+                query=f"SELECT {n} AS x",
+                job_project=project,
+                destination_project=project,
+                destination_dataset="sandbox",
+                destination_table=f"query{n}",
+                depend_on=tables[-(n % 4) :] if n % 4 else None,
+            )
+            tables.append(query_task.destination_table)
+            n += 1
+
+    if optimize:
+        pipeline_fn = kfpc.bigquery.optimize(pipeline_fn, verbose=False)
+
+    return kfp.dsl.pipeline(name="benchmark")(pipeline_fn)
+
+
+@invoke.task
+def benchmark_compile(
+    c: invoke.Context,  # noqa: ARG001
+    num_tasks: int = 5000,
+    max_seconds: float = 0.0,
+    optimize: bool = False,  # noqa: FBT001, FBT002
+) -> None:
+    """Measure time to define and compile a synthetic pipeline.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    num_tasks:
+        Number of kfpc tasks in the synthetic pipeline.
+    max_seconds:
+        Fail if the total time exceeds this budget. Disabled if ``0``.
+    optimize:
+        Rewrite tasks with ``kfpc.bigquery.optimize`` and report the number of compiled tasks.
+
+    """
+    start = time.perf_counter()
+    pipeline_fn = build_synthetic_pipeline(num_tasks=num_tasks, optimize=optimize)
+    defined = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as d:
+        kfp.compiler.Compiler().compile(pipeline_func=pipeline_fn, package_path=str(Path(d) / "pipeline.yaml"))
+        compiled = time.perf_counter()
+        if optimize:
+            spec = yaml.safe_load((Path(d) / "pipeline.yaml").read_text())
+            print(f"compiled tasks: {len(spec['root']['dag']['tasks'])}")  # noqa: T201
+
+    total = compiled - start
+    print(f"tasks:   {num_tasks}")  # noqa: T201
+    print(f"define:  {defined - start:.2f} s")  # noqa: T201
+    print(f"compile: {compiled - defined:.2f} s")  # noqa: T201
+    print(f"total:   {total:.2f} s ({total / num_tasks * 1000:.2f} ms/task)")  # noqa: T201
+
+    if max_seconds and total > max_seconds:
+        msg = f"Compile time {total:.2f} s exceeded the budget of {max_seconds:.2f} s."
+        raise invoke.Exit(msg, code=1)
+
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import kfpc
+kfpc.get_version()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "eager": [m for m in ["kfp", "yaml"] if m in sys.modules]}))
+"""
+
+
+@invoke.task
+def benchmark_import(c: invoke.Context, max_seconds: float = 0.2, repeat: int = 5) -> None:  # noqa: ARG001
+    """Measure time of ``import kfpc`` in fresh interpreters and fail if it regresses.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    max_seconds:
+        Fail if the fastest import exceeds this budget.
+    repeat:
+        Number of interpreters to measure.
+
+    """
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output))
+
+    seconds = min(r["seconds"] for r in results)
+    eager = results[0]["eager"]
+    print(f"import kfpc: {seconds * 1000:.1f} ms")  # noqa: T201
+
+    if eager:
+        msg = f"import kfpc imported {', '.join(eager)}, which must be imported lazily."
+        raise invoke.Exit(msg, code=1)
+    if seconds > max_seconds:
+        msg = f"import kfpc took {seconds:.3f} s, which exceeded the budget of {max_seconds:.3f} s."
+        raise invoke.Exit(msg, code=1)
+
+
+@invoke.task
+def benchmark_job_wait(c: invoke.Context) -> None:
+    """Measure latency of waiting for BigQuery jobs against a local stub server."""
+    with c.cd("containers/bigquery"):
+        c.run("python -m benchmarks.job_wait")
+
+
+@invoke.task
+def benchmark_faults(c: invoke.Context) -> None:
+    """Check retries of transient errors of BigQuery against a local stub server with injected faults."""
+    with c.cd("containers/bigquery"):
+        c.run("python -m benchmarks.faults")
+
+
+@invoke.task
+def benchmark_wait_for_table(c: invoke.Context) -> None:
+    """Check polling of tables by ``kfpc.bigquery.WaitForTable`` against a local stub server."""
+    with c.cd("containers/bigquery"):
+        c.run("python -m benchmarks.wait_for_table")
+
+
+@invoke.task
+def benchmark_startup(c: invoke.Context, max_seconds: float = 1.5) -> None:
+    """Measure startup time of each command of the BigQuery container and fail if it exceeds ``max_seconds``.
+
+    Commands calling only BigQuery REST API also fail if they import client libraries.
+    """
+    with c.cd("containers/bigquery"):
+        c.run(f"python -m benchmarks.startup --max-seconds {max_seconds}")
+
+
+@invoke.task
+def benchmark_reader(
+    c: invoke.Context,  # noqa: ARG001
+    num_files: int = 16,
+    rows_per_file: int = 100_000,
+    num_workers: int = 4,
+    file_format: str = "jsonl",
+) -> None:
+    """Measure throughput of ``kfpc.bigquery.ExtractReader`` on synthetic files.
+
+    Parameters
+    ----------
+    c:
+        Invoke context.
+    num_files:
+        Number of files.
+    rows_per_file:
+        Number of rows in each file.
+    num_workers:
+        Number of threads of the parallel reader.
+    file_format:
+        ``jsonl`` for gzipped JSON files or ``parquet`` for Parquet files, which requires ``pyarrow``.
+
+    """
+    with tempfile.TemporaryDirectory() as d:
+        for i in range(num_files):
+            rows = [{"id": i * rows_per_file + j, "name": f"name-{j}", "value": j / 7} for j in range(rows_per_file)]
+            if file_format == "parquet":
+                import pyarrow as pa  # noqa: PLC0415
+                import pyarrow.parquet as pq  # noqa: PLC0415
+
+                pq.write_table(pa.Table.from_pylist(rows), Path(d) / f"data-{i:012d}.parquet")
+            else:
+                with gzip.open(Path(d) / f"data-{i:012d}.jsonl.gz", "wt") as f:
+                    f.writelines(json.dumps(row) + "\n" for row in rows)
+
+        batch_format = "arrow" if file_format == "parquet" else "dict"
+        for workers in sorted({1, num_workers}):
+            reader = kfpc.bigquery.ExtractReader(d, num_workers=workers)
+            start = time.perf_counter()
+            num_rows = sum(len(batch) for batch in reader.batches(batch_size=1024, batch_format=batch_format))
+            elapsed = time.perf_counter() - start
+            print(f"workers: {workers:>2}  rows: {num_rows}  {elapsed:.2f} s  {num_rows / elapsed:,.0f} rows/s")  # noqa: T201
+
+
+@invoke.task
+def benchmark_read_table(c: invoke.Context) -> None:
+    """Measure throughput of writing Storage Read API streams into files with a local fake."""
+    with c.cd("containers/bigquery"):
+        c.run("python -m benchmarks.read_table")
+
+
+@invoke.task
+def benchmark_write_table(c: invoke.Context) -> None:
+    """Measure throughput of writing local files through Storage Write API streams with a local fake."""
+    with c.cd("containers/bigquery"):
+        c.run("python -m benchmarks.write_table")
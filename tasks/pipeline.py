@@ -53,5 +53,12 @@ def pipeline_fn(project: str) -> None:
             {"name": "corpus", "type": "STRING"},
             {"name": "corpus_date", "type": "INTEGER"},
         ],
-        source_uri_suffix="data-*.jsonl",
+    )
+
+    _ = kfpc.bigquery.Copy(name="copy").task(
+        job_project=project,
+        source_table_artifacts=[table_importer_task.output],
+        destination_project=project,
+        destination_dataset="sandbox",
+        destination_table="copy",
     )